@@ -1,12 +1,13 @@
-from tempfile import NamedTemporaryFile
 import numpy as np
 import json
-from typing import Any, Dict, List, Literal
-import subprocess
+from typing import Any, Dict, List, Literal, Optional
 import ffmpeg
 import os
+import weakref
 
-from tts_webui.utils.outputs.path import get_relative_output_path_ext
+from tts_webui.utils.outputs.bark_prompts import SIDECAR_KEY, save_bark_prompts
+from tts_webui.utils.outputs.bundle_writer import get_audio_bytes, save_output
+from tts_webui.utils.outputs.ffmpeg_encoder import encode
 
 
 def extension__tts_generation_webui():
@@ -27,11 +28,46 @@ def extension__tts_generation_webui():
     }
 
 
-def _check_ffmpegg():
-    if not hasattr(ffmpeg, "input"):
-        raise ImportError(
-            """Incorrect ffmpeg version. Please install ffmpeg-python with `pip install ffmpeg-python`"""
-        )
+# libsndfile's encoders for the formats, with the bit depth ffmpeg picks for flac
+_SOUNDFILE_SUBTYPES = {"ogg": "VORBIS", "flac": "PCM_24"}
+
+
+def _write_with_soundfile(
+    filename: str,
+    sample_rate: int,
+    audio_array: np.ndarray,
+    metadata: Dict[str, Any],
+    format: Literal["ogg", "flac"],
+) -> bool:
+    """
+    Encode in-process with libsndfile, without starting ffmpeg or writing a
+    metadata file, which take longer than encoding a short clip.
+
+    Returns:
+        bool: False if soundfile cannot write the file and ffmpeg should.
+    """
+    try:
+        import soundfile
+    except ImportError:
+        return False
+
+    channels = audio_array.shape[1] if len(audio_array.shape) > 1 else 1
+    try:
+        with soundfile.SoundFile(
+            filename,
+            "w",
+            samplerate=sample_rate,
+            channels=channels,
+            format=format.upper(),
+            subtype=_SOUNDFILE_SUBTYPES[format],
+        ) as f:
+            # the comment tag, as json without the escaping of ;FFMETADATA1
+            f.comment = json.dumps(metadata, ensure_ascii=False)
+            f.write(audio_array)
+    except (RuntimeError, TypeError, ValueError) as e:
+        print(f"Failed to encode {filename} with soundfile, using ffmpeg: {e}")
+        return False
+    return True
 
 
 def decorator_disabled(fn):
@@ -41,22 +77,80 @@ def decorator_disabled(fn):
     return wrapper
 
 
+class _SharedEncode:
+    """
+    The formats saved to one bundle, which the first of their writers
+    encodes together, so that ffmpeg reads the audio once for all of them.
+    """
+
+    def __init__(self):
+        self.pending = []
+
+    def take(self, format: str) -> List[str]:
+        """The formats to write now, none if written with another one."""
+        if format not in self.pending:
+            return []
+        formats = [format] + [f for f in self.pending if f != format]
+        self.pending = []
+        return formats
+
+
+# bundle -> _SharedEncode
+_shared_encodes = weakref.WeakKeyDictionary()
+
+
+def _get_shared_encode(result_dict: Dict[str, Any]) -> _SharedEncode:
+    bundle = result_dict.get("bundle")
+    if bundle is None:
+        # written right away, before the other formats are saved
+        return _SharedEncode()
+    return _shared_encodes.setdefault(bundle, _SharedEncode())
+
+
+def _write_bark(filename, shared: _SharedEncode, format, **kwargs):
+    formats = shared.take(format)
+    if formats:
+        callback_save_generation_bark(
+            filename=filename, format=format, extra_formats=formats[1:], **kwargs
+        )
+
+
+def _write_musicgen(filename, shared: _SharedEncode, format, **kwargs):
+    formats = shared.take(format)
+    if formats:
+        callback_save_generation_musicgen(
+            filename=filename, format=format, extra_formats=formats[1:], **kwargs
+        )
+
+
 def _save(kwargs, result_dict: Dict[str, Any], format: Literal["ogg", "flac"]):
+    # the bark callback adds the prompts' sidecar in place
+    metadata = dict(result_dict["metadata"])
+    shared = _get_shared_encode(result_dict)
+    shared.pending.append(format)
     if kwargs.get("_type", None) == "bark":
-        callback_save_generation_bark(
+        save_output(
+            result_dict,
+            "." + format,
+            _write_bark,
+            shared,
             audio=result_dict["audio_out"],
             full_generation=result_dict["full_generation"],
-            filename=get_relative_output_path_ext(result_dict, "." + format),
-            metadata=result_dict["metadata"],
+            metadata=metadata,
             format=format,
+            input_data=get_audio_bytes(result_dict),
         )
         return
 
-    callback_save_generation_musicgen(
+    save_output(
+        result_dict,
+        "." + format,
+        _write_musicgen,
+        shared,
         audio=result_dict["audio_out"],
-        filename=get_relative_output_path_ext(result_dict, "." + format),
-        metadata=result_dict["metadata"],
+        metadata=metadata,
         format=format,
+        input_data=get_audio_bytes(result_dict),
     )
 
 
@@ -102,84 +196,69 @@ def decorator_save_flac_generator(fn):
     return wrapper
 
 
-def callback_save_generation_musicgen(
-    audio: tuple[int, np.ndarray],
+def _write_formats(
     filename: str,
+    sample_rate: int,
+    audio_array: np.ndarray,
     metadata: Dict[str, Any],
-    format: Literal["ogg", "flac"],
+    formats: List[str],
+    input_data: Optional[bytes] = None,
 ) -> None:
-    _check_ffmpegg()
-    SAMPLE_RATE, audio_array = audio
-    print("Saving generation to", filename)
-
-    input_data = audio_array.tobytes()
-    metadata["text"] = _double_escape_quotes(metadata["text"])
-    metadata["text"] = _double_escape_newlines(metadata["text"])
-    metadata_str = json.dumps(metadata, ensure_ascii=False)
-
-    channels = audio_array.shape[1] if len(audio_array.shape) > 1 else 1
-    pipe_input = ffmpeg.input("pipe:", format="f32le", ar=str(SAMPLE_RATE), ac=channels)
-    with NamedTemporaryFile("wb", suffix=".ffmetadata.ini", delete=False) as f:
-        f.write(f";FFMETADATA1\ncomment={metadata_str}".encode("utf-8"))
-        f.flush()
-        f.close()
-        metadata_input = ffmpeg.input(f.name)
-
-        args = (
-            ffmpeg.output(
-                pipe_input,
-                metadata_input,
-                filename,
-                format=format,
-                map_metadata=f"1",
-                loglevel="error",
-            )
-            .overwrite_output()
-            .get_args()
+    """
+    Write the audio in each format, named like filename, in-process where
+    soundfile can and with a single ffmpeg process for the rest.
+    """
+    base, _ = os.path.splitext(filename)
+    filenames = [f"{base}.{format}" for format in formats]
+    for filename in filenames:
+        print("Saving generation to", filename)
+
+    remaining = [
+        (filename, format)
+        for filename, format in zip(filenames, formats)
+        if not _write_with_soundfile(
+            filename, sample_rate, audio_array, metadata, format
         )
-
-        def find_map_1_index(args: List[str]) -> int:
-            return next(
-                (
-                    i
-                    for i in range(len(args))
-                    if args[i] == "-map" and args[i + 1] == "1"
-                ),
-                0,
+    ]
+    if remaining:
+        if input_data is None:
+            input_data = audio_array.tobytes()
+        channels = audio_array.shape[1] if len(audio_array.shape) > 1 else 1
+        try:
+            encode(
+                input_data,
+                sample_rate,
+                channels,
+                remaining,
+                comment=json.dumps(metadata, ensure_ascii=False),
             )
+        except (OSError, RuntimeError) as e:
+            for filename, _ in remaining:
+                print("Failed to save generation to", filename)
+            print("ffmpeg error:", e)
+            return
 
-        def remove_map_1(args: List[str]) -> List[str]:
-            index = find_map_1_index(args)
-            return args[:index] + args[index + 2 :] if index > 0 else args
-
-        args = remove_map_1(args)
-
-        p = subprocess.Popen(
-            ["ffmpeg"] + args, stdin=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-        output_data = p.communicate(input=input_data)
-
-        p.wait()
-
-        if p.returncode == 0:
-            print("Saved generation to", filename)
-        else:
-            print("Failed to save generation to", filename)
-            print("ffmpeg args:", args)
-            print(output_data[0])
-            # print(output_data[1])
-            # print b'ffmpeg
-            print("ffmpeg stderr:", output_data[1].decode("utf-8"))
-
-        os.remove(f.name)
+    for filename in filenames:
+        print("Saved generation to", filename)
 
 
-def _double_escape_newlines(x: str):
-    return x.replace("\n", "\\\n")
-
-
-def _double_escape_quotes(x: str):
-    return x.replace('"', '\\"')
+def callback_save_generation_musicgen(
+    audio: tuple[int, np.ndarray],
+    filename: str,
+    metadata: Dict[str, Any],
+    format: Literal["ogg", "flac"],
+    input_data: Optional[bytes] = None,
+    extra_formats: Optional[List[str]] = None,
+) -> None:
+    SAMPLE_RATE, audio_array = audio
+    _write_formats(
+        filename,
+        SAMPLE_RATE,
+        audio_array,
+        metadata,
+        [format, *(extra_formats or [])],
+        input_data,
+    )
 
 
 def callback_save_generation_bark(
@@ -189,103 +268,22 @@ def callback_save_generation_bark(
     filename: str,
     metadata: Dict[str, Any],
     format: Literal["ogg", "flac"],
+    input_data: Optional[bytes] = None,
+    extra_formats: Optional[List[str]] = None,
 ) -> None:
-    import base64
-
-    def _ndarray_to_base64(arr):
-        # Convert ndarray to bytes
-        arr_bytes = arr.tobytes()
-        # Encode bytes to base64
-        return base64.b64encode(arr_bytes).decode("utf-8")
-
-    def _decode_base64_to_ndarray(base64_string):
-        # Decode base64 string to bytes
-        decoded_bytes = base64.b64decode(base64_string)
-        # Convert bytes to NumPy ndarray
-        return np.frombuffer(decoded_bytes, dtype=np.int16)
-
-    def _attach_generation_meta(full_generation, arg1, metadata):
-        semantic_prompt: np.ndarray = full_generation[arg1]
-        semantic_prompt_base64 = _ndarray_to_base64(semantic_prompt)
-        metadata[arg1] = semantic_prompt_base64
-
-    _check_ffmpegg()
-
     SAMPLE_RATE, audio_array = audio
-    print("Saving generation to", filename)
-
-    _attach_generation_meta(full_generation, "semantic_prompt", metadata)
-    _attach_generation_meta(full_generation, "coarse_prompt", metadata)
-    metadata["text"] = _double_escape_quotes(metadata["text"])
-    metadata["text"] = _double_escape_newlines(metadata["text"])
 
-    def double_escape_backslash(prompt):
-        if prompt is None:
-            return None
-        return prompt.replace("\\", "\\\\")
+    # the tag only names the file with the prompts, see load_bark_prompts
+    metadata[SIDECAR_KEY] = save_bark_prompts(filename, full_generation)
 
-    metadata["history_prompt"] = double_escape_backslash(metadata["history_prompt"])
-    metadata["history_prompt_npz"] = double_escape_backslash(
-        metadata["history_prompt_npz"]
+    _write_formats(
+        filename,
+        SAMPLE_RATE,
+        audio_array,
+        metadata,
+        [format, *(extra_formats or [])],
+        input_data,
     )
-    metadata_str = json.dumps(metadata, ensure_ascii=False)
-
-    pipe_input = ffmpeg.input("pipe:", format="f32le", ar=str(SAMPLE_RATE))
-    with NamedTemporaryFile("wb", suffix=".ffmetadata.ini", delete=False) as f:
-        f.write(f";FFMETADATA1\ncomment={metadata_str}".encode("utf-8"))
-        f.flush()
-        f.close()
-
-        metadata_input = ffmpeg.input(f.name)
-
-        args = (
-            ffmpeg.output(
-                pipe_input,
-                metadata_input,
-                filename,
-                format=format,
-                map_metadata=f"1",
-                loglevel="error",
-            )
-            .overwrite_output()
-            .get_args()
-        )
-
-        def find_map_1_index(args: List[str]) -> int:
-            return next(
-                (
-                    i
-                    for i in range(len(args))
-                    if args[i] == "-map" and args[i + 1] == "1"
-                ),
-                0,
-            )
-
-        def remove_map_1(args: List[str]) -> List[str]:
-            index = find_map_1_index(args)
-            return args[:index] + args[index + 2 :] if index > 0 else args
-
-        args = remove_map_1(args)
-
-        p = subprocess.Popen(
-            ["ffmpeg"] + args, stdin=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-        input_data = audio_array.tobytes()
-        output_data = p.communicate(input=input_data)
-
-        p.wait()
-
-        if p.returncode == 0:
-            print("Saved generation to", filename)
-        else:
-            print("Failed to save generation to", filename)
-            print("ffmpeg args:", args)
-            print(output_data[0])
-            # print(output_data[1])
-            # print b'ffmpeg
-            print("ffmpeg stderr:", output_data[1].decode("utf-8"))
-
-        os.remove(f.name)
 
 
 if __name__ == "__main__":
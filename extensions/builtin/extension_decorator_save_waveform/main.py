@@ -1,4 +1,5 @@
 from tts_webui.utils.save_waveform_plot import middleware_save_waveform_plot
+from tts_webui.utils.outputs.bundle_writer import save_output
 from tts_webui.utils.outputs.path import get_relative_output_path_ext
 
 
@@ -20,18 +21,26 @@ def extension__tts_generation_webui():
     }
 
 
+def _save_waveform_plot(path, result_dict):
+    result_dict["waveform_plot"] = middleware_save_waveform_plot(
+        result_dict["audio_out"][1], path
+    )
+
+
 def decorator_save_waveform_plot(fn):
     """
     Add waveform_plot to the result_dict.
+
+    With async output writing, waveform_plot is None until the plot is saved,
+    and in an output bundle until the bundle is written.
     """
 
     def wrapper(*args, **kwargs):
         result_dict = fn(*args, **kwargs)
-        path = get_relative_output_path_ext(result_dict, ".png")
+        path = get_relative_output_path_ext(result_dict, ".png", create=False)
         print("Saving waveform plot to", path)
-        result_dict["waveform_plot"] = middleware_save_waveform_plot(
-            result_dict["audio_out"][1], path
-        )
+        result_dict["waveform_plot"] = None
+        save_output(result_dict, ".png", _save_waveform_plot, result_dict)
         return result_dict
 
     return wrapper
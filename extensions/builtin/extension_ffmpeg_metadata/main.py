@@ -3,6 +3,8 @@ import json
 import os
 import gradio as gr
 
+from tts_webui.utils.vorbis_comment import read_comment_tag
+
 
 def extension__tts_generation_webui():
     ffmpeg_metadata_ui()
@@ -23,6 +25,11 @@ def extension__tts_generation_webui():
     }
 
 
+def _get_comment(tags):
+    # "comment" when written by ffmpeg, "COMMENT" when written by libsndfile
+    return tags.get("comment", tags.get("COMMENT"))
+
+
 def load_ffmpeg_metadata(filename: str):
     if not hasattr(ffmpeg, "probe"):
         raise ImportError(
@@ -30,11 +37,19 @@ def load_ffmpeg_metadata(filename: str):
         )
     if not filename or not os.path.exists(filename):
         return None
+    if filename.endswith((".ogg", ".flac")):
+        try:
+            # the tag itself, without starting ffprobe
+            comment = read_comment_tag(filename)
+            if comment is not None:
+                return json.loads(comment)
+        except ValueError as e:
+            print(f"Failed to read the tags of {filename}, using ffprobe: {e}")
     ffmpeg_output = ffmpeg.probe(filename)
     if filename.endswith(".ogg") or ffmpeg_output["format"]["format_name"] == "ogg":
-        return json.loads(ffmpeg_output["streams"][0]["tags"]["comment"])
+        return json.loads(_get_comment(ffmpeg_output["streams"][0]["tags"]))
     if filename.endswith(".flac") or ffmpeg_output["format"]["format_name"] == "flac":
-        return json.loads(ffmpeg_output["format"]["tags"]["comment"])
+        return json.loads(_get_comment(ffmpeg_output["format"]["tags"]))
     print("Unknown file type:", filename)
     print(json.dumps(ffmpeg_output, indent=4, sort_keys=True))
     return json.loads(json.dumps(ffmpeg_output, indent=4, sort_keys=True))
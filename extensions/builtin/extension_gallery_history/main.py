@@ -8,12 +8,12 @@ from tts_webui.history_tab.collections_directories_atom import (
     get_collections,
 )
 from tts_webui.history_tab.delete_generation_cb import delete_generation_cb
+from tts_webui.history_tab.get_wav_files import get_wav_files_page
+from tts_webui.history_tab.history_index import get_history_index
+from tts_webui.history_tab.history_watcher import get_history_config
 from tts_webui.history_tab.save_to_favorites import save_to_collection, save_to_favorites
 from tts_webui.utils.open_folder import open_folder
-
-
-import glob
-import os
+from tts_webui.utils.thumbnail_cache import get_waveform_thumbnail
 
 
 def extension__tts_generation_webui():
@@ -35,12 +35,19 @@ def extension__tts_generation_webui():
     }
 
 
-audio_list_img = []
+GALLERY_PAGE_SIZE = 48
 
 
-def get_wav_files_img(directory: str):
-    list_of_directories = glob.glob(f"{directory}/**/*.png", recursive=True)
-    return list_of_directories
+def get_gallery_page(directory: str, page=1, page_size=GALLERY_PAGE_SIZE):
+    """
+    Get one page of the generations, newest first.
+
+    Returns:
+        tuple: ([(wav path, name)], total)
+    """
+    # falls back to listing every bundle, whatever formats its audio is in
+    rows, total = get_wav_files_page(directory, page, page_size)
+    return [(row[3], row[1]) for row in rows], total
 
 
 def clear_audio():
@@ -74,14 +81,6 @@ def history_content(directory, show_collections):
     if show_collections:
         create_collection_ui(collections_directories_atom)
 
-    gr.Markdown(
-        """
-        ### Disclaimer:
-        This gallery shows only the files that have an image in the same directory as the audio file.
-        The audio generations without an image will not appear at all.
-        """
-    )
-
     with gr.Row():
         with gr.Column():
             with gr.Row():
@@ -95,6 +94,16 @@ def history_content(directory, show_collections):
             history_list_as_gallery = gr.Gallery(
                 value=[], columns=4, object_fit="contain", height="auto"
             )
+            # the wav files shown to this session, in gallery order
+            gallery_files = gr.State([])
+
+            with gr.Row():
+                previous_page = gr.Button("Previous", size="sm")
+                page_number = gr.Number(
+                    value=1, label="Page", precision=0, minimum=1, min_width=80
+                )
+                next_page = gr.Button("Next", size="sm")
+            page_info = gr.Markdown()
 
         with gr.Column():
             history_bundle_name = gr.Markdown(visible=True)
@@ -144,7 +153,13 @@ def history_content(directory, show_collections):
             history_bundle_name: gr.Textbox(value=os.path.dirname(filename)),
             folder_root: os.path.dirname(filename),
             history_audio: gr.Audio(value=filename, label=filename),
-            history_image: gr.Image(value=filename.replace(".wav", ".png")),
+            history_image: gr.Image(
+                value=(
+                    filename.replace(".wav", ".png")
+                    if os.path.exists(filename.replace(".wav", ".png"))
+                    else get_waveform_thumbnail(filename, "full")
+                )
+            ),
             history_json: gr.JSON(value=json_text),
             history_npz: gr.Textbox(value=filename.replace(".wav", ".npz")),
             delete_from_history: gr.Button(visible=True),
@@ -155,9 +170,13 @@ def history_content(directory, show_collections):
             open_folder_button: gr.Button(visible=True),
         }
 
-    def select_audio_history2(_list, evt: gr.SelectData):
-        filename = audio_list_img[evt.index].replace(".png", ".wav")  # type: ignore
-        json_text = json.load(open(filename.replace(".wav", ".json")))
+    def select_audio_history2(files, evt: gr.SelectData):
+        filename = files[evt.index]  # type: ignore
+        try:
+            with open(filename.replace(".wav", ".json")) as f:
+                json_text = json.load(f)
+        except (OSError, ValueError):
+            json_text = None
         return _select_audio_history(filename, json_text)
 
     outputs = [
@@ -175,15 +194,33 @@ def history_content(directory, show_collections):
 
     history_list_as_gallery.select(
         fn=select_audio_history2,
-        inputs=[history_list_as_gallery],
+        inputs=[gallery_files],
         outputs=outputs,
-        preprocess=False,
     )
 
-    def update_history_tab(directory: str):
-        global audio_list_img
-        audio_list_img = get_wav_files_img(directory)
-        return gr.Gallery(value=audio_list_img)
+    def update_history_tab(directory: str, page=1):
+        files, total = get_gallery_page(directory, page)
+        pages = max(1, -(-total // GALLERY_PAGE_SIZE))
+        requested_page = int(page or 1)
+        page = min(max(1, requested_page), pages)
+        if page != requested_page:
+            files, total = get_gallery_page(directory, page)
+        # small previews, drawn on first view for generations without an image
+        thumbnails = [
+            (f, name, get_waveform_thumbnail(f, "gallery")) for f, name in files
+        ]
+        thumbnails = [x for x in thumbnails if x[2] is not None]
+        return {
+            history_list_as_gallery: gr.Gallery(
+                value=[(thumbnail, name) for _, name, thumbnail in thumbnails]
+            ),
+            gallery_files: [f for f, _, _ in thumbnails],
+            page_number: page,
+            page_info: f"Page {page} of {pages} ({total} generations)",
+        }
+
+    page_inputs = [directory_dropdown, page_number]
+    page_outputs = [history_list_as_gallery, gallery_files, page_number, page_info]
 
     delete_from_history.click(
         fn=clear_audio,
@@ -191,21 +228,54 @@ def history_content(directory, show_collections):
     )
     delete_from_history.click(
         fn=delete_generation_cb(update_history_tab),
-        inputs=[folder_root, directory_dropdown],
-        outputs=[history_list_as_gallery],
+        inputs=[folder_root, *page_inputs],
+        outputs=page_outputs,
     )
 
     directory_dropdown.change(
         fn=update_history_tab,
         inputs=[directory_dropdown],
-        outputs=[history_list_as_gallery],
+        outputs=page_outputs,
     )
 
     reload_button.click(
         fn=update_history_tab,
-        inputs=[directory_dropdown],
-        outputs=[history_list_as_gallery],
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+
+    page_number.submit(
+        fn=update_history_tab,
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+    previous_page.click(
+        fn=lambda x, page: update_history_tab(x, (page or 1) - 1),
+        inputs=page_inputs,
+        outputs=page_outputs,
     )
+    next_page.click(
+        fn=lambda x, page: update_history_tab(x, (page or 1) + 1),
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+
+    live_refresh_seconds = get_history_config()["live_refresh_seconds"]
+    if live_refresh_seconds:
+        seen_version = gr.State(None)
+
+        def refresh_if_changed(version, *args):
+            current_version = get_history_index().version
+            if version == current_version:
+                return {}
+            return {seen_version: current_version, **update_history_tab(*args)}
+
+        gr.Timer(live_refresh_seconds).tick(
+            fn=refresh_if_changed,
+            inputs=[seen_version, *page_inputs],
+            outputs=[seen_version, *page_outputs],
+            show_progress="hidden",
+        )
 
 
 def save_to_collection_ui(
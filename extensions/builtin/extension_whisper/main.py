@@ -4,7 +4,8 @@ import os
 
 from typing import TYPE_CHECKING
 
-from tts_webui.utils.manage_model_state import manage_model_state
+from tts_webui.utils.compile_cache import get_compile_cache_key
+from tts_webui.utils.manage_model_state import hold_models, manage_model_state
 from tts_webui.utils.list_dir_models import unload_model_button
 
 if TYPE_CHECKING:
@@ -30,7 +31,18 @@ def extension__tts_generation_webui():
     }
 
 
-@manage_model_state("whisper")
+def _compile_cache_key(
+    model_name="openai/whisper-large-v3",
+    torch_dtype=torch.float16,
+    device="cuda:0",
+    compile=False,
+):
+    if not compile:
+        return None
+    return get_compile_cache_key(model_name, torch_dtype, device)
+
+
+@manage_model_state("whisper", compile_cache_key=_compile_cache_key)
 def get_model(
     model_name="openai/whisper-large-v3",
     torch_dtype=torch.float16,
@@ -59,7 +71,14 @@ local_dir = os.path.join("data", "models", "whisper")
 local_cache_dir = os.path.join(local_dir, "cache")
 
 
-@manage_model_state("whisper-pipe")
+def _warmup_pipe(pipe: "Pipeline"):
+    import numpy as np
+
+    # one second of silence
+    pipe({"raw": np.zeros(16000, dtype=np.float32), "sampling_rate": 16000})
+
+
+@manage_model_state("whisper-pipe", warmup=_warmup_pipe)
 def get_pipe(model_name, device="cuda:0") -> "Pipeline":
     from transformers import pipeline
 
@@ -91,15 +110,19 @@ def transcribe(inputs, model_name="openai/whisper-large-v3"):
             "No audio file submitted! Please record an audio before submitting your request."
         )
 
-    pipe = get_pipe(model_name)
-
-    result = pipe(
-        inputs,
-        generate_kwargs=(
-            {"task": "transcribe"} if model_name == "openai/whisper-large-v3" else {}
-        ),
-        return_timestamps=True,
-    )
+    # keeps the pipeline and its model from being offloaded while in use
+    with hold_models():
+        pipe = get_pipe(model_name)
+
+        result = pipe(
+            inputs,
+            generate_kwargs=(
+                {"task": "transcribe"}
+                if model_name == "openai/whisper-large-v3"
+                else {}
+            ),
+            return_timestamps=True,
+        )
     return result["text"]
 
 
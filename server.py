@@ -35,6 +35,10 @@ from tts_webui.utils.print_gradio_options import print_gradio_options
 
 
 def reload_config_and_restart_ui():
+    from tts_webui.utils.outputs.async_writer import flush_outputs
+
+    # os._exit skips atexit handlers, so pending outputs are written first
+    flush_outputs(timeout=60)
     os._exit(0)
     # print("Reloading config and restarting UI...")
     # config = load_config()
@@ -169,6 +173,7 @@ def all_tabs():
                 "Model Location Settings",
             ),
             ("tts_webui.utils.gpu_info_tab", "gpu_info_tab", "GPU Info"),
+            ("tts_webui.utils.model_cache_tab", "model_cache_tab", "Model Cache"),
             ("tts_webui.utils.pip_list_tab", "pip_list_tab", "Installed Packages"),
         ]
         load_tabs(settings_tabs)
@@ -217,8 +222,37 @@ def start_gradio_server():
             f"Gradio server will be available on http://localhost:{gradio_interface_options['server_port']}"
         )
 
+    # launch() blocks in debug mode even with prevent_thread_lock, which would
+    # keep the services below from starting, so the thread is blocked here
+    debug = gradio_interface_options.get("debug", False) or (
+        os.environ.pop("GRADIO_DEBUG", "0").strip() == "1"
+    )
+    block_thread = debug or not gradio_interface_options.get(
+        "prevent_thread_lock", False
+    )
     # concurrency_count=gradio_interface_options.get("concurrency_count", 5),
-    demo.queue().launch(**gradio_interface_options, allowed_paths=["."])
+    demo.queue().launch(
+        **{**gradio_interface_options, "prevent_thread_lock": True, "debug": False},
+        allowed_paths=["."],
+    )
+
+    from tts_webui.utils.model_cache_tab import add_metrics_route
+
+    add_metrics_route(demo.app)
+
+    # the server is listening, models can load without delaying the UI
+    from tts_webui.history_tab.history_watcher import start_history_watcher
+    from tts_webui.history_tab.trash import start_trash_purger
+    from tts_webui.utils.model_watcher import start_model_watcher
+    from tts_webui.utils.preload_models import start_preload
+
+    start_preload()
+    start_model_watcher()
+    start_history_watcher()
+    start_trash_purger()
+
+    if block_thread:
+        demo.block_thread()
 
 
 def server_hypervisor():
@@ -0,0 +1,127 @@
+"""
+Tests for writing generation outputs in the background.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.config.config import config
+from tts_webui.utils.outputs import async_writer
+from tts_webui.utils.outputs.async_writer import (
+    OutputWriterPool,
+    flush_outputs,
+    get_output_write_errors,
+    write_output,
+)
+
+
+def fail_to_write():
+    raise RuntimeError("disk full")
+
+
+class TestOutputWriterPool(unittest.TestCase):
+    """Test cases for the background output writers."""
+
+    def setUp(self):
+        """Set up a pool with one worker and async writing enabled."""
+        self.pool = OutputWriterPool(max_workers=1, max_pending=1)
+        self.result_dict = {"folder_root": "outputs/first"}
+        patches = [
+            patch.object(async_writer, "_pool", self.pool),
+            patch.dict(config, {"output_writer": {"async": True}}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.release = threading.Event()
+        # a blocked worker never finishes the test
+        self.addCleanup(self.release.set)
+
+    def _blocked_write(self, started=None):
+        if started is not None:
+            started.set()
+        self.release.wait(5)
+
+    def test_bounded_queue(self):
+        """Test that a full queue blocks the generation until a write is done."""
+        started = threading.Event()
+        write_output(self.result_dict, "wav", self._blocked_write, started)
+        self.assertTrue(started.wait(5))
+        # fills the queue while the worker is busy
+        write_output(self.result_dict, "json", self._blocked_write)
+
+        submitted = threading.Event()
+
+        def submit():
+            write_output(self.result_dict, "ogg", self._blocked_write)
+            submitted.set()
+
+        submitter = threading.Thread(target=submit)
+        submitter.start()
+        self.assertFalse(submitted.wait(0.2))
+
+        self.release.set()
+        self.assertTrue(submitted.wait(5))
+        submitter.join()
+        self.assertEqual(flush_outputs(timeout=5), [])
+
+    def test_flush_waits_for_pending_writes(self):
+        """Test that flush returns once the writes of the bundle are done."""
+        written = []
+
+        def write():
+            self.release.wait(5)
+            written.append("wav")
+
+        future = write_output(self.result_dict, "wav", write)
+        self.assertEqual(written, [])
+
+        flusher = threading.Thread(target=flush_outputs, args=(self.result_dict,))
+        flusher.start()
+        flusher.join(0.2)
+        self.assertTrue(flusher.is_alive())
+
+        self.release.set()
+        flusher.join(5)
+        self.assertFalse(flusher.is_alive())
+        self.assertEqual(written, ["wav"])
+        self.assertTrue(future.done())
+
+    def test_flush_other_bundle(self):
+        """Test that flushing a bundle does not wait for the writes of another."""
+        write_output(self.result_dict, "wav", self._blocked_write)
+
+        self.assertEqual(flush_outputs({"folder_root": "outputs/second"}), [])
+        self.assertEqual(flush_outputs(self.result_dict, timeout=0.1), [])
+        self.assertEqual(len(self.pool._pending), 1)
+
+    def test_errors_reach_the_caller(self):
+        """Test that a failed background write is returned by flush."""
+        future = write_output(self.result_dict, "ogg", fail_to_write)
+
+        errors = flush_outputs(self.result_dict, timeout=5)
+
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], RuntimeError)
+        self.assertIs(future.exception(), errors[0])
+        self.assertEqual(
+            [(e["bundle"], e["description"]) for e in get_output_write_errors()],
+            [("outputs/first", "ogg")],
+        )
+        self.assertEqual(self.pool._pending, {})
+
+    def test_synchronous_writes(self):
+        """Test that a write raises right away when async writing is disabled."""
+        with patch.dict(config, {"output_writer": {"async": False}}):
+            with self.assertRaises(RuntimeError):
+                write_output(self.result_dict, "ogg", fail_to_write)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests for the Bark prompt sidecars.
+"""
+
+import base64
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.utils.outputs.bark_prompts import (
+    SIDECAR_KEY,
+    load_bark_prompts,
+    move_prompts_to_sidecar,
+    save_bark_prompts,
+)
+
+
+class TestBarkPrompts(unittest.TestCase):
+    """Test cases for saving and loading the prompts of a generation."""
+
+    def setUp(self):
+        """Set up a temporary directory and a generation's prompts."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.audio = os.path.join(self.temp_dir, "generation.ogg")
+        self.prompts = {
+            "semantic_prompt": np.arange(700, dtype=np.int64),
+            "coarse_prompt": np.arange(3000, dtype=np.int64).reshape(2, -1),
+        }
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _assert_prompts(self, prompts):
+        for key, array in self.prompts.items():
+            np.testing.assert_array_equal(prompts[key], array)
+
+    def test_sidecar(self):
+        """Test that the metadata only names the sidecar."""
+        metadata = {SIDECAR_KEY: save_bark_prompts(self.audio, self.prompts)}
+        self.assertEqual(metadata, {SIDECAR_KEY: "generation.prompts.npz"})
+        with load_bark_prompts(self.audio, metadata) as prompts:
+            self._assert_prompts(prompts)
+
+    def test_move_base64_prompts(self):
+        """Test that the prompts of older files move to a sidecar."""
+        metadata = {
+            "text": "hello",
+            **{
+                key: base64.b64encode(array.tobytes()).decode("utf-8")
+                for key, array in self.prompts.items()
+            },
+        }
+        self._assert_prompts(load_bark_prompts(self.audio, metadata))
+
+        moved = move_prompts_to_sidecar(self.audio, metadata)
+        self.assertEqual(
+            moved, {"text": "hello", SIDECAR_KEY: "generation.prompts.npz"}
+        )
+        with load_bark_prompts(self.audio, moved) as prompts:
+            self._assert_prompts(prompts)
+        self.assertIsNone(move_prompts_to_sidecar(self.audio, moved))
+        self.assertIsNone(load_bark_prompts(self.audio, {"text": "hello"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for writing the outputs of a generation as one bundle.
+"""
+
+import json
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from tts_webui.utils.outputs import bundle_writer
+from tts_webui.utils.outputs.bundle_writer import MANIFEST_FILENAME, OutputBundle
+
+
+def write_text(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def fail_to_write(path):
+    raise RuntimeError("disk full")
+
+
+class TestOutputBundle(unittest.TestCase):
+    """Test cases for committing the staged files of a bundle."""
+
+    def setUp(self):
+        """Set up an output directory and a bundle for one generation."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = "2024-01-01_10-00-00__bark__first"
+        self.folder_root = os.path.join(self.temp_dir, self.filename)
+        self.bundle = OutputBundle(
+            {
+                "folder_root": self.folder_root,
+                "filename": self.filename,
+                "date": "2024-01-01 10:00:00",
+                "audio_out": (24000, np.zeros(16, dtype=np.float32)),
+            }
+        )
+        self.index_patch = patch.object(bundle_writer, "index_bundle")
+        self.index_bundle = self.index_patch.start()
+
+    def tearDown(self):
+        """Clean up the output directory."""
+        self.index_patch.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _partial_dirs(self):
+        return [name for name in os.listdir(self.temp_dir) if name.endswith(".partial")]
+
+    def _read_manifest(self):
+        with open(os.path.join(self.folder_root, MANIFEST_FILENAME)) as f:
+            return json.load(f)
+
+    def test_commit(self):
+        """Test that the staged files and the manifest are published together."""
+        self.bundle.stage(".txt", write_text, "text")
+        self.bundle.stage(".json", write_text, "{}")
+        self.assertFalse(os.path.exists(self.folder_root))
+
+        manifest = self.bundle.commit()
+
+        self.assertEqual(
+            sorted(os.listdir(self.folder_root)),
+            sorted(
+                [MANIFEST_FILENAME, self.filename + ".txt", self.filename + ".json"]
+            ),
+        )
+        self.assertEqual(self._read_manifest(), manifest)
+        self.assertEqual(
+            [file["name"] for file in manifest["files"]],
+            [self.filename + ".txt", self.filename + ".json"],
+        )
+        self.assertEqual(manifest["errors"], [])
+        self.assertEqual(self._partial_dirs(), [])
+        self.index_bundle.assert_called_once_with(self.folder_root)
+
+    def test_failed_writer(self):
+        """Test that a failed writer is recorded and the other files are kept."""
+        self.bundle.stage(".txt", write_text, "text")
+        self.bundle.stage(".ogg", fail_to_write)
+
+        manifest = self.bundle.commit()
+
+        self.assertEqual(
+            sorted(os.listdir(self.folder_root)),
+            sorted([MANIFEST_FILENAME, self.filename + ".txt"]),
+        )
+        self.assertEqual(len(manifest["errors"]), 1)
+        self.assertEqual(manifest["errors"][0]["name"], self.filename + ".ogg")
+        self.assertIn("disk full", manifest["errors"][0]["error"])
+        self.assertEqual(self._partial_dirs(), [])
+
+    def test_failed_publish(self):
+        """Test that a bundle that cannot be published leaves nothing behind."""
+        self.bundle.stage(".txt", write_text, "text")
+
+        with patch.object(OutputBundle, "_publish", side_effect=OSError("busy")):
+            with self.assertRaises(OSError):
+                self.bundle.commit()
+
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        self.index_bundle.assert_not_called()
+
+    def test_failed_manifest(self):
+        """Test that a manifest that cannot be written leaves nothing behind."""
+        self.bundle.stage(".txt", write_text, "text")
+
+        with patch.object(bundle_writer.json, "dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.bundle.commit()
+
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_publish_into_existing_folder(self):
+        """Test that a folder created in the meantime receives the files."""
+        os.makedirs(self.folder_root)
+        write_text(os.path.join(self.folder_root, "other.txt"), "other")
+        self.bundle.stage(".txt", write_text, "text")
+
+        self.bundle.commit()
+
+        self.assertEqual(
+            sorted(os.listdir(self.folder_root)),
+            sorted([MANIFEST_FILENAME, "other.txt", self.filename + ".txt"]),
+        )
+        self.assertEqual(self._partial_dirs(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Tests for the torch.compile artifact cache.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+
+@unittest.skipIf(torch is None, "torch is not installed")
+class TestCompileCache(unittest.TestCase):
+    """Test cases for saving and loading compiled artifacts."""
+
+    def setUp(self):
+        """Set up a temporary cache directory."""
+        from tts_webui.utils import compile_cache
+
+        self.compile_cache = compile_cache
+        self.temp_dir = tempfile.mkdtemp()
+        self.dir_patch = patch.object(
+            compile_cache, "COMPILE_CACHE_DIR", self.temp_dir
+        )
+        self.dir_patch.start()
+        self.env_patch = patch.dict(os.environ)
+        self.env_patch.start()
+        os.environ.pop("TORCHINDUCTOR_CACHE_DIR", None)
+
+    def tearDown(self):
+        """Clean up the temporary cache directory."""
+        self.env_patch.stop()
+        self.dir_patch.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_get_compile_cache_key(self):
+        """Test that the key contains the model, dtype and device."""
+        key = self.compile_cache.get_compile_cache_key(
+            "openai/whisper-large-v3", torch.float16, "cuda:0"
+        )
+        self.assertEqual(key, "openai_whisper-large-v3__float16__cuda_0")
+
+    def test_load_without_artifacts(self):
+        """Test that a missing cache is not an error."""
+        self.assertFalse(self.compile_cache.load_compile_cache("missing"))
+
+    def test_without_cache_artifacts_api(self):
+        """Test that a torch without the artifacts API turns the cache off."""
+        with patch.object(self.compile_cache, "_has_cache_artifacts", False):
+            self.assertFalse(self.compile_cache.save_compile_cache("missing"))
+            self.assertFalse(self.compile_cache.load_compile_cache("missing"))
+
+    def test_failed_save(self):
+        """Test that a failed save is reported instead of raised."""
+        with patch.object(self.compile_cache, "_has_cache_artifacts", True):
+            with patch.object(
+                torch.compiler,
+                "save_cache_artifacts",
+                side_effect=RuntimeError("unsupported"),
+                create=True,
+            ):
+                self.assertFalse(self.compile_cache.save_compile_cache("failed"))
+
+    @unittest.skipIf(shutil.which("g++") is None, "no C++ compiler")
+    def test_save_and_load_on_cpu(self):
+        """Test a round trip with the Inductor CPU backend."""
+        if not hasattr(torch.compiler, "save_cache_artifacts"):
+            self.skipTest("torch has no cache artifacts API")
+
+        key = self.compile_cache.get_compile_cache_key("linear", torch.float32, "cpu")
+        self.compile_cache.enable_compile_cache()
+        torch._dynamo.reset()
+        torch.compiler.reset()
+        model = torch.compile(torch.nn.Linear(4, 4), backend="inductor")
+        model(torch.randn(2, 4))
+
+        self.assertTrue(self.compile_cache.save_compile_cache(key))
+        path = self.compile_cache._get_artifacts_path(key)
+        self.assertTrue(os.path.exists(path))
+        self.assertIn(f"torch-{torch.__version__}", path)
+
+        torch._dynamo.reset()
+        self.assertTrue(self.compile_cache.load_compile_cache(key))
+
+
+if __name__ == '__main__':
+    unittest.main()
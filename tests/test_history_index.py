@@ -0,0 +1,173 @@
+"""
+Tests for the history index.
+"""
+
+import json
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.history_tab import history_index
+from tts_webui.history_tab.history_index import HistoryIndex
+
+
+class TestHistoryIndex(unittest.TestCase):
+    """Test cases for listing generations from the index."""
+
+    def setUp(self):
+        """Set up an output directory and an index."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.outputs = os.path.join(self.temp_dir, "outputs")
+        os.makedirs(self.outputs)
+        self.index = HistoryIndex(os.path.join(self.temp_dir, "index.sqlite3"))
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _add_bundle(self, name):
+        path = os.path.join(self.outputs, name)
+        os.makedirs(path)
+        return path
+
+    def _names(self):
+        return [os.path.basename(row[3]) for row in self.index.list_bundles(self.outputs)]
+
+    def test_list_newest_first(self):
+        """Test that bundles are listed newest first with their wav path."""
+        self._add_bundle("2024-01-01_10-00-00__bark__first")
+        self._add_bundle("2024-02-01_10-00-00__bark__second")
+        self._add_bundle(".2024-03-01_10-00-00__bark__partial.1234.partial")
+
+        rows = self.index.list_bundles(self.outputs)
+
+        self.assertEqual(
+            self._names(),
+            [
+                "2024-02-01_10-00-00__bark__second.wav",
+                "2024-01-01_10-00-00__bark__first.wav",
+            ],
+        )
+        self.assertEqual(rows[0][0].year, 2024)
+        self.assertEqual(rows[0][1], "Bark second")
+        self.assertEqual(
+            rows[0][3],
+            os.path.join(
+                self.outputs,
+                "2024-02-01_10-00-00__bark__second",
+                "2024-02-01_10-00-00__bark__second.wav",
+            ),
+        )
+
+    def test_reconcile_by_mtime(self):
+        """Test that bundles added or removed on disk are picked up."""
+        first = self._add_bundle("2024-01-01_10-00-00__bark__first")
+        self.assertEqual(len(self._names()), 1)
+
+        self._add_bundle("2024-02-01_10-00-00__bark__second")
+        shutil.rmtree(first)
+
+        self.assertEqual(self._names(), ["2024-02-01_10-00-00__bark__second.wav"])
+
+    def test_unchanged_directory_is_not_listed(self):
+        """Test that a settled directory is answered from the index alone."""
+        self._add_bundle("2024-01-01_10-00-00__bark__first")
+        # pretend the last change is old enough to trust its mtime
+        with patch.object(history_index, "_MTIME_SETTLE_NS", -(10**18)):
+            self.index.list_bundles(self.outputs)
+            with patch.object(history_index, "_list_bundle_names") as list_names:
+                self.assertEqual(len(self._names()), 1)
+                list_names.assert_not_called()
+
+    def test_add_and_remove(self):
+        """Test the incremental updates of the save and delete actions."""
+        self.assertEqual(self._names(), [])
+        path = self._add_bundle("2024-01-01_10-00-00__bark__first")
+        self.index.add(path)
+        self.assertEqual(len(self._names()), 1)
+
+        shutil.rmtree(path)
+        self.index.remove(path)
+        self.assertEqual(self._names(), [])
+
+    def test_forced_sync_of_watched_directory(self):
+        """Test that a refresh picks up changes the watcher missed."""
+        self.index.watch(self.outputs)
+        self._add_bundle("2024-01-01_10-00-00__bark__first")
+        self.assertEqual(self._names(), [])
+
+        self.index.sync(self.outputs, force=True)
+        self.assertEqual(self._names(), ["2024-01-01_10-00-00__bark__first.wav"])
+
+    def test_unparsable_names_are_listed_last(self):
+        """Test that bundles without a date sort after dated ones."""
+        self._add_bundle("my_bundle")
+        self._add_bundle("2024-01-01_10-00-00__bark__first")
+        self.assertEqual(
+            self._names(), ["2024-01-01_10-00-00__bark__first.wav", "my_bundle.wav"]
+        )
+
+    def test_pages(self):
+        """Test that pages are sliced after sorting."""
+        for day in range(1, 6):
+            self._add_bundle(f"2024-01-0{day}_10-00-00__bark__n{day}")
+
+        def page(offset, limit, sort):
+            rows = self.index.list_bundles(self.outputs, offset, limit, sort)
+            return [row[1] for row in rows]
+
+        self.assertEqual(self.index.count_bundles(self.outputs), 5)
+        self.assertEqual(page(0, 2, "newest"), ["Bark n5", "Bark n4"])
+        self.assertEqual(page(2, 2, "oldest"), ["Bark n3", "Bark n4"])
+        self.assertEqual(page(4, 2, "name"), ["Bark n5"])
+        with self.assertRaises(ValueError):
+            page(0, 2, "size")
+
+
+    def _write_sidecar(self, path, **metadata):
+        name = os.path.basename(path)
+        with open(os.path.join(path, f"{name}.json"), "w") as f:
+            json.dump(metadata, f)
+
+    def _search(self, query):
+        rows, total = self.index.search([self.outputs], query)
+        self.assertEqual(len(rows), total)
+        return [row[1] for row in rows]
+
+    def test_search_metadata(self):
+        """Test full-text terms and parameter filters over the sidecars."""
+        first = self._add_bundle("2024-01-01_10-00-00__musicgen__first")
+        self._write_sidecar(
+            first, _type="musicgen", text="Rain on a tin roof", seed=42
+        )
+        second = self._add_bundle("2024-02-01_10-00-00__bark__second")
+        self._write_sidecar(second, _type="bark", text="Ocean waves", seed=7)
+
+        self.assertEqual(self._search("rain"), ["Musicgen first"])
+        self.assertEqual(self._search("tin ro"), ["Musicgen first"])
+        self.assertEqual(self._search("seed:42"), ["Musicgen first"])
+        self.assertEqual(self._search("seed:4"), [])
+        self.assertEqual(self._search("type:bark"), ["Bark second"])
+        self.assertEqual(self._search("waves type:musicgen"), [])
+        self.assertEqual(self._search("after:2024-01-15"), ["Bark second"])
+        self.assertEqual(len(self._search("")), 2)
+
+    def test_search_sidecar_written_later(self):
+        """Test that a sidecar written after the bundle is indexed on add."""
+        path = self._add_bundle("2024-01-01_10-00-00__bark__first")
+        self.index.list_bundles(self.outputs)
+        self.assertEqual(self._search("thunder"), [])
+
+        self._write_sidecar(path, text="thunder")
+        self.index.add(path)
+        self.assertEqual(self._search("thunder"), ["Bark first"])
+
+
+if __name__ == '__main__':
+    unittest.main()
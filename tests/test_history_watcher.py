@@ -0,0 +1,148 @@
+"""
+Tests for the history watcher.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.history_tab import history_index
+from tts_webui.history_tab.history_index import HistoryIndex
+from tts_webui.history_tab.history_watcher import (
+    HistoryWatcher,
+    resolve_bundle_path,
+    resolve_history_directory,
+)
+
+
+class TestHistoryWatcher(unittest.TestCase):
+    """Test cases for applying file system events to the index."""
+
+    def setUp(self):
+        """Set up history directories and a watched index."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        for directory in ["outputs", "favorites", "collections"]:
+            os.makedirs(directory)
+        self.index = HistoryIndex("index.sqlite3")
+        self.watcher = HistoryWatcher(self.index)
+        self.index.watch("outputs")
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _event(self, *parts):
+        self.watcher.on_path_changed(os.path.join(self.temp_dir, *parts))
+
+    def test_bundle_events(self):
+        """Test that bundles are added and removed without listing."""
+        name = "2024-01-01_10-00-00__bark__first"
+        partial = f".{name}.1234.partial"
+        os.makedirs(os.path.join("outputs", partial))
+        self._event("outputs", partial, f"{name}.wav")
+        os.replace(os.path.join("outputs", partial), os.path.join("outputs", name))
+        self._event("outputs", partial)
+        self._event("outputs", name)
+
+        with patch.object(history_index, "_list_bundle_names") as list_names:
+            self.watcher.apply_pending()
+            self.assertEqual(
+                [row[1] for row in self.index.list_bundles("outputs")],
+                ["Bark first"],
+            )
+
+            shutil.rmtree(os.path.join("outputs", name))
+            self._event("outputs", name, f"{name}.wav")
+            self._event("outputs", name)
+            self.watcher.apply_pending()
+            self.assertEqual(self.index.list_bundles("outputs"), [])
+            list_names.assert_not_called()
+
+    def test_new_collection(self):
+        """Test that a new collection is listed once, then watched."""
+        os.makedirs(os.path.join("collections", "voices", "my_bundle"))
+        self._event("collections", "voices")
+        self._event("collections", "voices", "my_bundle")
+        version = self.index.version
+        self.watcher.apply_pending()
+
+        self.assertGreater(self.index.version, version)
+        with patch.object(history_index, "_list_bundle_names") as list_names:
+            self.assertEqual(
+                self.index.count_bundles(os.path.join("collections", "voices")), 1
+            )
+            list_names.assert_not_called()
+
+    def test_missing_root(self):
+        """Test that a directory created after the start is still listed."""
+        os.rmdir("favorites")
+        watcher = HistoryWatcher(self.index, poll_interval=0)
+        watcher.start()
+        try:
+            self.assertIsNotNone(watcher._observer)
+            os.makedirs(os.path.join("favorites", "my_bundle"))
+            self.assertEqual(self.index.count_bundles("favorites"), 1)
+        finally:
+            watcher._observer.stop()
+            watcher._observer.join()
+
+
+class TestResolvePaths(unittest.TestCase):
+    """Test cases for checking the paths of API requests."""
+
+    def setUp(self):
+        """Set up history directories with a generation."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        for directory in ["outputs", "favorites", "collections/voices"]:
+            os.makedirs(directory)
+        os.makedirs(os.path.join("outputs", "bundle"))
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_history_directories(self):
+        """Test that only the outputs, favorites and collections are accepted."""
+        self.assertEqual(resolve_history_directory("./outputs/"), "outputs")
+        self.assertEqual(
+            resolve_history_directory(os.path.join(self.temp_dir, "collections", "voices")),
+            os.path.join("collections", "voices"),
+        )
+        for directory in ["collections", ".", "..", "/", "outputs/bundle"]:
+            with self.assertRaises(ValueError):
+                resolve_history_directory(directory)
+
+    def test_bundle_paths(self):
+        """Test that only bundles directly inside a history directory are accepted."""
+        self.assertEqual(
+            resolve_bundle_path(os.path.join(self.temp_dir, "outputs", "bundle")),
+            os.path.join("outputs", "bundle"),
+        )
+        os.makedirs(os.path.join("outputs", ".trash"))
+        for bundle_path in [
+            "outputs",
+            "outputs/missing",
+            "outputs/.trash",
+            "outputs/bundle/..",
+            "favorites/../outputs/../..",
+            "collections/voices",
+            "/tmp",
+        ]:
+            with self.assertRaises(ValueError):
+                resolve_bundle_path(bundle_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for copying bundles with links.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.utils.link_tree import link_tree
+
+
+class TestLinkTree(unittest.TestCase):
+    """Test cases for sharing the files of a bundle."""
+
+    def setUp(self):
+        """Set up a bundle with audio and metadata."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.bundle = os.path.join(self.temp_dir, "bundle")
+        os.makedirs(self.bundle)
+        for name, data in [("bundle.wav", b"RIFF" * 1000), ("bundle.json", b"{}")]:
+            with open(os.path.join(self.bundle, name), "wb") as f:
+                f.write(data)
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _same_file(self, destination, name):
+        return os.path.samefile(
+            os.path.join(self.bundle, name), os.path.join(destination, name)
+        )
+
+    def test_link(self):
+        """Test that the audio is shared and the metadata copied."""
+        destination = os.path.join(self.temp_dir, "favorite")
+        methods = link_tree(self.bundle, destination)
+
+        self.assertEqual(sum(methods.values()), 2)
+        self.assertEqual(methods["copy"], 1)
+        with open(os.path.join(destination, "bundle.wav"), "rb") as f:
+            self.assertEqual(f.read(), b"RIFF" * 1000)
+        if "hardlink" in methods:
+            self.assertTrue(self._same_file(destination, "bundle.wav"))
+        self.assertFalse(self._same_file(destination, "bundle.json"))
+
+        # the favorite outlives the generation
+        shutil.rmtree(self.bundle)
+        self.assertTrue(os.path.exists(os.path.join(destination, "bundle.wav")))
+
+    def test_copy(self):
+        """Test that the copy mode never links."""
+        destination = os.path.join(self.temp_dir, "favorite")
+        self.assertEqual(link_tree(self.bundle, destination, "copy"), {"copy": 2})
+        self.assertFalse(self._same_file(destination, "bundle.wav"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,277 @@
+"""
+Tests for the model cache.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+# a Linear(256, 256) in float32
+MODEL_MB = (256 * 256 + 256) * 4 / 1024**2
+
+
+@unittest.skipIf(torch is None, "torch is not installed")
+class TestModelCache(unittest.TestCase):
+    """Test cases for caching small CPU models under a memory budget."""
+
+    def setUp(self):
+        """Set up a budget for one model and a temporary offload directory."""
+        from tts_webui.config.config import config
+        from tts_webui.utils import manage_model_state, model_offload
+
+        self.mms = manage_model_state
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch.object(model_offload, "OFFLOAD_DIR", self.temp_dir),
+            patch.dict(
+                config,
+                {
+                    "model_cache": {
+                        "cpu_memory_budget_mb": MODEL_MB * 1.5,
+                        "offload_to_disk": True,
+                        "max_rss_mb": None,
+                    }
+                },
+            ),
+        ]
+        for p in self.patches:
+            p.start()
+        torch.manual_seed(0)
+        self.loads = []
+
+    def tearDown(self):
+        """Unload the models and clean up the offload directory."""
+        self.mms.unload_all_models()
+        self.mms.model_states.clear()
+        self.mms._known_memory.clear()
+        for p in reversed(self.patches):
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _loader(self, namespace):
+        @self.mms.manage_model_state(namespace)
+        def load(model_name):
+            self.loads.append(model_name)
+            return torch.nn.Linear(256, 256)
+
+        return load
+
+    def _entry(self, namespace, model_name):
+        return self.mms.model_states[namespace].get_entry(model_name)
+
+    def test_budget_eviction(self):
+        """Test that the least recently used model goes to disk and comes back."""
+        load = self._loader("test-budget")
+        first = load("first")
+        weight = first.weight.detach().clone()
+        load("second")
+
+        self.assertEqual(self._entry("test-budget", "first").tier, "disk")
+        self.assertEqual(self._entry("test-budget", "second").tier, "cpu")
+
+        self.assertIs(load("first"), first)
+        self.assertTrue(torch.equal(first.weight, weight))
+        self.assertEqual(self._entry("test-budget", "second").tier, "disk")
+        self.assertEqual(self.loads, ["first", "second"])
+
+    def test_held_models_are_not_demoted(self):
+        """Test that a model used by a generation stays where it is."""
+        load = self._loader("test-hold")
+        with self.mms.hold_models():
+            load("held")
+            # loaded by another generation, outside of this hold
+            other = threading.Thread(target=load, args=("other",))
+            other.start()
+            other.join()
+            # as the model watcher does
+            self.mms.make_room()
+            self.assertEqual(self._entry("test-hold", "held").refcount, 1)
+            self.assertEqual(self._entry("test-hold", "held").tier, "cpu")
+            # the only model that could go, although it was used last
+            self.assertEqual(self._entry("test-hold", "other").tier, "disk")
+
+        self.assertEqual(self._entry("test-hold", "held").refcount, 0)
+
+    def test_demotion_does_not_block_the_cache(self):
+        """Test that models are written to disk without holding the cache lock."""
+        load = self._loader("test-demote")
+        first = load("first")
+        weight = first.weight.detach().clone()
+        offload_to_disk = self.mms.offload_to_disk
+        writing = threading.Event()
+        finish = threading.Event()
+        lock_free = []
+
+        def slow_offload_to_disk(models, snapshot_path):
+            writing.set()
+            finish.wait(5)
+            offload_to_disk(models, snapshot_path)
+
+        def check_lock():
+            if self.mms._cache_lock.acquire(blocking=False):
+                self.mms._cache_lock.release()
+                lock_free.append(True)
+
+        with patch.object(self.mms, "offload_to_disk", slow_offload_to_disk):
+            loader = threading.Thread(target=load, args=("second",))
+            loader.start()
+            self.assertTrue(writing.wait(5))
+            checker = threading.Thread(target=check_lock)
+            checker.start()
+            checker.join()
+
+            # waits for first to be written, then restores it
+            used = []
+            user = threading.Thread(target=lambda: used.append(load("first")))
+            user.start()
+            finish.set()
+            loader.join()
+            user.join()
+
+        self.assertEqual(lock_free, [True])
+        self.assertEqual(used, [first])
+        self.assertTrue(torch.equal(first.weight, weight))
+        self.assertEqual(self._entry("test-demote", "first").tier, "cpu")
+
+    def test_concurrent_loads(self):
+        """Test that concurrent callers share one load of a model."""
+        results = []
+
+        @self.mms.manage_model_state("test-concurrent")
+        def load(model_name):
+            self.loads.append(model_name)
+            # long enough for every caller to arrive during the load
+            time.sleep(0.2)
+            return torch.nn.Linear(256, 256)
+
+        def use():
+            results.append(load("same"))
+
+        threads = [threading.Thread(target=use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.loads, ["same"])
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self._entry("test-concurrent", "same").refcount, 0)
+
+    def test_preload_holds_the_model(self):
+        """Test that a preloaded model cannot be offloaded while warming up."""
+        from tts_webui.utils.preload_models import _preload
+
+        refcounts = []
+
+        def warmup(model):
+            refcounts.append(self._entry("test-preload", "warm").refcount)
+
+        self.mms.manage_model_state("test-preload", warmup=warmup)(
+            lambda model_name: torch.nn.Linear(256, 256)
+        )
+        _preload({"namespace": "test-preload", "model_name": "warm"})
+
+        self.assertEqual(refcounts, [1])
+        self.assertEqual(self._entry("test-preload", "warm").refcount, 0)
+
+    def test_out_of_memory_on_first_load(self):
+        """Test that a model of unknown size makes room and is loaded again."""
+        load = self._loader("test-oom")
+        load("first")
+
+        @self.mms.manage_model_state("test-oom-big")
+        def load_big(model_name):
+            self.loads.append(model_name)
+            if self._entry("test-oom", "first").tier == "cpu":
+                raise RuntimeError("DefaultCPUAllocator: can't allocate memory")
+            return torch.nn.Linear(256, 256)
+
+        load_big("big")
+
+        self.assertEqual(self.loads, ["first", "big", "big"])
+        self.assertEqual(self._entry("test-oom", "first").tier, "disk")
+        self.assertEqual(self._entry("test-oom-big", "big").tier, "cpu")
+
+    def test_other_errors_are_not_retried(self):
+        """Test that a loader failing for another reason is called once."""
+
+        @self.mms.manage_model_state("test-error")
+        def load(model_name):
+            self.loads.append(model_name)
+            raise ValueError("missing checkpoint")
+
+        with self.assertRaises(ValueError):
+            load("broken")
+        self.assertEqual(self.loads, ["broken"])
+
+    def test_default_cpu_budget(self):
+        """Test that the CPU memory is bounded without a configured budget."""
+        from tts_webui.utils.model_memory import get_cpu_memory_total
+
+        with patch.dict(self.mms.config, {"model_cache": {}}):
+            budget = self.mms.get_memory_budget("cpu")
+        self.assertEqual(budget, get_cpu_memory_total() // 2)
+
+    def test_cached_vram_is_not_pressure(self):
+        """Test that VRAM cached by PyTorch counts as free."""
+        with patch.object(self.mms, "get_gpu_memory_free", return_value=100 * 1024**2):
+            with patch.object(
+                self.mms, "get_gpu_memory_cached", return_value=600 * 1024**2
+            ):
+                # min_free_vram_mb defaults to 512
+                self.assertEqual(self.mms._get_headroom("gpu"), 188 * 1024**2)
+
+    def test_shared_modules(self):
+        """Test that a pipeline and the model it wraps are counted and moved together."""
+        load = self._loader("test-inner")
+
+        @self.mms.manage_model_state("test-pipe")
+        def load_pipe(model_name):
+            return {"model": load(model_name), "name": model_name}
+
+        pipe = load_pipe("shared")
+        weight = pipe["model"].weight.detach().clone()
+        x = torch.ones(1, 256)
+        expected = pipe["model"](x)
+
+        self.assertAlmostEqual(
+            self.mms.get_memory_used("cpu") / 1024**2, MODEL_MB, places=3
+        )
+        self.assertEqual(self._entry("test-inner", "shared").tier, "cpu")
+        self.assertTrue(torch.equal(pipe["model"](x), expected))
+
+        # the pipeline holds the model it wraps
+        with self.mms.hold_models():
+            load_pipe("shared")
+            load("other")
+            self.assertEqual(self._entry("test-inner", "shared").tier, "cpu")
+
+        load("other")
+        inner = self._entry("test-inner", "shared")
+        outer = self._entry("test-pipe", "shared")
+        self.assertEqual([inner.tier, outer.tier], ["disk", "disk"])
+        self.assertEqual(inner.snapshot_path, outer.snapshot_path)
+
+        self.assertIs(load_pipe("shared"), pipe)
+        self.assertEqual([inner.tier, outer.tier], ["cpu", "cpu"])
+        self.assertTrue(torch.equal(pipe["model"].weight, weight))
+        self.assertTrue(torch.equal(pipe["model"](x), expected))
+        self.assertEqual(self.loads, ["shared", "other"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for the waveform thumbnail cache.
+"""
+
+import json
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from scipy.io.wavfile import write as write_wav
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.utils.audio_array_to_sha256 import audio_array_to_sha256
+from tts_webui.utils.thumbnail_cache import ThumbnailCache
+
+
+class TestThumbnailCache(unittest.TestCase):
+    """Test cases for drawing and evicting waveform thumbnails."""
+
+    def setUp(self):
+        """Set up a cache directory and a generation."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ThumbnailCache(os.path.join(self.temp_dir, "thumbnails"))
+        self.audio = np.sin(np.linspace(0, 100, 24000)).astype(np.float32)
+        self.wav = self._write_wav("first", self.audio)
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_wav(self, name, audio):
+        path = os.path.join(self.temp_dir, f"{name}.wav")
+        write_wav(path, 24000, audio)
+        return path
+
+    def test_keyed_by_audio_hash(self):
+        """Test that copies of the same audio share one thumbnail."""
+        path = self.cache.get(self.wav, "list")
+        self.assertTrue(path.endswith(f"{audio_array_to_sha256(self.audio)}-250x75.png"))
+        self.assertTrue(os.path.exists(path))
+
+        copy = self._write_wav("copy", self.audio)
+        self.assertEqual(self.cache.get(copy, "list"), path)
+        self.assertNotEqual(self.cache.get(self.wav, "gallery"), path)
+
+    def test_sidecar_hash(self):
+        """Test that the hash of the metadata sidecar is used when present."""
+        audio_hash = "0" * 64
+        with open(self.wav.replace(".wav", ".json"), "w") as f:
+            json.dump({"hash": audio_hash}, f)
+        self.assertIn(audio_hash, self.cache.get(self.wav, "list"))
+
+    def test_missing_audio(self):
+        """Test that a bundle without audio has no thumbnail."""
+        self.assertIsNone(self.cache.get(os.path.join(self.temp_dir, "none.wav")))
+
+    def test_least_recently_used_are_evicted(self):
+        """Test that the cache is trimmed, oldest first, over its budget."""
+        first = self.cache.get(self.wav, "full")
+        os.utime(first, (0, 0))
+        self.cache.max_bytes = os.path.getsize(first) * 1.5
+
+        second = self.cache.get(self._write_wav("second", -self.audio), "full")
+
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+
+    def test_hashes_are_bounded(self):
+        """Test that only the most recently used audio hashes are kept."""
+        with mock.patch("tts_webui.utils.thumbnail_cache._MAX_HASHES", 1):
+            self.cache.get(self.wav, "list")
+            second = self._write_wav("second", -self.audio)
+            self.cache.get(second, "list")
+
+        self.assertEqual(len(self.cache._hashes), 1)
+        ((path, _, _),) = self.cache._hashes.keys()
+        self.assertEqual(path, os.path.abspath(second))
+
+
+if __name__ == '__main__':
+    unittest.main()
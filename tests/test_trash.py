@@ -0,0 +1,88 @@
+"""
+Tests for deleting generations through the trash.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.history_tab import history_index, trash
+from tts_webui.history_tab.history_index import HistoryIndex
+
+
+class TestTrash(unittest.TestCase):
+    """Test cases for moving generations to the trash and back."""
+
+    def setUp(self):
+        """Set up an output directory with two bundles."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        self.names = [
+            "2024-01-01_10-00-00__bark__first",
+            "2024-01-01_11-00-00__bark__second",
+        ]
+        for name in self.names:
+            os.makedirs(os.path.join("outputs", name))
+            with open(os.path.join("outputs", name, f"{name}.wav"), "wb") as f:
+                f.write(b"RIFF")
+        self.index = HistoryIndex("index.sqlite3")
+        patches = [
+            patch.object(history_index, "_history_index", self.index),
+            patch.object(trash, "start_trash_purger"),
+            patch.dict(trash._deleted, clear=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _paths(self):
+        return [os.path.join("outputs", name) for name in self.names]
+
+    def test_undo(self):
+        """Test that an undone deletion restores the bundles and the index."""
+        self.assertEqual(self.index.count_bundles("outputs"), 2)
+        token = trash.move_to_trash(self._paths())
+
+        self.assertEqual(os.listdir("outputs"), [trash.TRASH_DIRNAME])
+        self.assertEqual(self.index.count_bundles("outputs"), 0)
+
+        self.assertEqual(trash.undo_delete(token), self._paths())
+        self.assertEqual(sorted(os.listdir("outputs")), self.names)
+        self.assertEqual(self.index.count_bundles("outputs"), 2)
+        self.assertEqual(trash.undo_delete(token), [])
+
+    def test_empty_trash(self):
+        """Test that only the deletions past the undo time are removed."""
+        token = trash.move_to_trash(self._paths()[:1])
+        self.assertEqual(trash.empty_trash(max_age_seconds=60), 0)
+        self.assertEqual(trash.empty_trash(max_age_seconds=0), 1)
+
+        self.assertEqual(trash.undo_delete(token), [])
+        self.assertEqual(os.listdir("outputs"), self.names[1:])
+        self.assertEqual(self.index.count_bundles("outputs"), 1)
+
+    def test_failed_move_is_rolled_back(self):
+        """Test that a deletion failing partway restores the moved bundles."""
+        paths = self._paths() + [os.path.join("outputs", "missing")]
+        with self.assertRaises(FileNotFoundError):
+            trash.move_to_trash(paths)
+
+        self.assertEqual(sorted(os.listdir("outputs")), self.names)
+        self.assertEqual(self.index.count_bundles("outputs"), 2)
+        self.assertEqual(trash._deleted, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
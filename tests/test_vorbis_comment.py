@@ -0,0 +1,122 @@
+"""
+Tests for reading Vorbis comments from FLAC and Ogg files.
+"""
+
+import os
+import struct
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.utils.vorbis_comment import (
+    read_comment_tag,
+    read_directory_comments,
+    read_vorbis_comments,
+)
+
+
+def _comment_block(tags):
+    vendor = b"test"
+    data = struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", len(tags))
+    for tag in tags:
+        entry = tag.encode("utf-8")
+        data += struct.pack("<I", len(entry)) + entry
+    return data
+
+
+def _flac(tags):
+    def block(block_type, data, last=False):
+        header = bytes([block_type | (0x80 if last else 0)])
+        return header + struct.pack(">I", len(data))[1:] + data
+
+    return (
+        b"fLaC"
+        + block(0, bytes(34))
+        + block(6, bytes(1000))
+        + block(4, _comment_block(tags), last=True)
+    )
+
+
+def _ogg(packets):
+    """One page per 255 * 4 bytes of packet data, the CRC is left empty."""
+    lacing, body = [], b""
+    for packet in packets:
+        lacing += [255] * (len(packet) // 255) + [len(packet) % 255]
+        body += packet
+    pages, sequence = b"", 0
+    while lacing:
+        page_lacing, lacing = lacing[:4], lacing[4:]
+        size = sum(page_lacing)
+        page_body, body = body[:size], body[size:]
+        pages += (
+            b"OggS\x00\x00"
+            + struct.pack("<qIII", 0, 1234, sequence, 0)
+            + bytes([len(page_lacing)] + page_lacing)
+            + page_body
+        )
+        sequence += 1
+    return pages
+
+
+class TestVorbisComment(unittest.TestCase):
+    """Test cases for the tag reader."""
+
+    def setUp(self):
+        """Set up a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_flac(self):
+        """Test that the comment block is found after other blocks and ID3."""
+        id3 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + bytes(10)
+        path = self._write(
+            "a.flac", id3 + _flac(["description={\"text\": \"héllo\"}", "ENCODER=x"])
+        )
+        self.assertEqual(
+            read_vorbis_comments(path),
+            {"DESCRIPTION": "{\"text\": \"héllo\"}", "ENCODER": "x"},
+        )
+        self.assertEqual(read_comment_tag(path), "{\"text\": \"héllo\"}")
+
+    def test_ogg(self):
+        """Test that a comment packet spanning several pages is read."""
+        comment = "x" * 3000
+        path = self._write(
+            "a.ogg",
+            _ogg(
+                [
+                    b"\x01vorbis" + bytes(23),
+                    b"\x03vorbis" + _comment_block([f"COMMENT={comment}"]) + b"\x01",
+                    b"\x05vorbis" + bytes(100),
+                ]
+            ),
+        )
+        self.assertEqual(read_comment_tag(path), comment)
+
+    def test_directory(self):
+        """Test that files that cannot be read do not stop a batch."""
+        os.makedirs(os.path.join(self.temp_dir, "bundle"))
+        flac = self._write(os.path.join("bundle", "a.flac"), _flac(["TITLE=a"]))
+        broken = self._write("b.ogg", b"not an ogg file")
+        self._write("c.wav", b"RIFF")
+        self.assertEqual(
+            read_directory_comments(self.temp_dir),
+            {flac: {"TITLE": "a"}, broken: None},
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
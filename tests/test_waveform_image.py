@@ -0,0 +1,65 @@
+"""
+Tests for the waveform renderer.
+"""
+
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+from PIL import Image
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tts_webui.utils.waveform_image import (
+    BACKGROUND,
+    COLOR,
+    encode_png,
+    render_waveform,
+)
+
+
+class TestWaveformImage(unittest.TestCase):
+    """Test cases for rendering and encoding the waveform."""
+
+    def _line_pixels(self, image):
+        return np.all(image == COLOR, axis=-1)
+
+    def test_envelope_of_a_long_track(self):
+        """Test that every column of the axes spans the peaks under it."""
+        audio = np.tile(np.array([-0.5, 0.5], dtype=np.float32), 500_000)
+        image = render_waveform(audio)
+
+        self.assertEqual(image.shape, (300, 1000, 4))
+        line = self._line_pixels(image)
+        columns = np.flatnonzero(line.any(axis=0))
+        # inside the axes of the matplotlib plot, minus its 5% margins
+        self.assertGreater(columns[0], 125)
+        self.assertLess(columns[-1], 900)
+        self.assertEqual(len(columns), columns[-1] - columns[0] + 1)
+        # a solid band from the top to the bottom peak
+        rows = np.flatnonzero(line[:, columns[len(columns) // 2]])
+        self.assertEqual(len(rows), rows[-1] - rows[0] + 1)
+        self.assertGreater(rows[-1] - rows[0], 200)
+        self.assertTrue(np.all(image[0, 0] == BACKGROUND))
+
+    def test_short_and_empty_audio(self):
+        """Test that a few samples are drawn as a line and none as nothing."""
+        image = render_waveform(np.sin(np.linspace(0, 20, 100)))
+        line = self._line_pixels(image)
+        self.assertTrue(line.any())
+        self.assertLess(line.sum(axis=0).max(), 30)
+
+        self.assertFalse(self._line_pixels(render_waveform(np.zeros(0))).any())
+
+    def test_encode_png(self):
+        """Test that the PNG decodes to the same pixels."""
+        image = render_waveform(np.random.randn(10_000))
+        decoded = np.asarray(Image.open(io.BytesIO(encode_png(image))))
+        np.testing.assert_array_equal(decoded, image)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Compare encoding generations to ogg and flac with one ffmpeg process per
+file against the ffmpeg encoder pool.
+
+    python tools/benchmark_ffmpeg_encoding.py --clips 32 --seconds 5
+
+The per-file path starts ffmpeg for every format of every clip, one after
+the other. The pool encodes both formats of a clip in one process and runs
+as many processes at once as output_writer.ffmpeg_workers allows.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tts_webui.utils.outputs.ffmpeg_encoder import (
+    _escape_ffmetadata,
+    _get_pool,
+    submit_encode,
+)
+
+SAMPLE_RATE = 24_000
+FORMATS = ["ogg", "flac"]
+
+
+def encode_per_file(audio_bytes, base, comment):
+    for format in FORMATS:
+        with tempfile.NamedTemporaryFile(
+            "wb", suffix=".ffmetadata.ini", delete=False
+        ) as f:
+            f.write(f";FFMETADATA1\ncomment={_escape_ffmetadata(comment)}".encode())
+        args = ["ffmpeg", "-v", "error", "-y", "-f", "f32le"]
+        args += ["-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "pipe:", "-i", f.name]
+        args += ["-map_metadata", "1", "-f", format, f"{base}.{format}"]
+        subprocess.run(args, input=audio_bytes, capture_output=True, check=True)
+        os.remove(f.name)
+
+
+def encode_on_pool(clips, directory, comment):
+    futures = [
+        submit_encode(
+            audio_bytes,
+            SAMPLE_RATE,
+            1,
+            [(os.path.join(directory, f"{i}.{format}"), format) for format in FORMATS],
+            comment,
+        )
+        for i, audio_bytes in enumerate(clips)
+    ]
+    for future in futures:
+        future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clips", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = int(args.seconds * SAMPLE_RATE)
+    clips = [
+        (rng.standard_normal(samples, dtype=np.float32) * 0.1).tobytes()
+        for _ in range(args.clips)
+    ]
+    comment = json.dumps({"text": "benchmark", "seed": 0})
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        for i, audio_bytes in enumerate(clips):
+            encode_per_file(audio_bytes, os.path.join(temp_dir, f"{i}"), comment)
+        per_file = time.perf_counter() - start
+
+        # the workers start with the pool, not with the first encode
+        _get_pool()
+        start = time.perf_counter()
+        encode_on_pool(clips, temp_dir, comment)
+        pooled = time.perf_counter() - start
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"{args.clips} clips of {args.seconds}s to {' and '.join(FORMATS)}")
+    print(f"process per file   {per_file:8.3f}s")
+    print(f"encoder pool       {pooled:8.3f}s  ({_get_pool()._max_workers} workers)")
+    print(f"speedup            {per_file / pooled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
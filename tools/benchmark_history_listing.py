@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Time the listing of a large history against a target.
+
+    python tools/benchmark_history_listing.py --entries 100000 --target 1.0
+
+Creates empty bundle directories in a temporary folder, then times the
+direct listing with cold and warm name caches, and the history index.
+Exits with 1 if the warm listing takes longer than the target.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tts_webui.history_tab.generate_pretty_name import _generate_pretty_name
+from tts_webui.history_tab.get_wav_files import _walk_wav_files
+from tts_webui.history_tab.history_index import HistoryIndex
+from tts_webui.history_tab.parse_time import extract_and_parse_time
+
+MODELS = ["bark", "tortoise", "musicgen", "vall_e_x", "rvc"]
+
+
+def make_history(directory: str, entries: int):
+    start = 1_600_000_000
+    for i in range(entries):
+        timestamp = time.strftime("%Y-%m-%d_%H-%M-%S", time.gmtime(start + i * 61))
+        model = MODELS[i % len(MODELS)]
+        name = f"{timestamp}__{model}__None" if i % 7 else f"audio__{model}__{i}"
+        os.mkdir(os.path.join(directory, name))
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32}{elapsed:8.3f}s")
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--target", type=float, default=1.0, help="seconds")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        outputs = os.path.join(temp_dir, "outputs")
+        os.mkdir(outputs)
+        timed(
+            f"create {args.entries} bundles",
+            lambda: make_history(outputs, args.entries),
+        )
+
+        extract_and_parse_time.cache_clear()
+        _generate_pretty_name.cache_clear()
+        _, rows = timed("list, cold caches", lambda: _walk_wav_files(outputs))
+        assert len(rows) == args.entries
+        warm, _ = timed("list, warm caches", lambda: _walk_wav_files(outputs))
+
+        index = HistoryIndex(os.path.join(temp_dir, "index.sqlite3"))
+        timed("index, first sync", lambda: index.sync(outputs))
+        timed("index, sync unchanged", lambda: index.sync(outputs))
+        timed("index, page of 100", lambda: index.list_bundles(outputs, 0, 100))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"warm listing {'within' if warm <= args.target else 'over'} target")
+    return 0 if warm <= args.target else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Move the Bark prompts of existing ogg and flac files out of their comment
+tag into a .prompts.npz sidecar, leaving only its name in the tag.
+
+    python tools/migrate_bark_prompts.py [directories...] [--dry-run]
+
+The audio is not re-encoded, only the tags are rewritten.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tts_webui.utils.outputs.bark_prompts import (
+    PROMPT_KEYS,
+    SIDECAR_KEY,
+    move_prompts_to_sidecar,
+)
+from tts_webui.utils.outputs.ffmpeg_encoder import replace_comment
+from tts_webui.utils.vorbis_comment import read_comment_tag
+
+AUDIO_EXTENSIONS = (".ogg", ".flac")
+
+
+def find_audio_files(directories):
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if name.endswith(AUDIO_EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def migrate(filename: str, dry_run=False):
+    """
+    Returns:
+        int: The number of bytes the tag shrank by, 0 if nothing was moved.
+    """
+    comment = read_comment_tag(filename)
+    try:
+        metadata = json.loads(comment) if comment else None
+    except ValueError:
+        return 0
+    if not isinstance(metadata, dict):
+        return 0
+    if dry_run:
+        if SIDECAR_KEY in metadata or not all(key in metadata for key in PROMPT_KEYS):
+            return 0
+        return sum(len(metadata[key]) for key in PROMPT_KEYS)
+    metadata = move_prompts_to_sidecar(filename, metadata)
+    if metadata is None:
+        return 0
+    new_comment = json.dumps(metadata, ensure_ascii=False)
+    replace_comment(filename, new_comment)
+    return len(comment) - len(new_comment)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "directories", nargs="*", default=["outputs", "favorites", "collections"]
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only count the files to migrate"
+    )
+    args = parser.parse_args()
+
+    migrated = saved = failed = 0
+    for filename in find_audio_files(args.directories):
+        try:
+            shrunk = migrate(filename, args.dry_run)
+        except (OSError, ValueError, subprocess.CalledProcessError) as e:
+            print(f"Failed to migrate {filename}: {e}")
+            failed += 1
+            continue
+        if shrunk:
+            print(("Would migrate " if args.dry_run else "Migrated ") + filename)
+            migrated += 1
+            saved += shrunk
+
+    print(
+        f"{migrated} files {'to migrate' if args.dry_run else 'migrated'}, "
+        f"{saved / 1024:.1f} KiB of tags, {failed} failed"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
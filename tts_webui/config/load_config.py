@@ -38,6 +38,68 @@ default_config = {
     },
     "extensions": {
         "disabled": [],
+        # import extensions and build their tabs when first opened, which
+        # starts the server faster, their API endpoints are then missing
+        "lazy": False,
+        # package names built at startup even when lazy, e.g. for the API
+        "eager": [],
+    },
+    "preload": {
+        "max_workers": 1,
+        # e.g. {"namespace": "whisper-pipe", "model_name": "openai/whisper-large-v3",
+        # "module": "extensions.builtin.extension_whisper.main", "kwargs": {},
+        # "warmup": True}
+        "models": [],
+    },
+    "output_writer": {
+        # write all the files of a generation in one pass into a temp folder,
+        # which is renamed once complete
+        "bundle": True,
+        # write the outputs of a generation in the background and return the
+        # audio right away
+        "async": False,
+        "max_workers": 2,
+        # writes queued per worker before generations wait for the writers
+        "max_pending": 16,
+        # ffmpeg encoders running at once, 0 for the number of CPUs
+        "ffmpeg_workers": 0,
+    },
+    "history": {
+        # apply changes to outputs, favorites and collections to the history
+        # index as they happen, instead of listing the directories again
+        "watch_directories": True,
+        # used when watchdog is not installed or cannot watch, 0 to disable
+        "poll_interval_seconds": 5,
+        # how often open history tabs check for changes, 0 to disable
+        "live_refresh_seconds": 5,
+        # "link": favorites and collections share the audio files with the
+        # outputs through reflinks or hardlinks when possible, "copy": copy
+        "save_mode": "link",
+        # deleted generations are kept in a .trash folder this long for undo
+        "undo_delete_seconds": 60,
+    },
+    "thumbnails": {
+        # waveform images under data/cache/thumbnails, least recently used
+        # deleted first
+        "max_size_mb": 256,
+    },
+    "model_cache": {
+        # None: 80% of the total VRAM
+        "gpu_memory_budget_mb": None,
+        # None: half of the total RAM
+        "cpu_memory_budget_mb": None,
+        # models over the GPU budget are moved to pinned CPU memory
+        "offload_to_cpu": True,
+        # models over the CPU budget are moved to a memory-mapped disk snapshot
+        "offload_to_disk": False,
+        # None: models stay loaded until evicted
+        "idle_timeout_minutes": None,
+        # models are demoted when less VRAM is free, e.g. used by other processes
+        "min_free_vram_mb": 512,
+        # None: no limit on the resident memory of the process
+        "max_rss_mb": None,
+        # how often idle timeouts and memory pressure are checked, 0 to disable
+        "watch_interval_seconds": 30,
     },
 }
 
@@ -2,9 +2,11 @@ from .decorator_add_base_filename import decorator_add_base_filename
 from .decorator_add_date import decorator_add_date
 from .decorator_add_model_type import decorator_add_model_type
 from .decorator_apply_torch_seed import decorator_apply_torch_seed
+from .decorator_hold_models import decorator_hold_models
 from .decorator_log_generation import decorator_log_generation
 from .decorator_save_metadata import decorator_save_metadata
 from .decorator_save_musicgen_npz import decorator_save_musicgen_npz
 from .decorator_save_wav import decorator_save_wav
+from .decorator_write_output_bundle import decorator_write_output_bundle
 from .gradio_dict_decorator import dictionarize
 from .log_function_time import log_function_time
@@ -1,5 +1,7 @@
 import os
 from datetime import datetime
+from tts_webui.history_tab.history_index import index_bundle
+from tts_webui.utils.outputs.bundle_writer import create_bundle
 from tts_webui.utils.prompt_to_title import prompt_to_title
 
 output_path = "outputs"
@@ -23,7 +25,10 @@ def _create_base_filename(kwargs, result_dict):
     )
     result_dict["filename"] = base_filename
     result_dict["folder_root"] = os.path.join(output_path, base_filename)
-    os.makedirs(result_dict["folder_root"], exist_ok=True)
+    # a bundle creates the folder once every file is written
+    if not create_bundle(result_dict):
+        os.makedirs(result_dict["folder_root"], exist_ok=True)
+        index_bundle(result_dict["folder_root"])
     return result_dict
 
 
@@ -0,0 +1,44 @@
+from tts_webui.utils.manage_model_state import ModelHold, hold_models
+
+
+def decorator_hold_models(fn):
+    """
+    Keep the models used by the generation from being offloaded or unloaded
+    until it finishes.
+    """
+
+    def wrapper(*args, **kwargs):
+        with hold_models():
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def decorator_hold_models_generator(fn):
+    """
+    Keep the models used by the generation from being offloaded or unloaded
+    until it finishes.
+
+    Every step of a generator can run on a different worker thread, so the
+    hold is only activated while the generator is running.
+    """
+
+    def wrapper(*args, **kwargs):
+        hold = ModelHold()
+        iterator = None
+        try:
+            with hold.active():
+                iterator = fn(*args, **kwargs)
+            while True:
+                with hold.active():
+                    try:
+                        result_dict = next(iterator)
+                    except StopIteration:
+                        return
+                yield result_dict
+        finally:
+            if iterator is not None:
+                iterator.close()
+            hold.release()
+
+    return wrapper
@@ -1,12 +1,29 @@
+import hashlib
 import json
-from tts_webui.utils.audio_array_to_sha256 import audio_array_to_sha256
+import os
+
+from tts_webui.history_tab.history_index import index_bundle
+from tts_webui.utils.outputs.bundle_writer import get_audio_bytes, save_output
 from tts_webui.utils.outputs.path import get_relative_output_path_ext
 
 
+def _write_metadata(path, metadata):
+    with open(path, "w") as outfile:
+        json.dump(
+            metadata,
+            outfile,
+            indent=2,
+            skipkeys=True,
+            default=lambda o: f"<<non-serializable: {type(o).__qualname__}>>",
+        )
+    # make the parameters searchable, bundles are indexed when published
+    index_bundle(os.path.dirname(path))
+
+
 def decorator_save_metadata(fn):
     def wrapper(*args, **kwargs):
         result_dict = fn(*args, **kwargs)
-        path = get_relative_output_path_ext(result_dict, ".json")
+        path = get_relative_output_path_ext(result_dict, ".json", create=False)
         print("Saving metadata to", path)
 
         metadata = {
@@ -15,17 +32,11 @@ def decorator_save_metadata(fn):
             **kwargs,
             "outputs": None,
             "date": str(result_dict["date"]),
-            "hash": audio_array_to_sha256(result_dict["audio_out"][1]),
+            "hash": hashlib.sha256(get_audio_bytes(result_dict)).hexdigest(),
             # **result_dict,
         }
-        with open(path, "w") as outfile:
-            json.dump(
-                metadata,
-                outfile,
-                indent=2,
-                skipkeys=True,
-                default=lambda o: f"<<non-serializable: {type(o).__qualname__}>>",
-            )
+        # later writers, e.g. the ffmpeg decorators, modify the metadata
+        save_output(result_dict, ".json", _write_metadata, dict(metadata))
 
         result_dict["metadata"] = metadata
         return result_dict
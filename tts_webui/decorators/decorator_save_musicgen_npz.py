@@ -1,7 +1,7 @@
 from typing import Any
 import torch
 import numpy as np
-from tts_webui.utils.outputs.path import get_relative_output_path_ext
+from tts_webui.utils.outputs.bundle_writer import save_output
 from tts_webui.utils.pack_metadata import pack_metadata
 
 
@@ -21,9 +21,13 @@ def decorator_save_musicgen_npz(fn):
         tokens = result_dict["tokens"]
 
         if tokens is not None:
-            path = get_relative_output_path_ext(result_dict, ".npz")
-
-            save_npz_musicgen(path, tokens, result_dict["metadata"])
+            save_output(
+                result_dict,
+                ".npz",
+                save_npz_musicgen,
+                tokens,
+                dict(result_dict["metadata"]),
+            )
 
         return result_dict
 
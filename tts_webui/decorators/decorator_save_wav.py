@@ -1,13 +1,14 @@
 from scipy.io.wavfile import write as write_wav
+from tts_webui.utils.outputs.bundle_writer import save_output
 from tts_webui.utils.outputs.path import get_relative_output_path_ext
 
 
 def _save_wav(result_dict):
     SAMPLE_RATE, audio_array = result_dict["audio_out"]
 
-    path = get_relative_output_path_ext(result_dict, ".wav")
+    path = get_relative_output_path_ext(result_dict, ".wav", create=False)
     print("Saving generation to", path)
-    write_wav(path, SAMPLE_RATE, audio_array)
+    save_output(result_dict, ".wav", write_wav, SAMPLE_RATE, audio_array)
 
 
 def decorator_save_wav(fn):
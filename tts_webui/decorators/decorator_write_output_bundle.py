@@ -0,0 +1,44 @@
+from tts_webui.utils.outputs.bundle_writer import active_bundle_writer, commit_bundle
+
+
+def decorator_write_output_bundle(fn):
+    """
+    Write every output file of the generation in one pass once the save
+    decorators inside it have staged them.
+    """
+
+    def wrapper(*args, **kwargs):
+        with active_bundle_writer():
+            result_dict = fn(*args, **kwargs)
+        commit_bundle(result_dict)
+        return result_dict
+
+    return wrapper
+
+
+def decorator_write_output_bundle_generator(fn):
+    """
+    Write every output file of the generation in one pass once the save
+    decorators inside it have staged them.
+
+    Every step of a generator can run on a different worker thread, so the
+    writer is only marked active while the generator is running.
+    """
+
+    def wrapper(*args, **kwargs):
+        with active_bundle_writer():
+            iterator = fn(*args, **kwargs)
+        try:
+            while True:
+                with active_bundle_writer():
+                    try:
+                        result_dict = next(iterator)
+                    except StopIteration:
+                        return
+                if result_dict is not None:
+                    commit_bundle(result_dict)
+                yield result_dict
+        finally:
+            iterator.close()
+
+    return wrapper
@@ -1,5 +1,7 @@
 import importlib
 import importlib.util
+import inspect
+import threading
 from importlib.metadata import version
 import time
 from types import ModuleType
@@ -8,8 +10,21 @@ import functools
 
 import gradio as gr
 
+from tts_webui.decorators.decorator_hold_models import (
+    decorator_hold_models,
+    decorator_hold_models_generator,
+)
+from tts_webui.decorators.decorator_write_output_bundle import (
+    decorator_write_output_bundle,
+    decorator_write_output_bundle_generator,
+)
 from tts_webui.utils.pip_install import pip_install_wrapper, pip_uninstall_wrapper
 from tts_webui.utils.generic_error_tab_advanced import generic_error_tab_advanced
+from tts_webui.utils.timing_histograms import (
+    get_timing_histograms,
+    record_timing,
+    render_timings_markdown,
+)
 from tts_webui.extensions_loader.extensions_data_loader import (
     get_decorator_extensions,
     get_decorator_extensions_by_class,
@@ -41,6 +56,21 @@ def extension_decorator_list_tab():
             )
         gr.Markdown(table_string)
 
+        with gr.Accordion("Decorator Timings", open=False):
+            gr.Markdown(
+                "Time spent in each decorator per generation, excluding the decorators and the model it wraps."
+            )
+            timings = gr.Markdown(render_timings_markdown())
+            gr.Button("Refresh").click(
+                fn=render_timings_markdown,
+                outputs=[timings],
+            )
+            gr.Button("API_GET_DECORATOR_TIMINGS", visible=False).click(
+                fn=get_timing_histograms,
+                outputs=[gr.JSON(None, visible=False)],
+                api_name="get_decorator_timings",
+            )
+
         external_extension_list = [
             x for x in extension_list_json if "builtin" not in x["package_name"]
         ]
@@ -162,10 +192,79 @@ OUTER_WRAPPERS, OUTER_WRAPPERS_GEN = _load_decorators("outer")
 INNER_WRAPPERS, INNER_WRAPPERS_GEN = _load_decorators("inner")
 
 
-def _create_decorator(wrappers_list):
+# time spent in the layers called by the running layer, one frame per layer
+_timing_local = threading.local()
+
+
+def _get_timing_stack():
+    if not hasattr(_timing_local, "stack"):
+        _timing_local.stack = []
+    return _timing_local.stack
+
+
+def _time_step(name, step):
+    """Run step() and record its self-time: its duration minus nested layers."""
+    stack = _get_timing_stack()
+    stack.append(0.0)
+    start = time.perf_counter()
+    record = True
+    try:
+        result = step()
+        # generators do their work when iterated, every step is timed
+        record = not inspect.isgenerator(result)
+        return result
+    except StopIteration:
+        record = False
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = stack.pop()
+        if record:
+            record_timing(name, elapsed - nested)
+        if stack:
+            stack[-1] += elapsed
+
+
+def _time_generator(name, iterator):
+    try:
+        while True:
+            try:
+                result = _time_step(name, lambda: next(iterator))
+            except StopIteration:
+                return
+            yield result
+    finally:
+        iterator.close()
+
+
+def _time_layer(name, fn):
+    """Measure the self-time of one layer of the decorator chain."""
+
+    def timed(*args, **kwargs):
+        result = _time_step(name, lambda: fn(*args, **kwargs))
+        if inspect.isgenerator(result):
+            return _time_generator(name, result)
+        return result
+
+    return timed
+
+
+def _get_decorator_name(wrapper):
+    return getattr(wrapper, "__name__", type(wrapper).__name__)
+
+
+def _create_decorator(wrappers_list, base_name):
+    """
+    Wrap a function with every decorator of the list.
+
+    Every layer is timed separately; base_name labels the wrapped function,
+    since its name is lost by the core decorators.
+    """
+
     def decorator(fn0):
+        fn0 = _time_layer(base_name, fn0)
         for wrapper in wrappers_list:
-            fn0 = wrapper(fn0)
+            fn0 = _time_layer(_get_decorator_name(wrapper), wrapper(fn0))
 
         @functools.wraps(fn0)
         def wrapped(*args, **kwargs):
@@ -177,10 +276,24 @@ def _create_decorator(wrappers_list):
 
 
 # Define the four decorators using the helper function
-decorator_extension_outer = _create_decorator(OUTER_WRAPPERS)
-decorator_extension_inner = _create_decorator(INNER_WRAPPERS)
-decorator_extension_outer_generator = _create_decorator(OUTER_WRAPPERS_GEN)
-decorator_extension_inner_generator = _create_decorator(INNER_WRAPPERS_GEN)
+# The outer decorators hold the models used by a generation until it finishes,
+# and write the output files staged by the save decorators once it returns
+# Inside the outer decorators, the core decorators (save wav, metadata, ...)
+# run before the inner decorators and the model.
+decorator_extension_outer = _create_decorator(
+    [*OUTER_WRAPPERS, decorator_hold_models, decorator_write_output_bundle],
+    "(core decorators)",
+)
+decorator_extension_inner = _create_decorator(INNER_WRAPPERS, "(model)")
+decorator_extension_outer_generator = _create_decorator(
+    [
+        *OUTER_WRAPPERS_GEN,
+        decorator_hold_models_generator,
+        decorator_write_output_bundle_generator,
+    ],
+    "(core decorators)",
+)
+decorator_extension_inner_generator = _create_decorator(INNER_WRAPPERS_GEN, "(model)")
 
 if __name__ == "__main__":
     pass
@@ -6,6 +6,7 @@ import time
 import gradio as gr
 
 from tts_webui.config.config import config
+from tts_webui.config.load_config import default_config
 from tts_webui.utils.pip_install import pip_install_wrapper, pip_uninstall_wrapper
 from tts_webui.utils.generic_error_tab_advanced import generic_error_tab_advanced
 from tts_webui.extensions_loader.extensions_data_loader import (
@@ -36,30 +37,17 @@ def _handle_package(package_name, title_name, requirements):
             )
         return
 
+    if _is_lazy(package_name):
+        _lazy_extension_tab(package_name, title_name, requirements)
+        return
+
     print(f"Loading {title_name} Extension...", end="")
     start_time = time.time()
     try:
         module = importlib.import_module(f"{package_name}.main")
-        package_version = (
-            "0.0.1" if "builtin" in package_name else version(package_name)
-        )
-        main_tab = getattr(module, "extension__tts_generation_webui")
+        extension_ui = _get_extension_ui(module, package_name, title_name, requirements)
         with gr.Tab(title_name):
-            if "builtin" in package_name:
-                gr.Markdown(f"{title_name} Extension is up to date")
-            else:
-                if hasattr(module, "update_button"):
-                    update_button = getattr(module, "update_button")
-                    update_button()
-                else:
-                    _extension_management_ui(
-                        package_name,
-                        title_name,
-                        requirements,
-                        package_version,
-                        show=False,
-                    )
-            main_tab()
+            extension_ui()
     except Exception as e:
         generic_error_tab_advanced(e, name=title_name, requirements=requirements)
     finally:
@@ -67,6 +55,74 @@ def _handle_package(package_name, title_name, requirements):
         print(f" done in {elapsed_time:.2f} seconds.")
 
 
+def _get_extension_ui(module, package_name, title_name, requirements):
+    """The function that builds the tab of an imported extension."""
+    package_version = "0.0.1" if "builtin" in package_name else version(package_name)
+    main_tab = getattr(module, "extension__tts_generation_webui")
+
+    def extension_ui():
+        if "builtin" in package_name:
+            gr.Markdown(f"{title_name} Extension is up to date")
+        else:
+            if hasattr(module, "update_button"):
+                update_button = getattr(module, "update_button")
+                update_button()
+            else:
+                _extension_management_ui(
+                    package_name,
+                    title_name,
+                    requirements,
+                    package_version,
+                    show=False,
+                )
+        main_tab()
+
+    return extension_ui
+
+
+def _is_lazy(package_name):
+    extensions_config = {
+        **default_config["extensions"],
+        **config.get("extensions", {}),
+    }
+    return extensions_config["lazy"] and package_name not in extensions_config["eager"]
+
+
+def _lazy_extension_tab(package_name, title_name, requirements):
+    """
+    A tab that imports its extension and builds the UI when first selected,
+    in each browser session. The module is only imported once.
+
+    The event listeners are created with the UI, so the extension's API
+    endpoints do not exist until then, see the extensions.eager config.
+    """
+    with gr.Tab(title_name) as tab:
+        placeholder = gr.Markdown(f"{title_name} Extension loads when opened.")
+        opened = gr.State(False)
+        tab.select(
+            fn=lambda: {opened: True, placeholder: gr.Markdown(visible=False)},
+            outputs=[opened, placeholder],
+        )
+
+        @gr.render(inputs=[opened], triggers=[opened.change])
+        def _render(is_opened):
+            if not is_opened:
+                return
+            print(f"Loading {title_name} Extension...", end="")
+            start_time = time.time()
+            try:
+                module = importlib.import_module(f"{package_name}.main")
+                _get_extension_ui(module, package_name, title_name, requirements)()
+            except Exception as e:
+                with gr.Tabs():
+                    generic_error_tab_advanced(
+                        e, name=title_name, requirements=requirements
+                    )
+            finally:
+                elapsed_time = time.time() - start_time
+                print(f" done in {elapsed_time:.2f} seconds.")
+
+
 def disable_extension(package_name):
     def _disable_extension():
         disabled_extensions.append(package_name)
@@ -1,5 +1,12 @@
-import shutil
+from tts_webui.history_tab.history_watcher import resolve_bundle_path
+from tts_webui.history_tab.trash import move_to_trash
 
 
 def delete_generation(directory: str):
-    shutil.rmtree(directory)
+    """
+    Move a generation to the trash, returns the token to undo it with.
+
+    Raises:
+        ValueError: If the directory is not a generation in the history.
+    """
+    return move_to_trash([resolve_bundle_path(directory)])
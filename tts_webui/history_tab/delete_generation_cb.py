@@ -1,9 +1,9 @@
-import shutil
+from tts_webui.history_tab.delete_generation import delete_generation as _delete
 
 
 def delete_generation_cb(refresh):
     def delete_generation(directory: str, *args):
-        shutil.rmtree(directory)
+        _delete(directory)
         return refresh(*args)
 
     return delete_generation
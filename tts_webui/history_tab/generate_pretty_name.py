@@ -1,14 +1,19 @@
+import functools
 import os
-import re
+
+from tts_webui.history_tab.parse_time import TIME_REGEX
 
 
 def generate_pretty_name(directory: str):
-    name = directory
     # remove directory name
-    name = os.path.basename(name)
+    return _generate_pretty_name(os.path.basename(directory))
+
+
+# one entry per bundle of a large history
+@functools.lru_cache(maxsize=2**17)
+def _generate_pretty_name(name: str):
     # remove the date and time
-    date_regex = r"([0-9]{4}-[0-9]{2}-[0-9]{2}_[0-9]{2}-[0-9]{2}-[0-9]{2})"
-    name = re.sub(date_regex, "", name)
+    name = TIME_REGEX.sub("", name)
     # remove "audio"
     name = name.replace("audio", "")
     # replace _long with (long)
@@ -15,6 +15,9 @@ def _generate_relative_date(date: datetime):
 
 
 def generate_relative_date(date: datetime):
+    # bundles without a time in their name, not worth a log line per row
+    if date is None:
+        return "Unknown"
     try:
         return _generate_relative_date(date)
     except Exception as e:
@@ -1,12 +1,76 @@
 import os
 import datetime
+import sqlite3
 
 from tts_webui.history_tab.generate_pretty_name import generate_pretty_name
 from tts_webui.history_tab.generate_relative_date import generate_relative_date
+from tts_webui.history_tab.history_index import get_history_index
 from tts_webui.history_tab.parse_time import extract_and_parse_time
 
 
 def get_wav_files(directory: str):
+    try:
+        return get_history_index().list_bundles(directory)
+    except sqlite3.Error as e:
+        print(f"History index unavailable, listing {directory} directly: {e}")
+        return _walk_wav_files(directory)
+
+
+def get_wav_files_page(directory: str, page=1, page_size=100, sort="newest"):
+    """
+    Get one page of the generations in a directory.
+
+    Args:
+        directory (str): The output or collection directory.
+        page (int): The page number, starting at 1.
+        page_size (int): Number of generations per page.
+        sort (str): "newest", "oldest" or "name".
+
+    Returns:
+        tuple: (rows, total), rows as returned by get_wav_files.
+    """
+    page_size = max(1, int(page_size))
+    offset = (max(1, int(page)) - 1) * page_size
+    try:
+        index = get_history_index()
+        rows = index.list_bundles(directory, offset, page_size, sort)
+        return rows, index.count_bundles(directory)
+    except sqlite3.Error as e:
+        print(f"History index unavailable, listing {directory} directly: {e}")
+        rows = _walk_wav_files(directory)
+        if sort == "oldest":
+            rows.reverse()
+        elif sort == "name":
+            rows.sort(key=lambda x: x[1])
+        return rows[offset : offset + page_size], len(rows)
+
+
+def search_wav_files_page(
+    directories, query: str, page=1, page_size=100, sort="newest"
+):
+    """
+    Get one page of the generations whose metadata matches a search query.
+
+    Args:
+        directories (list): The output and collection directories to search.
+        query (str): Terms and parameter filters, e.g. "rain seed:42".
+        page (int): The page number, starting at 1.
+        page_size (int): Number of generations per page.
+        sort (str): "newest", "oldest" or "name".
+
+    Returns:
+        tuple: (rows, total), rows as returned by get_wav_files.
+    """
+    page_size = max(1, int(page_size))
+    offset = (max(1, int(page)) - 1) * page_size
+    try:
+        return get_history_index().search(directories, query, offset, page_size, sort)
+    except sqlite3.Error as e:
+        print(f"History index unavailable, cannot search: {e}")
+        return [], 0
+
+
+def _walk_wav_files(directory: str):
     def get_wav_in_dir(dir_path: str):
         return os.path.join(dir_path, f"{os.path.basename(dir_path)}.wav")
 
@@ -25,7 +89,10 @@ def get_wav_files(directory: str):
         ]
 
     file_date_list = [
-        get_directory_info(directory) for directory in list_of_directories
+        get_directory_info(directory)
+        for directory in list_of_directories
+        # output bundles that are still being written
+        if not directory.startswith(".")
     ]
 
     # order by date
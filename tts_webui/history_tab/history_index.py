@@ -0,0 +1,457 @@
+import datetime
+import json
+import os
+import shlex
+import sqlite3
+import threading
+import time
+
+from tts_webui.history_tab.generate_pretty_name import generate_pretty_name
+from tts_webui.history_tab.generate_relative_date import generate_relative_date
+from tts_webui.history_tab.parse_time import extract_and_parse_time
+from tts_webui.utils.outputs.bark_prompts import PROMPT_KEYS, SIDECAR_KEY
+from tts_webui.utils.vorbis_comment import read_comment_tag
+
+INDEX_PATH = os.path.join("data", "history_index.sqlite3")
+
+# directory changes this recent may share an mtime with a change to come
+_MTIME_SETTLE_NS = 2 * 1_000_000_000
+
+# bump to rebuild the index when the schema changes
+SCHEMA_VERSION = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bundles (
+    id INTEGER PRIMARY KEY,
+    directory TEXT NOT NULL,
+    name TEXT NOT NULL,
+    timestamp TEXT,
+    pretty_name TEXT NOT NULL,
+    -- the JSON sidecar, NULL until it is written
+    params TEXT,
+    search_text TEXT NOT NULL DEFAULT '',
+    UNIQUE (directory, name)
+);
+CREATE INDEX IF NOT EXISTS bundles_by_date ON bundles (directory, timestamp DESC);
+CREATE INDEX IF NOT EXISTS bundles_by_name ON bundles (directory, pretty_name);
+CREATE TABLE IF NOT EXISTS directories (
+    directory TEXT PRIMARY KEY,
+    mtime_ns INTEGER
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS bundles_fts USING fts5 (
+    search_text, content='bundles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS bundles_fts_insert AFTER INSERT ON bundles BEGIN
+    INSERT INTO bundles_fts (rowid, search_text) VALUES (new.id, new.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS bundles_fts_delete AFTER DELETE ON bundles BEGIN
+    INSERT INTO bundles_fts (bundles_fts, rowid, search_text)
+    VALUES ('delete', old.id, old.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS bundles_fts_update AFTER UPDATE ON bundles BEGIN
+    INSERT INTO bundles_fts (bundles_fts, rowid, search_text)
+    VALUES ('delete', old.id, old.search_text);
+    INSERT INTO bundles_fts (rowid, search_text) VALUES (new.id, new.search_text);
+END;
+"""
+
+_DROP_SCHEMA = """
+DROP TABLE IF EXISTS bundles_fts;
+DROP TABLE IF EXISTS bundles;
+DROP TABLE IF EXISTS directories;
+"""
+
+# sidecar keys that are not worth searching
+_UNSEARCHED_KEYS = {
+    "_version",
+    "_hash_version",
+    "hash",
+    "date",
+    "outputs",
+    SIDECAR_KEY,
+}
+
+# search terms that are not parameter names
+_SEARCH_ALIASES = {
+    "type": ["_type"],
+    "model": ["model_name", "model"],
+}
+
+
+# bundles without a date are listed last
+SORT_ORDERS = {
+    "newest": "timestamp DESC",
+    "oldest": "timestamp IS NULL, timestamp ASC",
+    "name": "pretty_name ASC, timestamp DESC",
+}
+
+
+def _normalize(directory: str):
+    return os.path.normpath(directory)
+
+
+def _read_tagged_metadata(directory: str, name: str):
+    # bundles saved without the .json sidecar, with the metadata in the tags
+    for extension in [".ogg", ".flac"]:
+        filename = os.path.join(directory, name, f"{name}{extension}")
+        if os.path.exists(filename):
+            metadata = json.loads(read_comment_tag(filename) or "null")
+            if isinstance(metadata, dict):
+                # base64 in older bark files, not worth indexing
+                for key in PROMPT_KEYS:
+                    metadata.pop(key, None)
+            return metadata
+    return None
+
+
+def _read_metadata(directory: str, name: str):
+    try:
+        with open(os.path.join(directory, name, f"{name}.json")) as f:
+            metadata = json.load(f)
+    except FileNotFoundError:
+        try:
+            metadata = _read_tagged_metadata(directory, name)
+        except (OSError, ValueError):
+            return None
+    except (OSError, ValueError):
+        return None
+    return metadata if isinstance(metadata, dict) else None
+
+
+def _get_search_text(metadata):
+    values = []
+
+    def add(value):
+        if isinstance(value, dict):
+            for v in value.values():
+                add(v)
+        elif isinstance(value, list):
+            for v in value:
+                add(v)
+        elif isinstance(value, str):
+            if not value.startswith("<<non-serializable"):
+                values.append(value)
+        elif value is not None:
+            values.append(str(value))
+
+    for key, value in metadata.items():
+        if key not in _UNSEARCHED_KEYS:
+            add(value)
+    return "\n".join(values)
+
+
+def parse_search_query(query: str):
+    """
+    Split a search query into full-text terms and parameter filters.
+
+    "rain seed:42 type:musicgen after:2024-09-01" searches for "rain" in the
+    metadata of generations with seed 42, of type musicgen, made after
+    2024-09-01. Quoted terms are searched as phrases.
+
+    Returns:
+        tuple: (terms, filters), filters as {parameter: value}.
+    """
+    terms = []
+    filters = {}
+    try:
+        tokens = shlex.split(query or "")
+    except ValueError:
+        # an unclosed quote
+        tokens = (query or "").split()
+    for token in tokens:
+        key, sep, value = token.partition(":")
+        if sep and key and value and " " not in key:
+            filters[key] = value
+        elif token:
+            terms.append(token)
+    return terms, filters
+
+
+def _fts_query(terms):
+    # every term is quoted, so the query syntax of FTS5 does not leak to users
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def _list_bundle_names(directory: str):
+    with os.scandir(directory) as entries:
+        return {
+            entry.name
+            for entry in entries
+            # output bundles that are still being written are hidden
+            if entry.is_dir() and not entry.name.startswith(".")
+        }
+
+
+class HistoryIndex:
+    """
+    SQLite index of the generation bundles (subdirectories) of the output
+    and collection directories.
+
+    A directory is only listed again when its mtime changes, which happens
+    whenever a bundle is added, removed or renamed in it, and then only the
+    new bundles are parsed.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        # directories kept up to date by the history watcher
+        self._watched = set()
+        # incremented on every change, for the UI to refresh
+        self.version = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+            if version != SCHEMA_VERSION:
+                # the index only caches what is on disk, so it is rebuilt
+                self._connection.executescript(_DROP_SCHEMA)
+            self._connection.executescript(_SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _insert(self, directory: str, names):
+        rows = []
+        for name in names:
+            timestamp = extract_and_parse_time(name)
+            pretty_name = generate_pretty_name(name)
+            metadata = _read_metadata(directory, name)
+            rows.append(
+                (
+                    directory,
+                    name,
+                    timestamp.isoformat(sep=" ") if timestamp else None,
+                    pretty_name,
+                    json.dumps(metadata) if metadata is not None else None,
+                    "\n".join([pretty_name, _get_search_text(metadata or {})]).strip(),
+                )
+            )
+        self._connection.executemany(
+            "INSERT INTO bundles "
+            "(directory, name, timestamp, pretty_name, params, search_text) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (directory, name) DO UPDATE SET "
+            "timestamp = excluded.timestamp, pretty_name = excluded.pretty_name, "
+            "params = excluded.params, search_text = excluded.search_text",
+            rows,
+        )
+
+    def sync(self, directory: str, force=False):
+        """
+        Reconcile the index with the directory if its mtime changed.
+
+        Watched directories are skipped unless forced, their changes arrive
+        through add and remove.
+        """
+        key = _normalize(directory)
+        if key in self._watched and not force:
+            return
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock, self._connection:
+                deleted = self._connection.execute(
+                    "DELETE FROM bundles WHERE directory = ?", (key,)
+                ).rowcount
+                self._connection.execute(
+                    "DELETE FROM directories WHERE directory = ?", (key,)
+                )
+                if deleted:
+                    self.version += 1
+            return
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime_ns FROM directories WHERE directory = ?", (key,)
+            ).fetchone()
+            if row is not None and row[0] == mtime_ns and not force:
+                return
+
+            on_disk = _list_bundle_names(directory)
+            indexed = {
+                name
+                for (name,) in self._connection.execute(
+                    "SELECT name FROM bundles WHERE directory = ?", (key,)
+                )
+            }
+            settled = time.time_ns() - mtime_ns > _MTIME_SETTLE_NS
+            with self._connection:
+                self._connection.executemany(
+                    "DELETE FROM bundles WHERE directory = ? AND name = ?",
+                    [(key, name) for name in indexed - on_disk],
+                )
+                self._insert(key, on_disk - indexed)
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO directories VALUES (?, ?)",
+                    (key, mtime_ns if settled else None),
+                )
+            if on_disk != indexed:
+                self.version += 1
+
+    def watch(self, directory: str):
+        """Reconcile the directory once, then only apply the watcher's events."""
+        self.sync(directory, force=True)
+        self._watched.add(_normalize(directory))
+
+    def unwatch(self, directory: str):
+        self._watched.discard(_normalize(directory))
+
+    def add(self, bundle_path: str):
+        """Index a bundle that was just written, or whose sidecar was."""
+        directory, name = os.path.split(_normalize(bundle_path))
+        if name.startswith("."):
+            # still being written, indexed once it is published
+            return
+        with self._lock, self._connection:
+            self._insert(directory, [name])
+            self.version += 1
+
+    def remove(self, bundle_path: str):
+        """Drop a bundle that was just deleted or moved from the index."""
+        directory, name = os.path.split(_normalize(bundle_path))
+        with self._lock, self._connection:
+            deleted = self._connection.execute(
+                "DELETE FROM bundles WHERE directory = ? AND name = ?",
+                (directory, name),
+            ).rowcount
+            if deleted:
+                self.version += 1
+
+    def list_bundles(self, directory: str, offset=0, limit=None, sort="newest"):
+        """
+        List the bundles of a directory.
+
+        Args:
+            directory (str): The output or collection directory.
+            offset (int): Number of bundles to skip.
+            limit (int, optional): Maximum number of bundles, all if None.
+            sort (str): One of SORT_ORDERS.
+
+        Returns:
+            list: [timestamp, pretty name, relative date, wav path] rows, as
+            returned by get_wav_files.
+        """
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort}")
+        self.sync(directory)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name, timestamp, pretty_name FROM bundles "
+                f"WHERE directory = ? ORDER BY {SORT_ORDERS[sort]} LIMIT ? OFFSET ?",
+                (_normalize(directory), -1 if limit is None else limit, offset),
+            ).fetchall()
+        return [self._to_row(directory, *row) for row in rows]
+
+    def count_bundles(self, directory: str):
+        self.sync(directory)
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM bundles WHERE directory = ?",
+                (_normalize(directory),),
+            ).fetchone()[0]
+
+    def search(self, directories, query="", offset=0, limit=None, sort="newest"):
+        """
+        Search the metadata of the bundles of several directories.
+
+        Args:
+            directories (list): The output and collection directories.
+            query (str): Terms and filters, see parse_search_query.
+            offset (int): Number of bundles to skip.
+            limit (int, optional): Maximum number of bundles, all if None.
+            sort (str): One of SORT_ORDERS.
+
+        Returns:
+            tuple: (rows, total), rows as returned by list_bundles.
+        """
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort}")
+        for directory in directories:
+            self.sync(directory)
+
+        terms, filters = parse_search_query(query)
+        conditions = [
+            f"directory IN ({', '.join('?' * len(directories))})",
+        ]
+        params = [_normalize(directory) for directory in directories]
+        if terms:
+            conditions.append(
+                "id IN (SELECT rowid FROM bundles_fts WHERE bundles_fts MATCH ?)"
+            )
+            params.append(_fts_query(terms))
+        for key, value in filters.items():
+            if key in ("after", "before"):
+                conditions.append(
+                    "timestamp >= ?" if key == "after" else "timestamp < ?"
+                )
+                params.append(value)
+                continue
+            # numbers match exactly, text matches anywhere, ignoring case
+            matches = "= ?" if _is_number(value) else "LIKE ?"
+            alternatives = []
+            for name in _SEARCH_ALIASES.get(key, [key]):
+                alternatives.append("CAST(json_extract(params, ?) AS TEXT) " + matches)
+                params.append('$."' + name.replace('"', '""') + '"')
+                params.append(value if _is_number(value) else f"%{value}%")
+            conditions.append("(" + " OR ".join(alternatives) + ")")
+        where = " AND ".join(conditions)
+
+        with self._lock:
+            total = self._connection.execute(
+                f"SELECT COUNT(*) FROM bundles WHERE {where}", params
+            ).fetchone()[0]
+            rows = self._connection.execute(
+                "SELECT directory, name, timestamp, pretty_name FROM bundles "
+                f"WHERE {where} ORDER BY {SORT_ORDERS[sort]} LIMIT ? OFFSET ?",
+                [*params, -1 if limit is None else limit, offset],
+            ).fetchall()
+        return [self._to_row(*row) for row in rows], total
+
+    @staticmethod
+    def _to_row(directory, name, timestamp, pretty_name):
+        date = datetime.datetime.fromisoformat(timestamp) if timestamp else None
+        return [
+            date or datetime.datetime(1970, 1, 1),
+            pretty_name,
+            generate_relative_date(date),  # type: ignore
+            os.path.join(directory, name, f"{name}.wav"),
+        ]
+
+
+def _is_number(value: str):
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+_history_index = None
+_history_index_lock = threading.Lock()
+
+
+def get_history_index():
+    global _history_index
+    with _history_index_lock:
+        if _history_index is None:
+            _history_index = HistoryIndex()
+        return _history_index
+
+
+def index_bundle(bundle_path: str):
+    """
+    Add a new bundle, or the sidecar of one, to the history index, without
+    failing the caller.
+    """
+    try:
+        get_history_index().add(bundle_path)
+    except Exception as e:
+        print(f"Failed to update the history index: {e}")
+
+
+def unindex_bundle(bundle_path: str):
+    """Remove a bundle from the history index, without failing the caller."""
+    try:
+        get_history_index().remove(bundle_path)
+    except Exception as e:
+        print(f"Failed to update the history index: {e}")
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+
+from tts_webui.config.config import config
+from tts_webui.config.load_config import default_config
+from tts_webui.history_tab.history_index import get_history_index
+
+HISTORY_ROOTS = ["outputs", "favorites", "collections"]
+
+# events of one write are collected for this long before being applied
+_DEBOUNCE_SECONDS = 0.25
+
+_history_watcher = None
+
+
+def get_history_config():
+    return {**default_config["history"], **config.get("history", {})}
+
+
+def get_history_directories(roots=HISTORY_ROOTS):
+    """The output directories and every collection."""
+    directories = []
+    for root in roots:
+        if root != "collections":
+            directories.append(root)
+        elif os.path.isdir(root):
+            directories.extend(
+                os.path.join(root, name)
+                for name in sorted(os.listdir(root))
+                if os.path.isdir(os.path.join(root, name))
+            )
+    return directories
+
+
+def resolve_history_directory(directory: str, roots=HISTORY_ROOTS):
+    """
+    The history directory that a path from an API request refers to.
+
+    Raises:
+        ValueError: If it is not the outputs, the favorites or a collection.
+    """
+    real_path = os.path.realpath(directory)
+    for history_directory in get_history_directories(roots):
+        if os.path.realpath(history_directory) == real_path:
+            return history_directory
+    raise ValueError(f"Not a history directory: {directory}")
+
+
+def resolve_bundle_path(bundle_path: str, roots=HISTORY_ROOTS):
+    """
+    The path of a bundle from an API request, inside its history directory.
+
+    Raises:
+        ValueError: If it is not a bundle directly inside a history directory.
+    """
+    parent, name = os.path.split(os.path.normpath(bundle_path))
+    # hidden folders are bundles being written and the trash
+    if name in ("", ".", "..") or name.startswith("."):
+        raise ValueError(f"Not a generation: {bundle_path}")
+    try:
+        directory = resolve_history_directory(parent or ".", roots)
+    except ValueError:
+        raise ValueError(f"Not a generation: {bundle_path}") from None
+    path = os.path.join(directory, name)
+    if not os.path.isdir(path):
+        raise ValueError(f"Not a generation: {bundle_path}")
+    return path
+
+
+class HistoryWatcher:
+    """
+    Applies the changes to the history directories to the history index as
+    they happen, so the history tabs never have to list a directory again.
+
+    Uses inotify (or the platform equivalent) through watchdog, and polls the
+    directory mtimes when watchdog is not installed or cannot watch.
+    """
+
+    def __init__(self, index, roots=HISTORY_ROOTS, poll_interval=5):
+        self._index = index
+        self._roots = roots
+        self._poll_interval = poll_interval
+        # ("bundle", directory, name) or ("directory", directory)
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._observer = None
+        # the roots the observer is scheduled on, the others are synced by
+        # their mtime when listed
+        self._observed_roots = []
+
+    def _to_change(self, path):
+        for root in self._roots:
+            relative = os.path.relpath(path, os.path.abspath(root))
+            if relative == os.curdir or relative.startswith(os.pardir):
+                continue
+            parts = relative.split(os.sep)
+            if root == "collections":
+                directory = os.path.join(root, parts[0])
+                parts = parts[1:]
+                if not parts:
+                    return ("directory", directory)
+            else:
+                directory = root
+            if parts[0].startswith("."):
+                # a bundle that is still being written
+                return None
+            return ("bundle", directory, parts[0])
+        return None
+
+    def on_path_changed(self, path):
+        change = self._to_change(path)
+        if change is None:
+            return
+        with self._pending_lock:
+            self._pending.add(change)
+        self._wakeup.set()
+
+    def _apply(self, change):
+        if change[0] == "directory":
+            directory = change[1]
+            if os.path.isdir(directory):
+                self._index.watch(directory)
+            else:
+                self._index.unwatch(directory)
+                self._index.sync(directory)
+            return
+        _, directory, name = change
+        path = os.path.join(directory, name)
+        if os.path.isdir(path):
+            self._index.add(path)
+        else:
+            self._index.remove(path)
+
+    def apply_pending(self):
+        with self._pending_lock:
+            pending, self._pending = self._pending, set()
+        for change in sorted(pending):
+            try:
+                self._apply(change)
+            except Exception as e:
+                print(f"History watcher failed to apply {change}: {e}")
+
+    def _apply_loop(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(_DEBOUNCE_SECONDS)
+            self._wakeup.clear()
+            self.apply_pending()
+
+    def _poll_loop(self):
+        while True:
+            time.sleep(self._poll_interval)
+            for directory in get_history_directories(self._roots):
+                try:
+                    self._index.sync(directory)
+                except Exception as e:
+                    print(f"History watcher failed to sync {directory}: {e}")
+
+    def _start_observer(self):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ("opened", "closed", "closed_no_write"):
+                    return
+                if event.is_directory and event.event_type == "modified":
+                    # the changes inside the directory have their own events
+                    return
+                watcher.on_path_changed(event.src_path)
+                if getattr(event, "dest_path", ""):
+                    watcher.on_path_changed(event.dest_path)
+
+        observer = Observer()
+        observed_roots = []
+        for root in self._roots:
+            if os.path.isdir(root):
+                observer.schedule(Handler(), os.path.abspath(root), recursive=True)
+                observed_roots.append(root)
+        observer.daemon = True
+        try:
+            observer.start()
+        except OSError:
+            observer.stop()
+            raise
+        self._observed_roots = observed_roots
+        return observer
+
+    def start(self):
+        try:
+            self._observer = self._start_observer()
+        except ImportError:
+            print("History watcher: watchdog is not installed, polling instead")
+        except OSError as e:
+            # e.g. out of inotify watches
+            print(f"History watcher: cannot watch the directories ({e}), polling")
+
+        if self._observer is None:
+            if self._poll_interval:
+                threading.Thread(
+                    target=self._poll_loop, name="history-poller", daemon=True
+                ).start()
+            return
+
+        # events of changes made from now on are queued while this runs
+        for directory in get_history_directories(self._observed_roots):
+            self._index.watch(directory)
+        threading.Thread(
+            target=self._apply_loop, name="history-watcher", daemon=True
+        ).start()
+
+
+def start_history_watcher():
+    """
+    Keep the history index up to date in the background.
+
+    Does nothing if the watcher is already running or disabled in the config.
+    """
+    global _history_watcher
+    history_config = get_history_config()
+    if _history_watcher is not None or not history_config["watch_directories"]:
+        return None
+    _history_watcher = HistoryWatcher(
+        get_history_index(), poll_interval=history_config["poll_interval_seconds"]
+    )
+    _history_watcher.start()
+    return _history_watcher
@@ -3,18 +3,36 @@ import gradio as gr
 
 import json
 import shutil
-from tts_webui.history_tab.delete_generation import delete_generation
+import sqlite3
 from tts_webui.history_tab.collections_directories_atom import (
     collections_directories_atom,
     get_collections,
 )
-from tts_webui.history_tab.get_wav_files import get_wav_files
-from tts_webui.history_tab.delete_generation_cb import delete_generation_cb
+from tts_webui.history_tab.get_wav_files import (
+    get_wav_files_page,
+    search_wav_files_page,
+)
+from tts_webui.history_tab.history_index import get_history_index
+from tts_webui.history_tab.history_watcher import (
+    get_history_config,
+    resolve_bundle_path,
+    resolve_history_directory,
+)
+from tts_webui.history_tab.trash import move_to_trash, undo_delete
 from tts_webui.history_tab.save_to_favorites import (
     save_to_collection,
     save_to_favorites,
 )
 from tts_webui.utils.open_folder import open_folder
+from tts_webui.utils.thumbnail_cache import THUMBNAIL_SIZES, get_waveform_thumbnail
+
+
+def _resolve_api_path(resolve, path):
+    """Check a path sent to the API, see resolve_history_directory."""
+    try:
+        return resolve(path)
+    except ValueError as e:
+        raise gr.Error(str(e))
 
 
 def _get_row_index(evt: gr.SelectData):
@@ -99,6 +117,18 @@ def history_content(directory, history_tab, show_collections):
             # headers = ["Date and Time", directory.capitalize(), "When", "Filename"]
             headers = ["Date and Time", "Name", "When", "Filename"]
 
+            with gr.Row():
+                search_query = gr.Textbox(
+                    label="Search",
+                    placeholder="e.g. rain seed:42 type:musicgen after:2024-09-01",
+                    scale=4,
+                )
+                search_all = gr.Checkbox(
+                    label="Search outputs, favorites and collections",
+                    value=False,
+                    scale=1,
+                )
+
             history_list = gr.Dataframe(
                 value=[],
                 elem_classes="file-list",
@@ -110,6 +140,41 @@ def history_content(directory, history_tab, show_collections):
                 max_height=800,
             )
 
+            with gr.Row():
+                previous_page = gr.Button("Previous", size="sm")
+                page_number = gr.Number(
+                    value=1, label="Page", precision=0, minimum=1, min_width=80
+                )
+                next_page = gr.Button("Next", size="sm")
+                page_size = gr.Dropdown(
+                    choices=[25, 50, 100, 250, 500],
+                    value=100,
+                    label="Per page",
+                    min_width=80,
+                )
+                sort_order = gr.Dropdown(
+                    choices=[
+                        ("Newest first", "newest"),
+                        ("Oldest first", "oldest"),
+                        ("Name", "name"),
+                    ],
+                    value="newest",
+                    label="Sort",
+                    min_width=120,
+                )
+            page_info = gr.Markdown()
+
+            with gr.Accordion("Delete several", open=False):
+                bulk_selection = gr.Dropdown(
+                    label="Generations on this page",
+                    choices=[],
+                    multiselect=True,
+                )
+                bulk_delete = gr.Button(value="Delete selected", variant="stop")
+            undo_delete_button = gr.Button(value="Undo delete", visible=False)
+            # the deletion this session can undo
+            last_deleted = gr.State(None)
+
         with gr.Column():
             history_bundle_name = gr.Markdown(visible=True)
             folder_root = gr.Textbox(visible=False)
@@ -159,10 +224,12 @@ def history_content(directory, history_tab, show_collections):
             history_bundle_name: gr.Textbox(value=os.path.dirname(filename)),
             folder_root: os.path.dirname(filename),
             history_audio: gr.Audio(value=filename, label=filename),
-            history_image: (
-                gr.Image(value=filename.replace(".wav", ".png"))
-                if os.path.exists(filename.replace(".wav", ".png"))
-                else gr.Image(value=None)
+            history_image: gr.Image(
+                value=(
+                    filename.replace(".wav", ".png")
+                    if os.path.exists(filename.replace(".wav", ".png"))
+                    else get_waveform_thumbnail(filename, "full")
+                )
             ),
             history_json: gr.JSON(value=json_text),
             history_npz: gr.Textbox(value=filename.replace(".wav", ".npz")),
@@ -200,49 +267,315 @@ def history_content(directory, history_tab, show_collections):
         preprocess=False,
     )
 
-    def update_history_tab(directory: str):
-        return gr.Dataframe(value=get_wav_files(directory))
+    def update_history_tab(
+        directory: str, page=1, size=100, sort="newest", query="", search_all=False
+    ):
+        def get_page(page):
+            if not query:
+                return get_wav_files_page(directory, page, size, sort)
+            directories = get_collections() if search_all else [directory]
+            return search_wav_files_page(directories, query, page, size, sort)
+
+        rows, total = get_page(page)
+        pages = max(1, -(-total // int(size)))
+        requested_page = int(page or 1)
+        page = min(max(1, requested_page), pages)
+        if page != requested_page:
+            rows, total = get_page(page)
+        return {
+            history_list: gr.Dataframe(value=rows),
+            page_number: page,
+            page_info: f"Page {page} of {pages} ({total} generations)",
+        }
+
+    page_inputs = [
+        directory_dropdown,
+        page_number,
+        page_size,
+        sort_order,
+        search_query,
+        search_all,
+    ]
+    page_outputs = [history_list, page_number, page_info]
 
     delete_from_history.click(
         fn=clear_audio,
         outputs=[history_audio, history_image, history_json, delete_from_history],
     )
+
+    def delete_bundles(bundle_paths, *args):
+        token = delete_generations(bundle_paths) if bundle_paths else None
+        return {
+            last_deleted: token,
+            undo_delete_button: gr.Button(
+                value=f"Undo delete ({len(bundle_paths or [])})",
+                visible=token is not None,
+            ),
+            **update_history_tab(*args),
+        }
+
+    def undo_last_delete(token, *args):
+        if not (token and undo_delete(token)):
+            gr.Warning("Nothing to undo, the trash was already emptied.")
+        return {
+            last_deleted: None,
+            undo_delete_button: gr.Button(visible=False),
+            **update_history_tab(*args),
+        }
+
+    delete_outputs = [last_deleted, undo_delete_button, *page_outputs]
     delete_from_history.click(
-        fn=delete_generation_cb(update_history_tab),
-        inputs=[folder_root, directory_dropdown],
+        fn=lambda folder, *args: delete_bundles([folder], *args),
+        inputs=[folder_root, *page_inputs],
         # outputs=[history_list, history_list_as_gallery],
-        outputs=[history_list],
+        outputs=delete_outputs,
+    )
+    bulk_delete.click(
+        fn=delete_bundles,
+        inputs=[bulk_selection, *page_inputs],
+        outputs=delete_outputs,
+    )
+    undo_delete_button.click(
+        fn=undo_last_delete,
+        inputs=[last_deleted, *page_inputs],
+        outputs=delete_outputs,
+    )
+    history_list.change(
+        fn=lambda table: gr.Dropdown(
+            choices=[
+                (f"{name} ({when})", os.path.dirname(filename))
+                for _, name, when, filename in table
+                if filename
+            ],
+            value=[],
+        ),
+        inputs=[history_list],
+        outputs=[bulk_selection],
     )
     # API ONLY
     gr.Button(
         value="Delete (API ONLY)",
         visible=False,
     ).click(
-        fn=delete_generation,
+        fn=lambda folder: delete_generations([folder]),
         inputs=[folder_root],
         api_name=directory == "favorites" and "delete_generation" or None,
     )
     history_tab.select(
         fn=update_history_tab,
-        inputs=[directory_dropdown],
+        inputs=page_inputs,
         # outputs=[history_list, history_list_as_gallery],
-        outputs=[history_list],
+        outputs=page_outputs,
     )
 
+    def update_first_page(directory, _page, *args):
+        return update_history_tab(directory, 1, *args)
+
     directory_dropdown.change(
-        fn=update_history_tab,
-        inputs=[directory_dropdown],
+        fn=update_first_page,
+        inputs=page_inputs,
         # outputs=[history_list, history_list_as_gallery],
-        outputs=[history_list],
+        outputs=page_outputs,
     )
 
+    def refresh_history_tab(directory, *args):
+        # watched directories are not rescanned otherwise
+        try:
+            get_history_index().sync(directory, force=True)
+        except sqlite3.Error as e:
+            print(f"History index unavailable, cannot refresh {directory}: {e}")
+        return update_history_tab(directory, *args)
+
     reload_button.click(
-        fn=lambda x: gr.Dataframe(value=get_wav_files(x)),
-        inputs=[directory_dropdown],
-        outputs=[history_list],
+        fn=refresh_history_tab,
+        inputs=page_inputs,
+        outputs=page_outputs,
         api_name=f"{'collections' if show_collections else directory}_refresh_history",
     )
 
+    page_number.submit(
+        fn=update_history_tab,
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+    previous_page.click(
+        fn=lambda x, page, *args: update_history_tab(x, (page or 1) - 1, *args),
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+    next_page.click(
+        fn=lambda x, page, *args: update_history_tab(x, (page or 1) + 1, *args),
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+    for control in [page_size, sort_order, search_all]:
+        control.change(
+            fn=update_first_page,
+            inputs=page_inputs,
+            outputs=page_outputs,
+        )
+    search_query.submit(
+        fn=update_first_page,
+        inputs=page_inputs,
+        outputs=page_outputs,
+    )
+
+    live_refresh_seconds = get_history_config()["live_refresh_seconds"]
+    if live_refresh_seconds:
+        seen_version = gr.State(None)
+
+        def refresh_if_changed(version, *args):
+            current_version = get_history_index().version
+            if version == current_version:
+                return {}
+            return {seen_version: current_version, **update_history_tab(*args)}
+
+        gr.Timer(live_refresh_seconds).tick(
+            fn=refresh_if_changed,
+            inputs=[seen_version, *page_inputs],
+            outputs=[seen_version, *page_outputs],
+            show_progress="hidden",
+        )
+
+    # API ONLY
+    gr.Button(
+        value="Get history page (API ONLY)",
+        visible=False,
+    ).click(
+        fn=get_history_page,
+        inputs=[
+            gr.Textbox(visible=False),
+            gr.Number(1, precision=0, visible=False),
+            gr.Number(100, precision=0, visible=False),
+            gr.Textbox("newest", visible=False),
+        ],
+        outputs=[gr.JSON(visible=False)],
+        api_name=f"{'collections' if show_collections else directory}_history_page",
+    )
+
+    if directory == "outputs" and not show_collections:
+        # API ONLY
+        gr.Button(
+            value="Delete generations (API ONLY)",
+            visible=False,
+        ).click(
+            fn=delete_generations,
+            inputs=[gr.JSON(None, visible=False)],
+            outputs=[gr.Textbox(visible=False)],
+            api_name="delete_generations",
+        )
+        # API ONLY
+        gr.Button(
+            value="Undo delete (API ONLY)",
+            visible=False,
+        ).click(
+            fn=undo_delete,
+            inputs=[gr.Textbox(visible=False)],
+            outputs=[gr.JSON(visible=False)],
+            api_name="undo_delete",
+        )
+        # API ONLY
+        gr.Button(
+            value="Get waveform thumbnail (API ONLY)",
+            visible=False,
+        ).click(
+            fn=get_bundle_thumbnail,
+            inputs=[
+                gr.Textbox(visible=False),
+                gr.Dropdown(choices=list(THUMBNAIL_SIZES), value="list", visible=False),
+            ],
+            outputs=[gr.Image(type="filepath", visible=False)],
+            api_name="get_waveform_thumbnail",
+        )
+        # API ONLY
+        gr.Button(
+            value="Search history (API ONLY)",
+            visible=False,
+        ).click(
+            fn=search_history,
+            inputs=[
+                gr.Textbox(visible=False),
+                gr.JSON(None, visible=False),
+                gr.Number(1, precision=0, visible=False),
+                gr.Number(100, precision=0, visible=False),
+                gr.Textbox("newest", visible=False),
+            ],
+            outputs=[gr.JSON(visible=False)],
+            api_name="search_history",
+        )
+
+
+def get_history_page(directory: str, page=1, page_size=100, sort="newest"):
+    """
+    Get one page of the generations in a directory, for the API.
+
+    Returns:
+        dict: rows of {date, name, when, filename}, the page and the totals.
+    """
+    directory = _resolve_api_path(resolve_history_directory, directory)
+    rows, total = get_wav_files_page(directory, page, page_size, sort)
+    return _to_history_page(rows, total, page, page_size)
+
+
+def delete_generations(bundle_paths):
+    """
+    Move generations to the trash, for the API.
+
+    Returns:
+        str: The token to undo the deletion with.
+    """
+    if isinstance(bundle_paths, str):
+        bundle_paths = [bundle_paths]
+    return move_to_trash(
+        [
+            _resolve_api_path(resolve_bundle_path, bundle_path)
+            for bundle_path in bundle_paths or []
+        ]
+    )
+
+
+def get_bundle_thumbnail(filename: str, size="list"):
+    """The waveform image of the audio of a generation, for the API."""
+    bundle_path = _resolve_api_path(resolve_bundle_path, os.path.dirname(filename))
+    return get_waveform_thumbnail(
+        os.path.join(bundle_path, os.path.basename(filename)), size
+    )
+
+
+def _to_history_page(rows, total, page, page_size):
+    return {
+        "rows": [
+            {"date": date.isoformat(), "name": name, "when": when, "filename": path}
+            for date, name, when, path in rows
+        ],
+        "page": int(page),
+        "page_size": int(page_size),
+        "total": total,
+        "pages": max(1, -(-total // int(page_size))),
+    }
+
+
+def search_history(query: str, directories=None, page=1, page_size=100, sort="newest"):
+    """
+    Search the metadata of the generations, for the API.
+
+    Args:
+        query (str): Terms and parameter filters, e.g. "rain seed:42".
+        directories (list, optional): Directories to search, by default the
+            outputs, favorites and collections.
+
+    Returns:
+        dict: as returned by get_history_page.
+    """
+    if isinstance(directories, str):
+        directories = [directories]
+    directories = [
+        _resolve_api_path(resolve_history_directory, directory)
+        for directory in directories or get_collections()
+    ]
+    rows, total = search_wav_files_page(directories, query, page, page_size, sort)
+    return _to_history_page(rows, total, page, page_size)
+
 
 def save_to_collection_ui(
     directory: str,
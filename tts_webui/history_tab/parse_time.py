@@ -1,6 +1,12 @@
 import datetime
+import functools
 import re
 
+# 2023-05-16_11-45-00
+TIME_REGEX = re.compile(
+    r"([0-9]{4})-([0-9]{2})-([0-9]{2})_([0-9]{2})-([0-9]{2})-([0-9]{2})"
+)
+
 
 # 2023-05-16_11-45-00
 def parse_time(text: str):
@@ -25,12 +31,21 @@ def parse_time(text: str):
 # audio__tortoise__random__2023-05-31_14-19-13__n0.wav
 # Matches the time string in the filename and returns it
 def extract_time(filename: str):
-    # only match the time string
-    regex = r"([0-9]{4}-[0-9]{2}-[0-9]{2}_[0-9]{2}-[0-9]{2}-[0-9]{2})"
-    matches = re.finditer(regex, filename, re.MULTILINE)
-    for matchNum, match in enumerate(matches, start=1):
-        return match.group(1)
+    match = TIME_REGEX.search(filename)
+    return match and match.group(0)
 
 
+# one entry per bundle of a large history
+@functools.lru_cache(maxsize=2**17)
 def extract_and_parse_time(filename: str):
-    return parse_time(extract_time(filename))
+    """
+    The time in the filename, or None without logging, as listings contain
+    many names without one.
+    """
+    match = TIME_REGEX.search(filename)
+    if match is None:
+        return None
+    try:
+        return datetime.datetime(*map(int, match.groups()))
+    except ValueError:
+        return None
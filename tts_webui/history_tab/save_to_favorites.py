@@ -1,14 +1,25 @@
 import gradio as gr
 
 import os
-import shutil
+
+from tts_webui.history_tab.history_index import index_bundle
+from tts_webui.history_tab.history_watcher import get_history_config
+from tts_webui.utils.link_tree import link_tree
+
+
+def _save_bundle(directory: str, destination: str):
+    methods = link_tree(directory, destination, get_history_config()["save_mode"])
+    print(f"Saved {directory} to {destination} ({methods})")
+    index_bundle(destination)
 
 
 def save_to_favorites(directory: str):
-    shutil.copytree(directory, os.path.join("favorites", os.path.basename(directory)))
+    destination = os.path.join("favorites", os.path.basename(directory))
+    _save_bundle(directory, destination)
     return gr.Button(value="Saved")
 
 
 def save_to_collection(directory: str, collection: str):
-    shutil.copytree(directory, os.path.join(collection, os.path.basename(directory)))
+    destination = os.path.join(collection, os.path.basename(directory))
+    _save_bundle(directory, destination)
     return gr.Dropdown(value="Saved")
@@ -0,0 +1,155 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+
+from tts_webui.history_tab.history_index import index_bundle, unindex_bundle
+from tts_webui.history_tab.history_watcher import (
+    get_history_config,
+    get_history_directories,
+)
+
+# hidden from the history like the bundles that are still being written
+TRASH_DIRNAME = ".trash"
+
+# how often the trash is emptied of deletions that can no longer be undone
+_PURGE_INTERVAL_SECONDS = 5
+
+# token -> (time of deletion, [(original path, path in the trash)])
+_deleted = {}
+_deleted_lock = threading.Lock()
+_purger_thread = None
+_purger_lock = threading.Lock()
+
+
+def _get_trash_dir(directory: str, token: str):
+    return os.path.join(directory, TRASH_DIRNAME, token)
+
+
+def move_to_trash(bundle_paths):
+    """
+    Delete generations by moving them into the .trash of their directory,
+    from where they are removed in the background once the undo time is over.
+
+    If a bundle cannot be moved, the ones moved before it are restored and
+    the error is raised, so nothing is deleted without a token to undo it.
+
+    Returns:
+        str: The token to undo the deletion with.
+    """
+    token = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    moved = []
+    # not purged until the moves are done
+    with _deleted_lock:
+        _deleted[token] = (float("inf"), moved)
+    start_trash_purger()
+    try:
+        for bundle_path in bundle_paths:
+            directory, name = os.path.split(os.path.normpath(bundle_path))
+            trash_dir = _get_trash_dir(directory, token)
+            os.makedirs(trash_dir, exist_ok=True)
+            trash_path = os.path.join(trash_dir, name)
+            os.replace(bundle_path, trash_path)
+            moved.append((bundle_path, trash_path))
+            unindex_bundle(bundle_path)
+    except Exception:
+        undo_delete(token)
+        raise
+    with _deleted_lock:
+        _deleted[token] = (time.time(), moved)
+    return token
+
+
+def undo_delete(token: str):
+    """
+    Restore the generations of a deletion, unless the trash was emptied.
+
+    Returns:
+        list: The restored bundle paths.
+    """
+    with _deleted_lock:
+        _, moved = _deleted.pop(token, (None, []))
+    restored = []
+    for bundle_path, trash_path in moved:
+        if not os.path.exists(trash_path) or os.path.exists(bundle_path):
+            continue
+        os.replace(trash_path, bundle_path)
+        index_bundle(bundle_path)
+        restored.append(bundle_path)
+        _remove_empty_trash_dir(os.path.dirname(trash_path))
+    return restored
+
+
+def _remove_empty_trash_dir(path: str):
+    """Remove the directory of a deletion, and the .trash if it was the last."""
+    try:
+        os.rmdir(path)
+        os.rmdir(os.path.dirname(path))
+    except OSError:
+        pass
+
+
+def empty_trash(max_age_seconds=None):
+    """
+    Remove the deletions older than max_age_seconds, all of them if None.
+
+    Returns:
+        int: The number of bundles removed.
+    """
+    now = time.time()
+    with _deleted_lock:
+        expired = [
+            token
+            for token, (deleted_at, _) in _deleted.items()
+            if max_age_seconds is None or now - deleted_at >= max_age_seconds
+        ]
+        batches = [_deleted.pop(token)[1] for token in expired]
+
+    removed = 0
+    for moved in batches:
+        for _, trash_path in moved:
+            shutil.rmtree(trash_path, ignore_errors=True)
+            removed += 1
+            _remove_empty_trash_dir(os.path.dirname(trash_path))
+    return removed
+
+
+def _empty_stale_trash():
+    """Remove what is left in the trash by a previous run, it cannot be undone."""
+    for directory in get_history_directories():
+        trash = os.path.join(directory, TRASH_DIRNAME)
+        if not os.path.isdir(trash):
+            continue
+        for token in os.listdir(trash):
+            with _deleted_lock:
+                if token in _deleted:
+                    continue
+            trash_dir = os.path.join(trash, token)
+            shutil.rmtree(trash_dir, ignore_errors=True)
+            _remove_empty_trash_dir(trash_dir)
+
+
+def _purge():
+    try:
+        _empty_stale_trash()
+    except Exception as e:
+        print(f"Failed to empty the trash: {e}")
+    while True:
+        try:
+            empty_trash(get_history_config()["undo_delete_seconds"])
+        except Exception as e:
+            print(f"Failed to empty the trash: {e}")
+        time.sleep(_PURGE_INTERVAL_SECONDS)
+
+
+def start_trash_purger():
+    """Empty the trash in the background, does nothing if already running."""
+    global _purger_thread
+    with _purger_lock:
+        if _purger_thread is None:
+            _purger_thread = threading.Thread(
+                target=_purge, name="trash-purger", daemon=True
+            )
+            _purger_thread.start()
+        return _purger_thread
@@ -0,0 +1,104 @@
+import os
+
+import torch
+
+COMPILE_CACHE_DIR = os.path.join("data", "cache", "torch_compile")
+
+# hot-loading compiled artifacts needs a newer torch than some installs have
+_has_cache_artifacts = hasattr(torch, "compiler") and all(
+    hasattr(torch.compiler, name)
+    for name in ("save_cache_artifacts", "load_cache_artifacts")
+)
+
+
+def _get_torch_version_dir():
+    return os.path.join(COMPILE_CACHE_DIR, f"torch-{torch.__version__}")
+
+
+def enable_compile_cache():
+    """
+    Point Inductor's on-disk caches (FX graphs, AOTAutograd, autotuning) at
+    data/ instead of the temp directory, so they survive reboots.
+
+    Compilation is lazy, so this only has to run before the first call of a
+    compiled model, not before torch.compile.
+    """
+    cache_dir = os.path.abspath(_get_torch_version_dir())
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", cache_dir)
+    os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+    os.environ.setdefault("TORCHINDUCTOR_AUTOGRAD_CACHE", "1")
+    try:
+        import torch._inductor.config as inductor_config
+
+        inductor_config.fx_graph_cache = True
+    except Exception:
+        pass
+
+
+def get_compile_cache_key(model_name, dtype, device):
+    """
+    Key of the compiled artifacts of a model.
+
+    The torch version is part of the cache directory, since artifacts of
+    another version cannot be loaded.
+    """
+    dtype = str(dtype).replace("torch.", "")
+    key = f"{model_name}__{dtype}__{device}"
+    for char in ("/", "\\", ":"):
+        key = key.replace(char, "_")
+    return key
+
+
+def _get_artifacts_path(key):
+    return os.path.join(_get_torch_version_dir(), f"{key}.bin")
+
+
+def load_compile_cache(key):
+    """
+    Hot-load the compiled artifacts saved for the key, if there are any.
+
+    Returns:
+        bool: True if artifacts were loaded.
+    """
+    enable_compile_cache()
+    if not _has_cache_artifacts:
+        return False
+    path = _get_artifacts_path(key)
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path, "rb") as f:
+            torch.compiler.load_cache_artifacts(f.read())
+        print(f"Loaded compiled artifacts for {key}")
+        return True
+    except Exception as e:
+        print(f"Failed to load compiled artifacts for {key}: {e}")
+        return False
+
+
+def save_compile_cache(key):
+    """
+    Save the artifacts compiled so far in this process for the key.
+
+    Returns:
+        bool or None: True if the artifacts were saved, False if saving
+            failed or is not supported by this torch, None if nothing has
+            been compiled yet.
+    """
+    if not _has_cache_artifacts:
+        return False
+    try:
+        artifacts = torch.compiler.save_cache_artifacts()
+        if artifacts is None:
+            return None
+        path = _get_artifacts_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # written next to the final path so a restart never reads a partial file
+        with open(path + ".tmp", "wb") as f:
+            f.write(artifacts[0])
+        os.replace(path + ".tmp", path)
+        return True
+    except Exception as e:
+        print(f"Failed to save compiled artifacts for {key}: {e}")
+        return False
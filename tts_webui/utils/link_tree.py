@@ -0,0 +1,83 @@
+import os
+import shutil
+import sys
+
+# ioctl of Linux file systems that share extents between files, e.g. btrfs, xfs
+_FICLONE = 0x40049409
+
+# files that are edited in place, which a hardlink would share
+_COPIED_EXTENSIONS = {".json"}
+
+
+def _reflink(src: str, dst: str):
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(src, "rb") as source, open(dst, "wb") as destination:
+            try:
+                fcntl.ioctl(destination.fileno(), _FICLONE, source.fileno())
+            except OSError:
+                destination.close()
+                os.remove(dst)
+                raise
+    elif sys.platform == "darwin":
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            raise OSError(ctypes.get_errno(), "clonefile failed", src)
+    else:
+        raise OSError("reflinks are not supported on this platform")
+    shutil.copystat(src, dst)
+
+
+def link_or_copy(src: str, dst: str):
+    """
+    Make dst a reflink of src, or else a hardlink, or else a copy.
+
+    A reflink shares the data until either file changes, a hardlink is the
+    same file, so files that are edited in place are always copied.
+
+    Returns:
+        str: "reflink", "hardlink" or "copy".
+    """
+    if os.path.splitext(src)[1] not in _COPIED_EXTENSIONS:
+        try:
+            _reflink(src, dst)
+            return "reflink"
+        except OSError:
+            pass
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def link_tree(src: str, dst: str, mode="link"):
+    """
+    Copy a directory, sharing the data of the files where possible.
+
+    Args:
+        src (str): The directory to copy.
+        dst (str): The new directory, which must not exist.
+        mode (str): "link" to try reflinks and hardlinks first, "copy" to copy.
+
+    Returns:
+        dict: The number of files per method.
+    """
+    methods = {}
+
+    def copy_function(src, dst):
+        if mode == "link":
+            method = link_or_copy(src, dst)
+        else:
+            method = "copy"
+            shutil.copy2(src, dst)
+        methods[method] = methods.get(method, 0) + 1
+        return dst
+
+    shutil.copytree(src, dst, copy_function=copy_function)
+    return methods
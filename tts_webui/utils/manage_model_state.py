@@ -1,4 +1,43 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import gradio as gr
+from tts_webui.config.config import config
+from tts_webui.config.load_config import default_config
+from tts_webui.utils.compile_cache import load_compile_cache, save_compile_cache
+from tts_webui.utils.model_memory import (
+    format_bytes,
+    get_cpu_memory_total,
+    get_gpu_memory_allocated,
+    get_gpu_memory_cached,
+    get_gpu_memory_free,
+    get_gpu_memory_total,
+    get_model_memory,
+    get_model_module_ids,
+    get_process_rss,
+)
+from tts_webui.utils.model_offload import (
+    can_offload,
+    get_model_device,
+    move_model,
+    new_snapshot_path,
+    offload_to_cpu,
+    offload_to_disk,
+    remove_snapshot,
+    restore_from_disk,
+)
+from tts_webui.utils.model_telemetry import (
+    ModelStats,
+    get_model_stats,
+    record_eviction,
+    record_hit,
+    record_load,
+    record_miss,
+    record_restore,
+    render_prometheus,
+)
 from tts_webui.utils.torch_clear_memory import torch_clear_memory
 
 
@@ -7,69 +46,718 @@ def show(message):
     gr.Info(message)
 
 
+class ModelEntry:
+    def __init__(self, namespace, model_name, model, memory):
+        self.namespace = namespace
+        self.model_name = model_name
+        self.model = model
+        # {"gpu": bytes, "cpu": bytes}
+        self.memory = memory
+        self.last_used = time.time()
+        # the device the loader put the model on, where it is promoted back to
+        self.device = get_model_device(model)
+        # "gpu", "cpu" or "disk"
+        self.tier = self.home_tier()
+        # models that share modules are offloaded to one snapshot, written
+        # from snapshot_models and restored into them
+        self.snapshot_path = None
+        self.snapshot_models = None
+        # to find the entries that share modules, e.g. a pipeline and its model
+        self.module_ids = get_model_module_ids(model)
+        # generations currently using the model, see hold_models
+        self.refcount = 0
+        self.unload_requested = False
+        # set while make_room moves the model to a lower tier
+        self.demoting = False
+        # set for loaders with a compile cache until the compiled artifacts
+        # have been saved, see manage_model_state
+        self.compile_cache_key = None
+
+    def touch(self):
+        self.last_used = time.time()
+
+    def home_tier(self):
+        return "cpu" if self.device == "cpu" else "gpu"
+
+    def is_resident(self):
+        return self.tier == self.home_tier()
+
+    def discard(self):
+        _set_snapshot(self, None)
+        self.model = None
+
+
 class ModelState:
-    def __init__(self):
-        self._model = None
-        self._model_name = None
+    """The models loaded in a namespace, least recently used first."""
 
-    def set_model(self, model, model_name):
-        self._model = model
-        self._model_name = model_name
+    def __init__(self, namespace=None):
+        self.namespace = namespace
+        self._entries: "OrderedDict[str, ModelEntry]" = OrderedDict()
 
-    def get_model(self):
-        return self._model
+    def set_model(self, model, model_name, memory=None):
+        """
+        Add a model to the namespace.
+
+        set_model(None, model_name) removes that model and
+        set_model(None, None) removes every model in the namespace.
+        """
+        if model is None:
+            if model_name is None:
+                removed = list(self._entries.values())
+                self._entries.clear()
+            else:
+                removed = [self._entries.pop(model_name, None)]
+            for entry in filter(None, removed):
+                entry.discard()
+            return None
+
+        entry = ModelEntry(
+            self.namespace, model_name, model, memory or get_model_memory(model)
+        )
+        self._entries[model_name] = entry
+        self._entries.move_to_end(model_name)
+        return entry
+
+    def use(self, model_name):
+        entry = self._entries[model_name]
+        entry.touch()
+        self._entries.move_to_end(model_name)
+        return entry
+
+    def get_entry(self, model_name):
+        return self._entries.get(model_name)
+
+    def get_entries(self):
+        return list(self._entries.values())
+
+    def get_model(self, model_name=None):
+        entry = self._entries.get(model_name) if model_name else self._latest()
+        return entry.model if entry else None
 
     def is_model_loaded(self, model_name):
-        return self._model is not None and self._model_name == model_name
+        return model_name in self._entries
 
     def get_model_name(self):
-        return self._model_name
+        entry = self._latest()
+        return entry.model_name if entry else None
+
+    def get_model_names(self):
+        return list(self._entries.keys())
+
+    def _latest(self):
+        return next(reversed(self._entries.values()), None)
 
 
 model_states = {}
 
+# guards model_states and the tier and refcount of every entry
+_cache_lock = threading.RLock()
+# notified when a demotion finishes, for callers waiting to use the model
+_demotion_done = threading.Condition(_cache_lock)
+# held while a namespace loads or restores a model, so that concurrent callers
+# wait for the load in progress instead of loading the model a second time
+_namespace_locks = {}
+# held by make_room, which copies models without holding _cache_lock
+_make_room_lock = threading.Lock()
+_local = threading.local()
 
-def manage_model_state(model_namespace):
-    """Decorator to manage the model state."""
 
-    def decorator(func):
-        def wrapper(model_name, *args, **kwargs):
-            global model_states
-            if model_namespace not in model_states:
-                model_states[model_namespace] = ModelState()
+def _get_model_state(model_namespace):
+    with _cache_lock:
+        if model_namespace not in model_states:
+            model_states[model_namespace] = ModelState(model_namespace)
+        return model_states[model_namespace]
 
-            model_state = model_states[model_namespace]
 
-            if not model_state.is_model_loaded(model_name):
-                show(
-                    f"Model '{model_name}' in namespace '{model_namespace}' is not loaded or is different. Loading model..."
-                )
-                unload_model(model_namespace)
-                model = func(model_name, *args, **kwargs)
-                model_state.set_model(model, model_name)
-            else:
-                show(
-                    f"Using cached model '{model_name}' in namespace '{model_namespace}'."
+def _get_namespace_lock(model_namespace):
+    with _cache_lock:
+        return _namespace_locks.setdefault(model_namespace, threading.Lock())
+
+
+def _get_hold_stack():
+    if not hasattr(_local, "holds"):
+        _local.holds = []
+    return _local.holds
+
+
+class ModelHold:
+    """References to the models used by one generation."""
+
+    def __init__(self):
+        self.entries = []
+
+    @contextmanager
+    def active(self):
+        """Hold every model returned by a managed loader on this thread."""
+        stack = _get_hold_stack()
+        stack.append(self)
+        try:
+            yield self
+        finally:
+            stack.pop()
+
+    def release(self):
+        entries, self.entries = self.entries, []
+        for entry in entries:
+            _release(entry)
+            # the generation has compiled the model by now
+            _save_compile_cache(entry)
+
+
+@contextmanager
+def hold_models():
+    """
+    Keep the models returned by manage_model_state loaders inside this block
+    from being offloaded or unloaded until the block exits.
+
+    For example:
+    with hold_models():
+        model = get_model("openai/whisper-large-v3")
+        model.generate(...)
+    """
+    hold = ModelHold()
+    try:
+        with hold.active():
+            yield hold
+    finally:
+        hold.release()
+
+
+def _release(entry):
+    with _cache_lock:
+        entry.refcount -= 1
+        if entry.refcount > 0 or not entry.unload_requested:
+            return
+        _remove_entry(entry)
+    torch_clear_memory()
+    show(
+        f"Model '{entry.model_name}' in namespace '{entry.namespace}' has been unloaded."
+    )
+
+
+def _save_compile_cache(entry):
+    key = entry.compile_cache_key
+    # tried again only if the model has not been compiled yet
+    if key is not None and save_compile_cache(key) is not None:
+        entry.compile_cache_key = None
+
+
+def get_model_cache_config():
+    return {**default_config["model_cache"], **config.get("model_cache", {})}
+
+
+def get_memory_budget(kind):
+    """
+    Get the memory budget of the model cache.
+
+    Args:
+        kind (str): "gpu" or "cpu".
+
+    Returns:
+        int | None: The budget in bytes, or None if unlimited.
+    """
+    budget_mb = get_model_cache_config()[f"{kind}_memory_budget_mb"]
+    if budget_mb is not None:
+        return int(budget_mb * 1024**2)
+    if kind == "gpu":
+        total = get_gpu_memory_total()
+        return int(total * 0.8) if total else None
+    total = get_cpu_memory_total()
+    return int(total * 0.5) if total else None
+
+
+def _all_entries():
+    return [entry for state in model_states.values() for entry in state.get_entries()]
+
+
+def _get_groups(entries):
+    """
+    Group the entries whose models share modules, e.g. a pipeline and the
+    model it wraps, which are counted once and demoted and promoted together.
+    """
+    groups = []
+    for entry in entries:
+        shared = [
+            group
+            for group in groups
+            if any(not entry.module_ids.isdisjoint(x.module_ids) for x in group)
+        ]
+        groups = [group for group in groups if all(group is not x for x in shared)]
+        groups.append([entry, *(x for group in shared for x in group)])
+    return groups
+
+
+def _get_group(entry):
+    for group in _get_groups(_all_entries()):
+        if entry in group:
+            return group
+    return [entry]
+
+
+def _get_group_memory(group):
+    if len(group) == 1:
+        return group[0].memory
+    measured = get_model_memory(*[entry.model for entry in group])
+    # the memory of an entry can include allocations that are not tensors
+    return {
+        kind: max(measured[kind], *(entry.memory[kind] for entry in group))
+        for kind in measured
+    }
+
+
+def get_memory_used(kind):
+    return sum(_get_group_memory(group)[kind] for group in _get_groups(_all_entries()))
+
+
+def _demote(group, kind):
+    """
+    Free the memory of the given kind of a group of entries, see _get_groups,
+    by moving their models one tier down (GPU -> pinned CPU -> disk snapshot),
+    or unload them if offloading is disabled or not possible for the models.
+
+    Returns:
+        str: Where the models went.
+    """
+    cache_config = get_model_cache_config()
+    models = [entry.model for entry in group]
+    try:
+        if all(can_offload(model) for model in models):
+            if kind == "gpu" and cache_config["offload_to_cpu"]:
+                for entry in group:
+                    offload_to_cpu(entry.model)
+                    entry.tier = "cpu"
+                    entry.memory = get_model_memory(entry.model)
+                return "offloaded to CPU"
+            if kind == "cpu" and cache_config["offload_to_disk"]:
+                snapshot_path = new_snapshot_path(
+                    group[0].namespace, group[0].model_name
                 )
+                offload_to_disk(models, snapshot_path)
+                for entry in group:
+                    # a model restored to the CPU is still mapped from its old snapshot
+                    _set_snapshot(entry, snapshot_path, models)
+                    entry.tier = "disk"
+                    entry.memory = get_model_memory(entry.model)
+                return "offloaded to disk"
+    except Exception as e:
+        names = ", ".join(f"'{entry.model_name}'" for entry in group)
+        print(f"Failed to offload model {names}: {e}")
 
-            return model_state.get_model()
+    with _cache_lock:
+        for entry in group:
+            _remove_entry(entry)
+    return "unloaded"
 
-        return wrapper
 
-    return decorator
+def _set_snapshot(entry, snapshot_path, models=None):
+    """Replace the snapshot of an entry, removing the old one once unused."""
+    with _cache_lock:
+        old_snapshot_path = entry.snapshot_path
+        entry.snapshot_path = snapshot_path
+        entry.snapshot_models = models
+        in_use = old_snapshot_path in [x.snapshot_path for x in _all_entries()]
+    if old_snapshot_path != snapshot_path and not in_use:
+        remove_snapshot(old_snapshot_path)
+
+
+def _remove_entry(entry):
+    model_state = model_states[entry.namespace]
+    if model_state.get_entry(entry.model_name) is entry:
+        model_state.set_model(None, entry.model_name)
+
+
+def _finish_demotion(entry):
+    with _cache_lock:
+        entry.demoting = False
+        if entry.unload_requested and entry.refcount == 0:
+            _remove_entry(entry)
+        _demotion_done.notify_all()
+
+
+def _promote(group):
+    """
+    Bring the offloaded models of a group of entries, see _get_groups, back
+    to the device they were loaded on.
+    """
+    restored = set()
+    for entry in group:
+        if entry.tier == "disk":
+            if entry.snapshot_path not in restored:
+                restore_from_disk(entry.snapshot_models, entry.snapshot_path)
+                restored.add(entry.snapshot_path)
+            entry.snapshot_models = None
+            entry.tier = "cpu"
+    for entry in group:
+        if entry.tier == "cpu" and entry.home_tier() == "gpu":
+            move_model(entry.model, entry.device)
+            entry.tier = "gpu"
+        if entry.tier == "gpu":
+            _set_snapshot(entry, None)
+        entry.memory = get_model_memory(entry.model)
+
+
+def _get_headroom(kind):
+    """
+    Memory left before the device itself runs short: free VRAM, including
+    the VRAM cached by PyTorch, above min_free_vram_mb, or the process RSS
+    below max_rss_mb.
 
+    Returns:
+        int | None: Bytes, or None if there is no limit to watch.
+    """
+    cache_config = get_model_cache_config()
+    if kind == "gpu":
+        free = get_gpu_memory_free()
+        if free is None:
+            return None
+        # the cache of a finished generation is not pressure, loads reuse it
+        free += get_gpu_memory_cached()
+        return free - int(cache_config["min_free_vram_mb"] * 1024**2)
+    max_rss_mb = cache_config["max_rss_mb"]
+    rss = get_process_rss()
+    if max_rss_mb is None or rss is None:
+        return None
+    return int(max_rss_mb * 1024**2) - rss
 
-def unload_model(model_namespace):
+
+def _get_room(kind):
+    """Bytes of the given kind that can still be loaded, or None if unlimited."""
+    room = []
+    budget = get_memory_budget(kind)
+    if budget is not None:
+        room.append(budget - get_memory_used(kind))
+    headroom = _get_headroom(kind)
+    if headroom is not None:
+        room.append(headroom)
+    return min(room) if room else None
+
+
+def make_room(memory=None, reason="to stay within the memory budget"):
+    """
+    Demote least recently used models until every budget is respected and
+    the device has room for `memory` more bytes.
+
+    Models over the GPU budget go to CPU memory first, which may push models
+    over the CPU budget to disk. Models in use, and the models that share
+    modules with them, are never demoted.
+
+    The victims are picked under _cache_lock, but moved and written to disk
+    after releasing it, so that other models can be used in the meantime.
+    Callers of a model being demoted wait for the demotion to finish.
+
+    Args:
+        memory (dict, optional): {"gpu": bytes, "cpu": bytes} about to be loaded.
+        reason (str): Shown to the user for every demoted model.
+    """
+    memory = memory or {"gpu": 0, "cpu": 0}
+    evicted = []
+    with _make_room_lock:
+        for kind in ("gpu", "cpu"):
+            while True:
+                with _cache_lock:
+                    room = _get_room(kind)
+                    if room is None or room >= memory[kind]:
+                        break
+                    candidates = [
+                        group
+                        for group in _get_groups(_all_entries())
+                        if all(entry.refcount == 0 for entry in group)
+                        and _get_group_memory(group)[kind] > 0
+                    ]
+                    if not candidates:
+                        break
+                    group = min(
+                        candidates, key=lambda x: max(entry.last_used for entry in x)
+                    )
+                    for entry in group:
+                        entry.demoting = True
+                try:
+                    destination = _demote(group, kind)
+                finally:
+                    for entry in group:
+                        _finish_demotion(entry)
+                for entry in group:
+                    evicted.append((entry, destination))
+                    record_eviction(
+                        entry.namespace,
+                        entry.model_name,
+                        "unloaded" if destination == "unloaded" else entry.tier,
+                    )
+                # the driver only reports freed VRAM once the allocator releases it
+                torch_clear_memory()
+
+    for entry, destination in evicted:
+        show(
+            f"Model '{entry.model_name}' in namespace '{entry.namespace}' was {destination} {reason}."
+        )
+    return evicted
+
+
+def unload_idle_models(idle_seconds):
+    """Unload the models that have not been used for idle_seconds."""
+    cutoff = time.time() - idle_seconds
+    with _cache_lock:
+        idle = [
+            entry
+            for entry in _all_entries()
+            if entry.refcount == 0 and not entry.demoting and entry.last_used < cutoff
+        ]
+        for entry in idle:
+            model_states[entry.namespace].set_model(None, entry.model_name)
+            record_eviction(entry.namespace, entry.model_name, "idle")
+
+    if idle:
+        torch_clear_memory()
+    for entry in idle:
+        show(
+            f"Model '{entry.model_name}' in namespace '{entry.namespace}' was unloaded after being idle for {idle_seconds / 60:.0f} minutes."
+        )
+    return idle
+
+
+# (namespace, model_name) -> memory measured when the model was last loaded,
+# so that room can be made before loading it again
+_known_memory = {}
+
+
+def _get_out_of_memory_kind(error):
+    """Return "gpu" or "cpu" if the error is a failed allocation, otherwise None."""
+    import torch
+
+    message = str(error)
     if (
-        model_namespace in model_states
-        and model_states[model_namespace].get_model() is not None
+        isinstance(error, torch.cuda.OutOfMemoryError)
+        or "CUDA out of memory" in message
+    ):
+        return "gpu"
+    if isinstance(error, MemoryError) or any(
+        text in message for text in ["can't allocate memory", "not enough memory"]
     ):
-        model_states[model_namespace].set_model(None, None)
-        # del model_states[model_namespace]
+        return "cpu"
+    return None
+
+
+def _call_loader(model_state, func, model_name, *args, **kwargs):
+    start_time = time.time()
+    try:
+        model = func(model_name, *args, **kwargs)
+    except Exception:
+        record_load(model_state.namespace, model_name, 0, failed=True)
+        raise
+    record_load(model_state.namespace, model_name, time.time() - start_time)
+    return model
+
+
+def _load_model(model_state, func, model_name, *args, **kwargs):
+    get_compile_cache_key = _compile_cache_keys.get(model_state.namespace)
+    compile_cache_key = (
+        get_compile_cache_key(model_name, *args, **kwargs)
+        if get_compile_cache_key
+        else None
+    )
+    if compile_cache_key is not None:
+        load_compile_cache(compile_cache_key)
+    known_memory = _known_memory.get((model_state.namespace, model_name))
+    make_room(known_memory, reason=f"to make room for '{model_name}'")
+    allocated_before = get_gpu_memory_allocated()
+    out_of_memory = None
+    try:
+        model = _call_loader(model_state, func, model_name, *args, **kwargs)
+    except Exception as e:
+        out_of_memory = _get_out_of_memory_kind(e)
+        if out_of_memory is None:
+            raise
+    if out_of_memory is not None:
+        # the size of a model is unknown until it is loaded once, so every
+        # model that is not in use makes room before the one retry
+        show(
+            f"Not enough {out_of_memory.upper()} memory to load '{model_name}', making room and retrying..."
+        )
         torch_clear_memory()
-        show(f"Model in namespace '{model_namespace}' has been unloaded.")
-    else:
+        make_room(
+            {"gpu": 0, "cpu": 0, out_of_memory: float("inf")},
+            reason=f"to make room for '{model_name}'",
+        )
+        allocated_before = get_gpu_memory_allocated()
+        model = _call_loader(model_state, func, model_name, *args, **kwargs)
+    memory = get_model_memory(model)
+    # catches allocations that are not parameters or buffers, e.g. static caches
+    memory["gpu"] = max(memory["gpu"], get_gpu_memory_allocated() - allocated_before)
+    _known_memory[(model_state.namespace, model_name)] = dict(memory)
+    with _cache_lock:
+        entry = model_state.set_model(model, model_name, memory)
+        entry.compile_cache_key = compile_cache_key
+        entry.refcount += 1
+        return entry
+
+
+def _get_or_load(model_state, func, model_name, *args, **kwargs):
+    """Return the entry of the model with a reference held by the caller."""
+    model_namespace = model_state.namespace
+    with _get_namespace_lock(model_namespace):
+        with _cache_lock:
+            entry = model_state.get_entry(model_name)
+            while entry is not None and entry.demoting:
+                _demotion_done.wait()
+                entry = model_state.get_entry(model_name)
+            if entry is not None:
+                model_state.use(model_name)
+                entry.refcount += 1
+
+        if entry is None:
+            record_miss(model_namespace, model_name)
+            show(
+                f"Model '{model_name}' in namespace '{model_namespace}' is not loaded. Loading model..."
+            )
+            return _load_model(model_state, func, model_name, *args, **kwargs)
+
+        record_hit(model_namespace, model_name)
+        if entry.is_resident():
+            show(f"Using cached model '{model_name}' in namespace '{model_namespace}'.")
+        else:
+            show(
+                f"Restoring model '{model_name}' in namespace '{model_namespace}' from {entry.tier}..."
+            )
+            try:
+                make_room(
+                    _known_memory.get((model_namespace, model_name)),
+                    reason=f"to make room for '{model_name}'",
+                )
+                with _cache_lock:
+                    group = _get_group(entry)
+                start_time = time.time()
+                _promote(group)
+                record_restore(model_namespace, model_name, time.time() - start_time)
+            except Exception:
+                _release(entry)
+                raise
+        return entry
+
+
+# the decorated loader and the optional warm-up function and compile cache
+# key function of every namespace
+_loaders = {}
+_warmups = {}
+_compile_cache_keys = {}
+
+
+def get_loader(model_namespace):
+    """Get the managed loader of a namespace, e.g. to preload its models."""
+    if model_namespace not in _loaders:
+        raise KeyError(f"No loader registered for namespace '{model_namespace}'")
+    return _loaders[model_namespace]
+
+
+def warmup_model(model_namespace, model):
+    """
+    Run the namespace's warm-up function on the model, if it has one.
+
+    Returns:
+        bool: True if a warm-up was run.
+    """
+    warmup = _warmups.get(model_namespace)
+    if warmup is None:
+        return False
+    import torch
+
+    with torch.inference_mode():
+        warmup(model)
+    with _cache_lock:
+        entries = [entry for entry in _all_entries() if entry.model is model]
+    for entry in entries:
+        _save_compile_cache(entry)
+    return True
+
+
+def manage_model_state(model_namespace, warmup=None, compile_cache_key=None):
+    """
+    Decorator to manage the model state.
+
+    Args:
+        model_namespace (str): Namespace of the models returned by the loader.
+        warmup (callable, optional): Runs a tiny inference on a loaded model,
+            used when preloading so that CUDA kernels and cuDNN autotuning are
+            ready before the first request.
+        compile_cache_key (callable, optional): Called with the loader's
+            arguments, returns a key from get_compile_cache_key for models
+            that are compiled with torch.compile, or None. The compiled
+            artifacts are saved under data/ after the first generation or
+            warm-up, and loaded before the model is loaded again, even after
+            a restart.
+
+    Loaded models are cached per namespace and model_name, several at a time.
+    When the model_cache memory budget from the config is exceeded, the least
+    recently used models are offloaded to CPU memory, then to disk, and
+    restored on their next use.
+
+    Loading is single-flight per namespace: concurrent callers wait for the
+    load in progress and share its result. Inside hold_models() the model
+    stays referenced, and cannot be evicted, until the block exits.
+    """
+
+    def decorator(func):
+        def wrapper(model_name, *args, **kwargs):
+            model_state = _get_model_state(model_namespace)
+            entry = _get_or_load(model_state, func, model_name, *args, **kwargs)
+            try:
+                make_room()
+            finally:
+                holds = _get_hold_stack()
+                if holds:
+                    # the reference is handed over to the generation
+                    holds[-1].entries.append(entry)
+                else:
+                    _release(entry)
+            return entry.model
+
+        _loaders[model_namespace] = wrapper
+        if warmup is not None:
+            _warmups[model_namespace] = warmup
+        if compile_cache_key is not None:
+            _compile_cache_keys[model_namespace] = compile_cache_key
+        return wrapper
+
+    return decorator
+
+
+def unload_model(model_namespace, model_name=None):
+    """
+    Unload one model, or every model, of a namespace.
+
+    Models in use by a running generation are unloaded once it finishes.
+    """
+    with _cache_lock:
+        model_state = model_states.get(model_namespace)
+        if model_state is None:
+            entries = []
+        elif model_name is None:
+            entries = model_state.get_entries()
+        else:
+            entries = list(filter(None, [model_state.get_entry(model_name)]))
+
+        in_use = [entry for entry in entries if entry.refcount > 0 or entry.demoting]
+        for entry in entries:
+            if entry in in_use:
+                entry.unload_requested = True
+            else:
+                model_state.set_model(None, entry.model_name)
+
+    if not entries:
         show(f"No model loaded in namespace '{model_namespace}'.")
+        return
+
+    torch_clear_memory()
+    for entry in in_use:
+        show(
+            f"Model '{entry.model_name}' in namespace '{model_namespace}' is in use and will be unloaded when the generation finishes."
+        )
+    if len(in_use) < len(entries):
+        if model_name is None:
+            show(f"Models in namespace '{model_namespace}' have been unloaded.")
+        else:
+            show(
+                f"Model '{model_name}' in namespace '{model_namespace}' has been unloaded."
+            )
 
 
 def unload_all_models():
@@ -78,18 +766,75 @@ def unload_all_models():
 
 
 def list_loaded_models_as_markdown():
-    lines = ["| Model Namespace | Model Name |", "|-----------------|------------|"]
+    lines = [
+        "| Model Namespace | Model Name | Location | GPU Memory | CPU Memory |",
+        "|-----------------|------------|----------|------------|------------|",
+    ]
 
-    for namespace, state in model_states.items():
-        model_name = state.get_model_name()
-        if model_name:
-            lines.append(f"| {namespace} | {model_name} |")
-        else:
-            lines.append(f"| {namespace} | Not Loaded |")
+    with _cache_lock:
+        states = list(model_states.items())
+
+    for namespace, state in states:
+        entries = state.get_entries()
+        if not entries:
+            lines.append(f"| {namespace} | Not Loaded | | | |")
+        for entry in entries:
+            lines.append(
+                f"| {namespace} | {entry.model_name} | {entry.tier} "
+                f"| {format_bytes(entry.memory['gpu'])} "
+                f"| {format_bytes(entry.memory['cpu'])} |"
+            )
 
     return "\n".join(lines)
 
 
+def get_model_cache_stats():
+    """
+    Structured counters of every model requested since the server started,
+    with the memory it currently uses.
+
+    Returns:
+        dict: {"models": [...], "memory": {...}}, see the model_cache_tab API.
+    """
+    with _cache_lock:
+        entries = {
+            (entry.namespace, entry.model_name): entry for entry in _all_entries()
+        }
+        memory = {
+            f"{kind}_{name}": value
+            for kind in ("gpu", "cpu")
+            for name, value in [
+                ("used", get_memory_used(kind)),
+                ("budget", get_memory_budget(kind)),
+            ]
+        }
+        models = []
+        model_stats = get_model_stats()
+        # models added with set_model directly have no counters
+        for namespace, model_name in [
+            *model_stats,
+            *entries.keys() - model_stats.keys(),
+        ]:
+            entry = entries.get((namespace, model_name))
+            stats = model_stats.get((namespace, model_name), ModelStats().to_dict())
+            models.append(
+                {
+                    "namespace": namespace,
+                    "model_name": model_name,
+                    "tier": entry.tier if entry else None,
+                    "gpu_bytes": entry.memory["gpu"] if entry else 0,
+                    "cpu_bytes": entry.memory["cpu"] if entry else 0,
+                    **stats,
+                }
+            )
+    return {"models": models, "memory": memory}
+
+
+def get_model_cache_metrics():
+    """The model cache stats in the Prometheus text format."""
+    return render_prometheus(get_model_cache_stats())
+
+
 def is_model_loaded(model_namespace):
     return (
         model_namespace in model_states
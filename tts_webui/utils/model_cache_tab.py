@@ -0,0 +1,66 @@
+import gradio as gr
+
+from tts_webui.utils.manage_model_state import (
+    get_model_cache_metrics,
+    get_model_cache_stats,
+    list_loaded_models_as_markdown,
+)
+from tts_webui.utils.preload_models import get_preload_status, render_preload_status
+from tts_webui.utils.timing_histograms import render_timings_prometheus
+
+
+def model_cache_tab():
+    with gr.Tab("Model Cache") as model_cache_tab:
+        gr.Markdown("### Loaded Models")
+        loaded_models = gr.Markdown("")
+        gr.Markdown("### Preloading")
+        preload_status = gr.Markdown("")
+
+        gr.Button("Refresh").click(
+            fn=refresh_model_cache,
+            outputs=[loaded_models, preload_status],
+        )
+        model_cache_tab.select(
+            fn=refresh_model_cache,
+            outputs=[loaded_models, preload_status],
+        )
+
+        gr.Button("API_GET_PRELOAD_STATUS", visible=False).click(
+            fn=get_preload_status,
+            outputs=[gr.JSON(None, visible=False)],
+            api_name="get_preload_status",
+        )
+        gr.Button("API_GET_MODEL_CACHE_STATS", visible=False).click(
+            fn=get_model_cache_stats,
+            outputs=[gr.JSON(None, visible=False)],
+            api_name="get_model_cache_stats",
+        )
+        gr.Button("API_GET_MODEL_CACHE_METRICS", visible=False).click(
+            fn=get_model_cache_metrics,
+            outputs=[gr.Textbox(visible=False)],
+            api_name="get_model_cache_metrics",
+        )
+
+
+def refresh_model_cache():
+    return list_loaded_models_as_markdown(), render_preload_status()
+
+
+def get_metrics():
+    return get_model_cache_metrics() + render_timings_prometheus()
+
+
+def add_metrics_route(app):
+    """
+    Serve the model cache metrics and decorator timings at /metrics for
+    Prometheus to scrape.
+    """
+    from fastapi.responses import PlainTextResponse
+
+    app.add_api_route(
+        "/metrics",
+        lambda: PlainTextResponse(
+            get_metrics(), media_type="text/plain; version=0.0.4"
+        ),
+        methods=["GET"],
+    )
@@ -0,0 +1,179 @@
+import os
+
+import torch
+
+
+def _iter_children(obj):
+    if isinstance(obj, (list, tuple, set)):
+        return list(obj)
+    if isinstance(obj, dict):
+        return list(obj.values())
+    # transformers pipelines, processors and most TTS wrappers keep their
+    # modules as plain attributes
+    return list(getattr(obj, "__dict__", {}).values())
+
+
+def iter_model_modules(model, max_depth=3):
+    """
+    Yield the top-level torch modules reachable from a loaded model object.
+
+    Models managed by manage_model_state are often tuples, dicts, pipelines or
+    wrapper classes instead of a single torch.nn.Module, so containers and
+    object attributes are searched up to max_depth levels deep.
+    """
+    seen = set()
+
+    def _walk(obj, depth):
+        if id(obj) in seen:
+            return
+        seen.add(id(obj))
+        if isinstance(obj, torch.nn.Module):
+            yield obj
+            return
+        if depth >= max_depth or isinstance(obj, (str, bytes, torch.Tensor)):
+            return
+        for child in _iter_children(obj):
+            yield from _walk(child, depth + 1)
+
+    yield from _walk(model, 0)
+
+
+def iter_model_tensors(*models):
+    """Yield every parameter and buffer of the models once."""
+    seen = set()
+    for model in models:
+        for module in iter_model_modules(model):
+            for tensor in [*module.parameters(), *module.buffers()]:
+                if id(tensor) in seen:
+                    continue
+                seen.add(id(tensor))
+                yield tensor
+
+
+def get_model_module_ids(model):
+    """The ids of every torch module and submodule of a loaded model object."""
+    return frozenset(
+        id(submodule)
+        for module in iter_model_modules(model)
+        for submodule in module.modules()
+    )
+
+
+def get_model_memory(*models):
+    """
+    Measure how many bytes of the models' tensors live on the GPU and the CPU.
+
+    Tensors shared by several models, e.g. a pipeline and the model it wraps,
+    are counted once.
+
+    Returns:
+        dict: {"gpu": bytes, "cpu": bytes}
+    """
+    memory = {"gpu": 0, "cpu": 0}
+    for tensor in iter_model_tensors(*models):
+        if tensor.device.type == "meta":
+            continue
+        kind = "cpu" if tensor.device.type == "cpu" else "gpu"
+        memory[kind] += tensor.numel() * tensor.element_size()
+    return memory
+
+
+def get_gpu_memory_allocated():
+    try:
+        if torch.cuda.is_available():
+            return sum(
+                torch.cuda.memory_allocated(idx)
+                for idx in range(torch.cuda.device_count())
+            )
+    except Exception:
+        pass
+    return 0
+
+
+def get_gpu_memory_cached():
+    """
+    VRAM reserved by the PyTorch caching allocator but not used by tensors,
+    which the driver reports as used although PyTorch can reuse it.
+    """
+    try:
+        if torch.cuda.is_available():
+            return sum(
+                torch.cuda.memory_reserved(idx) - torch.cuda.memory_allocated(idx)
+                for idx in range(torch.cuda.device_count())
+            )
+    except Exception:
+        pass
+    return 0
+
+
+def get_gpu_memory_total():
+    try:
+        if torch.cuda.is_available():
+            return sum(
+                torch.cuda.get_device_properties(idx).total_memory
+                for idx in range(torch.cuda.device_count())
+            )
+    except Exception:
+        pass
+    return 0
+
+
+def get_gpu_memory_free():
+    """
+    Free VRAM as reported by the driver, which also sees other processes.
+
+    Returns:
+        int | None: Bytes free on all GPUs, or None without CUDA.
+    """
+    try:
+        if torch.cuda.is_available():
+            return sum(
+                torch.cuda.mem_get_info(idx)[0]
+                for idx in range(torch.cuda.device_count())
+            )
+    except Exception:
+        pass
+    return None
+
+
+def get_cpu_memory_total():
+    """
+    Total physical memory of the machine.
+
+    Returns:
+        int | None: Bytes, or None if it cannot be measured on this platform.
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        pass
+    try:
+        import psutil
+
+        return psutil.virtual_memory().total
+    except Exception:
+        return None
+
+
+def get_process_rss():
+    """
+    Resident set size of this process.
+
+    Returns:
+        int | None: Bytes, or None if it cannot be measured on this platform.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def format_bytes(size: int):
+    return f"{size / 1024**2:.0f} MB"
@@ -0,0 +1,122 @@
+import glob
+import os
+import uuid
+
+import torch
+
+from tts_webui.utils.model_memory import iter_model_modules
+
+OFFLOAD_DIR = os.path.join("data", "offload")
+
+
+def can_offload(model):
+    return next(iter_model_modules(model), None) is not None
+
+
+def get_model_device(model):
+    """Return the first accelerator device used by the model, or "cpu"."""
+    for module in iter_model_modules(model):
+        for tensor in [*module.parameters(), *module.buffers()]:
+            if tensor.device.type not in ("cpu", "meta"):
+                return str(tensor.device)
+    return "cpu"
+
+
+def _named_tensors(*models):
+    seen = set()
+    index = 0
+    for model in models:
+        for module in iter_model_modules(model):
+            for name, tensor in [*module.named_parameters(), *module.named_buffers()]:
+                if id(tensor) in seen:
+                    continue
+                seen.add(id(tensor))
+                yield f"{index}.{name}", tensor
+            index += 1
+
+
+def move_model(model, device):
+    """Move every module of the model to the device, in place."""
+    for module in iter_model_modules(model):
+        module.to(device)
+
+
+def offload_to_cpu(model):
+    """
+    Move the model to (pinned) CPU memory.
+
+    Pinned memory makes the copy back to the GPU asynchronous and several
+    times faster than from pageable memory.
+    """
+    move_model(model, "cpu")
+    if not torch.cuda.is_available():
+        return
+    with torch.no_grad():
+        for _, tensor in _named_tensors(model):
+            if not tensor.is_pinned():
+                tensor.data = tensor.data.pin_memory()
+
+
+def offload_to_disk(models, snapshot_path):
+    """
+    Write every parameter and buffer of the models to a snapshot file and
+    release their memory.
+
+    Tied weights, and modules shared by several models, share a tensor, so
+    they are written and restored once.
+
+    Args:
+        models (list): The models to write together.
+        snapshot_path (str): From new_snapshot_path.
+    """
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    tensors = dict(_named_tensors(*models))
+    torch.save({name: t.detach().cpu() for name, t in tensors.items()}, snapshot_path)
+    with torch.no_grad():
+        for tensor in tensors.values():
+            tensor.data = torch.empty(0, dtype=tensor.dtype)
+
+
+def restore_from_disk(models, snapshot_path):
+    """
+    Restore models written by offload_to_disk, given in the same order.
+
+    The snapshot is memory-mapped, so pages are only read when the tensors
+    are first used or moved to the GPU.
+    """
+    snapshot = torch.load(snapshot_path, mmap=True, weights_only=True)
+    with torch.no_grad():
+        for name, tensor in _named_tensors(*models):
+            tensor.data = snapshot[name]
+
+
+_stale_snapshots_removed = False
+
+
+def new_snapshot_path(namespace, model_name):
+    """
+    Get a unique snapshot path for a model.
+
+    Paths are never reused, since a restored model can still be memory-mapped
+    from its previous snapshot.
+    """
+    global _stale_snapshots_removed
+    if not _stale_snapshots_removed:
+        # snapshots from a previous run belong to models that are long gone
+        for path in glob.glob(os.path.join(OFFLOAD_DIR, "*.pt")):
+            remove_snapshot(path)
+        _stale_snapshots_removed = True
+
+    safe_name = f"{namespace}__{model_name}"
+    for char in ("/", "\\", ":"):
+        safe_name = safe_name.replace(char, "_")
+    return os.path.join(OFFLOAD_DIR, f"{safe_name}__{uuid.uuid4().hex[:8]}.pt")
+
+
+def remove_snapshot(snapshot_path):
+    try:
+        if snapshot_path and os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+    except OSError as e:
+        # Windows keeps memory-mapped files locked
+        print(f"Could not remove model snapshot {snapshot_path}: {e}")
@@ -0,0 +1,183 @@
+import threading
+import time
+
+
+class ModelStats:
+    """Counters of one model since the server started."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_failures = 0
+        self.load_seconds_total = 0.0
+        self.last_load_seconds = None
+        self.restores = 0
+        self.restore_seconds_total = 0.0
+        # "cpu", "disk", "unloaded" or "idle" -> count
+        self.evictions = {}
+        self.last_used = None
+
+    def to_dict(self):
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else None,
+            "loads": self.loads,
+            "load_failures": self.load_failures,
+            "load_seconds_total": self.load_seconds_total,
+            "last_load_seconds": self.last_load_seconds,
+            "restores": self.restores,
+            "restore_seconds_total": self.restore_seconds_total,
+            "evictions": dict(self.evictions),
+            "last_used": self.last_used,
+        }
+
+
+# (namespace, model_name) -> ModelStats
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _get_stats(namespace, model_name):
+    key = (namespace, model_name)
+    if key not in _stats:
+        _stats[key] = ModelStats()
+    return _stats[key]
+
+
+def record_hit(namespace, model_name):
+    with _stats_lock:
+        stats = _get_stats(namespace, model_name)
+        stats.hits += 1
+        stats.last_used = time.time()
+
+
+def record_miss(namespace, model_name):
+    with _stats_lock:
+        stats = _get_stats(namespace, model_name)
+        stats.misses += 1
+        stats.last_used = time.time()
+
+
+def record_load(namespace, model_name, seconds, failed=False):
+    with _stats_lock:
+        stats = _get_stats(namespace, model_name)
+        if failed:
+            stats.load_failures += 1
+            return
+        stats.loads += 1
+        stats.load_seconds_total += seconds
+        stats.last_load_seconds = seconds
+
+
+def record_restore(namespace, model_name, seconds):
+    with _stats_lock:
+        stats = _get_stats(namespace, model_name)
+        stats.restores += 1
+        stats.restore_seconds_total += seconds
+
+
+def record_eviction(namespace, model_name, destination):
+    with _stats_lock:
+        stats = _get_stats(namespace, model_name)
+        stats.evictions[destination] = stats.evictions.get(destination, 0) + 1
+
+
+def get_model_stats():
+    """
+    Returns:
+        dict: (namespace, model_name) -> counters, see ModelStats.to_dict.
+    """
+    with _stats_lock:
+        return {key: stats.to_dict() for key, stats in _stats.items()}
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+
+
+_PROMETHEUS_METRICS = [
+    # (name, type, help, key in the model's stats)
+    ("hits_total", "counter", "Requests served by a cached model.", "hits"),
+    ("misses_total", "counter", "Requests that had to load the model.", "misses"),
+    ("loads_total", "counter", "Completed model loads.", "loads"),
+    ("load_failures_total", "counter", "Failed model loads.", "load_failures"),
+    (
+        "load_seconds_total",
+        "counter",
+        "Time spent loading the model.",
+        "load_seconds_total",
+    ),
+    ("restores_total", "counter", "Restores from CPU or disk.", "restores"),
+    (
+        "restore_seconds_total",
+        "counter",
+        "Time spent restoring the model from CPU or disk.",
+        "restore_seconds_total",
+    ),
+    (
+        "last_used_timestamp_seconds",
+        "gauge",
+        "Unix time of the last request for the model.",
+        "last_used",
+    ),
+]
+
+
+def render_prometheus(cache_stats):
+    """
+    Render the output of get_model_cache_stats in the Prometheus text format.
+    """
+    prefix = "tts_webui_model_cache"
+    models = cache_stats["models"]
+    lines = []
+
+    for name, metric_type, help_text, key in _PROMETHEUS_METRICS:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+        for model in models:
+            if model[key] is None:
+                continue
+            labels = _labels(namespace=model["namespace"], model=model["model_name"])
+            lines.append(f"{prefix}_{name}{{{labels}}} {model[key]}")
+
+    lines.append(f"# HELP {prefix}_evictions_total Models demoted or unloaded.")
+    lines.append(f"# TYPE {prefix}_evictions_total counter")
+    for model in models:
+        for destination, count in model["evictions"].items():
+            labels = _labels(
+                namespace=model["namespace"],
+                model=model["model_name"],
+                destination=destination,
+            )
+            lines.append(f"{prefix}_evictions_total{{{labels}}} {count}")
+
+    lines.append(f"# HELP {prefix}_resident_bytes Memory used by the model.")
+    lines.append(f"# TYPE {prefix}_resident_bytes gauge")
+    for model in models:
+        for device in ("gpu", "cpu"):
+            labels = _labels(
+                namespace=model["namespace"], model=model["model_name"], device=device
+            )
+            lines.append(
+                f"{prefix}_resident_bytes{{{labels}}} {model[f'{device}_bytes']}"
+            )
+
+    for name, help_text in [
+        ("used_bytes", "Memory used by all cached models."),
+        ("budget_bytes", "Memory budget of the model cache."),
+    ]:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        for device in ("gpu", "cpu"):
+            value = cache_stats["memory"][f"{device}_{name.split('_')[0]}"]
+            if value is not None:
+                lines.append(f'{prefix}_{name}{{device="{device}"}} {value}')
+
+    return "\n".join(lines) + "\n"
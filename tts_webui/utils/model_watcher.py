@@ -0,0 +1,45 @@
+import threading
+import time
+
+from tts_webui.utils.manage_model_state import (
+    get_model_cache_config,
+    make_room,
+    unload_idle_models,
+)
+
+_watcher_thread = None
+
+
+def check_models():
+    """Unload idle models and demote models while memory is running short."""
+    cache_config = get_model_cache_config()
+    idle_timeout_minutes = cache_config["idle_timeout_minutes"]
+    if idle_timeout_minutes:
+        unload_idle_models(idle_timeout_minutes * 60)
+    make_room(reason="because memory is running low")
+
+
+def _watch(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            check_models()
+        except Exception as e:
+            print(f"Model watcher failed: {e}")
+
+
+def start_model_watcher():
+    """
+    Check the cached models every watch_interval_seconds on a daemon thread.
+
+    Does nothing if the watcher is already running or the interval is 0.
+    """
+    global _watcher_thread
+    interval = get_model_cache_config()["watch_interval_seconds"]
+    if _watcher_thread is not None or not interval:
+        return None
+    _watcher_thread = threading.Thread(
+        target=_watch, args=(interval,), name="model-watcher", daemon=True
+    )
+    _watcher_thread.start()
+    return _watcher_thread
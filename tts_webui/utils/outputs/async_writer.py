@@ -0,0 +1,145 @@
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future, wait
+
+from tts_webui.config.config import config
+from tts_webui.config.load_config import default_config
+
+
+class OutputWriterPool:
+    """
+    Background threads that write generation outputs.
+
+    Writes of one bundle (output folder) always go to the same worker, so
+    they run in the order they were submitted, e.g. the JSON is written
+    before the OGG that embeds it. Every worker has a bounded queue: when the
+    writers fall behind, submit blocks the generation instead of piling up
+    audio in memory.
+    """
+
+    def __init__(self, max_workers=2, max_pending=16):
+        self._queues = [queue.Queue(maxsize=max_pending) for _ in range(max_workers)]
+        # bundle -> futures of its writes that have not finished
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.errors = deque(maxlen=100)
+        for index, work_queue in enumerate(self._queues):
+            threading.Thread(
+                target=self._work,
+                args=(work_queue,),
+                name=f"output-writer-{index}",
+                daemon=True,
+            ).start()
+
+    def _work(self, work_queue):
+        while True:
+            bundle, description, future, fn, args, kwargs = work_queue.get()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                print(f"Failed to write {description} of {bundle}: {e}")
+                traceback.print_exc()
+                self.errors.append(
+                    {
+                        "bundle": bundle,
+                        "description": description,
+                        "error": repr(e),
+                        "time": time.time(),
+                    }
+                )
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    futures = self._pending.get(bundle, [])
+                    if future in futures:
+                        futures.remove(future)
+                    if not futures:
+                        self._pending.pop(bundle, None)
+
+    def submit(self, bundle, description, fn, *args, **kwargs):
+        future = Future()
+        with self._lock:
+            self._pending.setdefault(bundle, []).append(future)
+        work_queue = self._queues[hash(bundle) % len(self._queues)]
+        work_queue.put((bundle, description, future, fn, args, kwargs))
+        return future
+
+    def flush(self, bundle=None, timeout=None):
+        """
+        Wait for the pending writes of a bundle, or of every bundle.
+
+        Returns:
+            list: The exceptions of the writes that failed.
+        """
+        with self._lock:
+            if bundle is None:
+                futures = [f for fs in self._pending.values() for f in fs]
+            else:
+                futures = list(self._pending.get(bundle, []))
+        wait(futures, timeout=timeout)
+        return [f.exception() for f in futures if f.done() and f.exception()]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_output_writer_config():
+    return {**default_config["output_writer"], **config.get("output_writer", {})}
+
+
+def is_async_output_enabled():
+    return bool(_get_output_writer_config()["async"])
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            writer_config = _get_output_writer_config()
+            _pool = OutputWriterPool(
+                max_workers=writer_config["max_workers"],
+                max_pending=writer_config["max_pending"],
+            )
+        return _pool
+
+
+def write_output(result_dict, description, fn, *args, **kwargs):
+    """
+    Write an output of a generation, on the writer pool if async output
+    writing is enabled in the config, otherwise right away.
+
+    Args:
+        result_dict (dict): The result of the generation, its folder_root
+            identifies the bundle.
+        description (str): What is written, e.g. "wav", for error reports.
+        fn (callable): Writes the output, called with *args and **kwargs.
+    """
+    if not is_async_output_enabled():
+        fn(*args, **kwargs)
+        return None
+    return _get_pool().submit(
+        result_dict["folder_root"], description, fn, *args, **kwargs
+    )
+
+
+def flush_outputs(result_dict=None, timeout=None):
+    """
+    Wait until the outputs of a generation, or of every generation, are
+    written. Callers that read the files back must flush first.
+
+    Returns:
+        list: The exceptions of the writes that failed.
+    """
+    if _pool is None:
+        return []
+    bundle = None if result_dict is None else result_dict["folder_root"]
+    return _pool.flush(bundle, timeout=timeout)
+
+
+def get_output_write_errors():
+    """The most recent failed writes, oldest first."""
+    return [] if _pool is None else list(_pool.errors)
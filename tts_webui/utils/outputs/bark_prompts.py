@@ -0,0 +1,67 @@
+import base64
+import os
+
+import numpy as np
+
+PROMPT_KEYS = ["semantic_prompt", "coarse_prompt"]
+
+# the metadata key naming the sidecar, which is next to the audio
+SIDECAR_KEY = "prompts_npz"
+
+
+def get_sidecar_path(audio_filename: str):
+    return os.path.splitext(audio_filename)[0] + ".prompts.npz"
+
+
+def save_bark_prompts(audio_filename: str, prompts):
+    """
+    Save the prompts of a Bark generation next to its audio, so that the
+    metadata tag only has to name the sidecar.
+
+    Returns:
+        str: The name of the sidecar, for SIDECAR_KEY.
+    """
+    path = get_sidecar_path(audio_filename)
+    np.savez_compressed(path, **{key: np.asarray(prompts[key]) for key in PROMPT_KEYS})
+    return os.path.basename(path)
+
+
+def _decode_base64_prompt(key: str, value: str):
+    array = np.frombuffer(base64.b64decode(value), dtype=np.int64)
+    # the shape was not saved, bark's coarse prompt has 2 codebooks
+    if key == "coarse_prompt" and array.size % 2 == 0:
+        return array.reshape(2, -1)
+    return array
+
+
+def load_bark_prompts(audio_filename: str, metadata: dict):
+    """
+    The prompts of a Bark generation. From a sidecar, every array is only
+    read when it is accessed; files saved before the sidecar have them
+    base64-encoded in the metadata.
+
+    Returns:
+        Mapping: key -> np.ndarray, or None if the metadata has no prompts.
+    """
+    if metadata.get(SIDECAR_KEY):
+        directory = os.path.dirname(audio_filename)
+        return np.load(os.path.join(directory, metadata[SIDECAR_KEY]))
+    if all(key in metadata for key in PROMPT_KEYS):
+        return {key: _decode_base64_prompt(key, metadata[key]) for key in PROMPT_KEYS}
+    return None
+
+
+def move_prompts_to_sidecar(audio_filename: str, metadata: dict):
+    """
+    Save the base64 prompts of an older file's metadata to a sidecar.
+
+    Returns:
+        dict: The metadata referencing the sidecar instead, or None if it
+            had no prompts to move.
+    """
+    if metadata.get(SIDECAR_KEY) or not all(key in metadata for key in PROMPT_KEYS):
+        return None
+    prompts = load_bark_prompts(audio_filename, metadata)
+    metadata = {k: v for k, v in metadata.items() if k not in PROMPT_KEYS}
+    metadata[SIDECAR_KEY] = save_bark_prompts(audio_filename, prompts)
+    return metadata
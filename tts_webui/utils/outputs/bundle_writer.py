@@ -0,0 +1,183 @@
+import functools
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from tts_webui.config.config import config
+from tts_webui.config.load_config import default_config
+from tts_webui.history_tab.history_index import index_bundle
+from tts_webui.utils.outputs.async_writer import write_output
+from tts_webui.utils.outputs.path import get_relative_output_path_ext
+from tts_webui.utils.timing_histograms import record_timing
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+class OutputBundle:
+    """
+    The output files of one generation, written together by commit.
+
+    The save decorators stage their writers instead of writing right away.
+    On commit every file is written from the same audio buffer into a hidden
+    temp directory, which is then renamed to folder_root, so the history tab
+    never sees a partially written generation.
+    """
+
+    def __init__(self, result_dict):
+        self.folder_root = result_dict["folder_root"]
+        self.filename = result_dict["filename"]
+        self._result_dict = result_dict
+        # (ext, fn, args, kwargs)
+        self._staged = []
+
+    @functools.cached_property
+    def audio_array(self):
+        return np.ascontiguousarray(self._result_dict["audio_out"][1])
+
+    @functools.cached_property
+    def audio_bytes(self):
+        """The raw audio samples, shared by the hash and the ffmpeg pipes."""
+        return memoryview(self.audio_array).cast("B")
+
+    def stage(self, ext, fn, *args, **kwargs):
+        self._staged.append((ext, fn, args, kwargs))
+
+    def _get_temp_dir(self):
+        parent = os.path.dirname(self.folder_root)
+        return os.path.join(parent, f".{self.filename}.{uuid.uuid4().hex[:8]}.partial")
+
+    def commit(self):
+        """
+        Write the staged files and the manifest, then publish the bundle.
+
+        A failed writer is recorded in the manifest and does not stop the
+        other files from being written.
+        """
+        temp_dir = self._get_temp_dir()
+        os.makedirs(temp_dir)
+        try:
+            manifest = {
+                "_version": "0.0.1",
+                "filename": self.filename,
+                "date": str(self._result_dict.get("date")),
+                "files": [],
+                "errors": [],
+            }
+            for ext, fn, args, kwargs in self._staged:
+                name = self.filename + ext
+                path = os.path.join(temp_dir, name)
+                start_time = time.time()
+                try:
+                    fn(path, *args, **kwargs)
+                except Exception as e:
+                    print(f"Failed to write {name}: {e}")
+                    manifest["errors"].append({"name": name, "error": repr(e)})
+                    continue
+                seconds = time.time() - start_time
+                record_timing(f"bundle write {ext}", seconds)
+                if os.path.exists(path):
+                    manifest["files"].append(
+                        {
+                            "name": name,
+                            "bytes": os.path.getsize(path),
+                            "seconds": round(seconds, 3),
+                        }
+                    )
+            with open(os.path.join(temp_dir, MANIFEST_FILENAME), "w") as f:
+                json.dump(manifest, f, indent=2)
+            self._publish(temp_dir)
+            index_bundle(self.folder_root)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        return manifest
+
+    def _publish(self, temp_dir):
+        if not os.path.exists(self.folder_root):
+            try:
+                os.replace(temp_dir, self.folder_root)
+                return
+            except OSError:
+                # created in the meantime, e.g. by a generation in the same second
+                pass
+        os.makedirs(self.folder_root, exist_ok=True)
+        for name in os.listdir(temp_dir):
+            os.replace(
+                os.path.join(temp_dir, name), os.path.join(self.folder_root, name)
+            )
+        os.rmdir(temp_dir)
+
+
+def is_bundle_writer_enabled():
+    writer_config = {
+        **default_config["output_writer"],
+        **config.get("output_writer", {}),
+    }
+    return bool(writer_config["bundle"])
+
+
+# number of decorator_write_output_bundle wrappers running on this thread
+_local = threading.local()
+
+
+def _get_active_writers():
+    return getattr(_local, "active", 0)
+
+
+@contextmanager
+def active_bundle_writer():
+    """Mark that the outputs created on this thread will be committed."""
+    _local.active = _get_active_writers() + 1
+    try:
+        yield
+    finally:
+        _local.active = _get_active_writers() - 1
+
+
+def create_bundle(result_dict):
+    """
+    Attach an OutputBundle to the result_dict if a bundle writer will commit
+    it, and return whether it did.
+    """
+    if not _get_active_writers() or not is_bundle_writer_enabled():
+        return False
+    result_dict["bundle"] = OutputBundle(result_dict)
+    return True
+
+
+def commit_bundle(result_dict):
+    """Write the bundle of the result_dict, if it has one."""
+    bundle = result_dict.pop("bundle", None)
+    if bundle is None:
+        return None
+    return write_output(result_dict, "bundle", bundle.commit)
+
+
+def save_output(result_dict, ext, fn, *args, **kwargs):
+    """
+    Save one output file of a generation.
+
+    fn(path, *args, **kwargs) writes the file. It is staged in the bundle of
+    the result_dict if it has one, otherwise written right away (or on the
+    background writer pool).
+    """
+    bundle = result_dict.get("bundle")
+    if bundle is not None:
+        bundle.stage(ext, fn, *args, **kwargs)
+        return
+    path = get_relative_output_path_ext(result_dict, ext)
+    write_output(result_dict, ext.lstrip("."), fn, path, *args, **kwargs)
+
+
+def get_audio_bytes(result_dict):
+    """The raw samples of audio_out, computed once per bundle."""
+    bundle = result_dict.get("bundle")
+    if bundle is not None:
+        return bundle.audio_bytes
+    return result_dict["audio_out"][1].tobytes()
@@ -0,0 +1,121 @@
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from tts_webui.config.config import config
+from tts_webui.config.load_config import default_config
+
+
+def _escape_ffmetadata(value: str):
+    # the characters with a meaning in ;FFMETADATA1 files
+    return re.sub(r"([=;#\\\n])", r"\\\1", value)
+
+
+def _write_ffmetadata(comment: str):
+    # a file, the metadata can be too long for the command line
+    with tempfile.NamedTemporaryFile("wb", suffix=".ffmetadata.ini", delete=False) as f:
+        f.write(f";FFMETADATA1\ncomment={_escape_ffmetadata(comment)}".encode())
+        return f.name
+
+
+def replace_comment(filename: str, comment: str):
+    """Rewrite the comment tag of an ogg or flac file, without re-encoding."""
+    format = os.path.splitext(filename)[1].lstrip(".")
+    metadata_file = _write_ffmetadata(comment)
+    temp_filename = f"{filename}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-i", filename, "-i", metadata_file]
+            + ["-map", "0", "-map_metadata", "1", "-map_metadata:s:a", "1:g"]
+            + ["-c", "copy", "-f", format, temp_filename],
+            capture_output=True,
+            check=True,
+        )
+        os.replace(temp_filename, filename)
+    finally:
+        os.remove(metadata_file)
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+
+
+def encode_with_ffmpeg(audio_bytes, sample_rate, channels, outputs, comment=None):
+    """
+    Encode float32 samples into one or more files with a single ffmpeg
+    process, which reads the samples from its stdin once.
+
+    Args:
+        audio_bytes (bytes): Raw f32le samples, interleaved by channel.
+        sample_rate (int): The sample rate of the audio.
+        channels (int): The number of channels.
+        outputs (list): (filename, format) pairs, e.g. ("a.ogg", "ogg").
+        comment (str): Written as the comment tag of every output.
+
+    Raises:
+        RuntimeError: If ffmpeg failed, with its error output.
+    """
+    args = ["ffmpeg", "-v", "error", "-y"]
+    args += ["-f", "f32le", "-ar", str(sample_rate), "-ac", str(channels)]
+    args += ["-i", "pipe:"]
+
+    metadata_file = None
+    if comment is not None:
+        metadata_file = _write_ffmetadata(comment)
+        args += ["-i", metadata_file]
+
+    for filename, format in outputs:
+        args += ["-map", "0:a"]
+        if metadata_file is not None:
+            args += ["-map_metadata", "1"]
+        args += ["-f", format, filename]
+
+    try:
+        process = subprocess.run(args, input=audio_bytes, capture_output=True)
+    finally:
+        if metadata_file is not None:
+            os.remove(metadata_file)
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg exited with {process.returncode}: "
+            + process.stderr.decode("utf-8", errors="replace")
+        )
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            writer_config = {
+                **default_config["output_writer"],
+                **config.get("output_writer", {}),
+            }
+            max_workers = writer_config["ffmpeg_workers"] or os.cpu_count() or 1
+            _pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="ffmpeg-encoder"
+            )
+        return _pool
+
+
+def submit_encode(audio_bytes, sample_rate, channels, outputs, comment=None):
+    """
+    Encode on the ffmpeg pool, which runs as many encoders at once as there
+    are CPUs, however many writers and batches submit to it.
+
+    Returns:
+        Future: Done when every output is written.
+    """
+    return _get_pool().submit(
+        encode_with_ffmpeg, audio_bytes, sample_rate, channels, outputs, comment
+    )
+
+
+def encode(audio_bytes, sample_rate, channels, outputs, comment=None):
+    """Encode on the ffmpeg pool and wait for it, see encode_with_ffmpeg."""
+    return submit_encode(audio_bytes, sample_rate, channels, outputs, comment).result()
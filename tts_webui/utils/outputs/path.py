@@ -1,29 +1,38 @@
 import os
 
 
-def get_relative_output_path(result_dict, *args):
+def get_relative_output_path(result_dict, *args, create=True):
     """
     Get the relative path to the output directory.
 
+    An output bundle only creates folder_root once every staged file is
+    written, so it is created here for callers that write into it directly.
+
     Args:
         result_dict (dict): The result dictionary.
         *args (str): The path arguments, e.g., "filename.wav".
+        create (bool): Create the folder_root directory if it does not exist.
 
     Returns:
         str: The relative path to the output directory.
     """
+    if create:
+        os.makedirs(result_dict["folder_root"], exist_ok=True)
     return os.path.join(result_dict["folder_root"], *args)
 
 
-def get_relative_output_path_ext(result_dict, ext: str):
+def get_relative_output_path_ext(result_dict, ext: str, create=True):
     """
     Get the relative path to the output directory with an extension.
 
     Args:
         result_dict (dict): The result dictionary.
         ext (str): The extension, e.g., ".wav".
+        create (bool): Create the folder_root directory if it does not exist.
 
     Returns:
         str: The relative path to the output directory with an extension.
     """
-    return get_relative_output_path(result_dict, result_dict["filename"] + ext)
+    return get_relative_output_path(
+        result_dict, result_dict["filename"] + ext, create=create
+    )
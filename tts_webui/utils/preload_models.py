@@ -0,0 +1,77 @@
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tts_webui.config.config import config
+from tts_webui.config.load_config import default_config
+from tts_webui.utils.manage_model_state import get_loader, hold_models, warmup_model
+
+# "namespace / model_name" -> status message
+preload_status = {}
+_status_lock = threading.Lock()
+
+
+def _set_status(item, status):
+    with _status_lock:
+        preload_status[f"{item['namespace']} / {item['model_name']}"] = status
+
+
+def get_preload_status():
+    with _status_lock:
+        return dict(preload_status)
+
+
+def _preload(item):
+    start_time = time.time()
+    try:
+        _set_status(item, "Loading")
+        if item.get("module"):
+            # the loader is registered when its extension is imported
+            importlib.import_module(item["module"])
+        loader = get_loader(item["namespace"])
+        # not offloaded by another preload before it is warmed up
+        with hold_models():
+            model = loader(item["model_name"], **item.get("kwargs", {}))
+
+            if item.get("warmup", True):
+                _set_status(item, "Warming up")
+                warmup_model(item["namespace"], model)
+
+        _set_status(item, f"Ready ({time.time() - start_time:.1f} seconds)")
+    except Exception as e:
+        print(f"Failed to preload {item['namespace']} / {item['model_name']}: {e}")
+        _set_status(item, f"Failed: {e}")
+
+
+def start_preload(preload_config=None):
+    """
+    Load and warm up the models listed in the preload config on a thread pool.
+
+    Returns immediately, so it can be called after the server is listening.
+    """
+    if preload_config is None:
+        preload_config = config.get("preload", default_config["preload"])
+    items = preload_config.get("models", [])
+    if not items:
+        return None
+
+    print(f"Preloading {len(items)} model(s) in the background...")
+    executor = ThreadPoolExecutor(
+        max_workers=preload_config.get("max_workers", 1),
+        thread_name_prefix="preload",
+    )
+    for item in items:
+        _set_status(item, "Queued")
+        executor.submit(_preload, item)
+    executor.shutdown(wait=False)
+    return executor
+
+
+def render_preload_status():
+    status = get_preload_status()
+    if not status:
+        return "No models are configured for preloading."
+    lines = ["| Model | Status |", "|-------|--------|"]
+    lines += [f"| {name} | {message} |" for name, message in status.items()]
+    return "\n".join(lines)
@@ -1,13 +1,15 @@
 import io
-import matplotlib
-import matplotlib.figure as mpl_fig
-from matplotlib import pyplot as plt
 import numpy as np
 
-matplotlib.use("agg")
+from tts_webui.utils.waveform_image import render_waveform, save_waveform_png
 
 
 def plot_waveform(audio_array: np.ndarray):
+    import matplotlib
+
+    matplotlib.use("agg")
+    from matplotlib import pyplot as plt
+
     fig = plt.figure(figsize=(10, 3))
     plt.style.use("dark_background")
     plt.plot(audio_array, color="orange")
@@ -15,7 +17,7 @@ def plot_waveform(audio_array: np.ndarray):
     return fig
 
 
-def figure_to_image(fig: mpl_fig.Figure):
+def figure_to_image(fig):
     with io.BytesIO() as buff:
         fig.savefig(buff, format="raw")
         buff.seek(0)
@@ -25,22 +27,13 @@ def figure_to_image(fig: mpl_fig.Figure):
 
 
 def plot_waveform_as_image(audio_array: np.ndarray):
-    fig = plot_waveform(audio_array)
-    plt.close()
-    return figure_to_image(fig)
+    return render_waveform(audio_array)
 
 
 def middleware_save_waveform_plot(audio_array: np.ndarray, filename_png: str):
-    # fig = plt.figure(figsize=(10, 3))
-    # plt.style.use("dark_background")
-    # plt.plot(audio_array, color="orange")
-    # plt.axis("off")
-    # plt.savefig(filename_png)
-    # plt.close()
-    fig = plot_waveform(audio_array)
-    plt.savefig(filename_png)
-    plt.close()
-    return figure_to_image(fig)
+    # the min and max of each pixel column, instead of plotting every sample
+    # with matplotlib, which is kept in plot_waveform
+    return save_waveform_png(audio_array, filename_png)
 
 
 if __name__ == "__main__":
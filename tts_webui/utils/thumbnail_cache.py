@@ -0,0 +1,219 @@
+import json
+import os
+import re
+import subprocess
+import threading
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from tts_webui.config.config import config
+from tts_webui.config.load_config import default_config
+from tts_webui.utils.audio_array_to_sha256 import audio_array_to_sha256
+from tts_webui.utils.waveform_image import encode_png, render_waveform
+
+THUMBNAIL_CACHE_DIR = os.path.join("data", "cache", "thumbnails")
+
+THUMBNAIL_SIZES = {
+    "list": (250, 75),
+    "gallery": (500, 150),
+    "full": (1000, 300),
+}
+
+AUDIO_EXTENSIONS = [".wav", ".flac", ".ogg"]
+
+# the cache is trimmed to this share of its budget, not to just below it
+_TRIM_RATIO = 0.8
+
+# hashes of audio without a sidecar kept in memory, least recently used dropped
+_MAX_HASHES = 4096
+
+
+def get_thumbnail_config():
+    return {**default_config["thumbnails"], **config.get("thumbnails", {})}
+
+
+def find_audio_file(filename: str):
+    """The audio of a bundle, which is not always saved as wav."""
+    base, _ = os.path.splitext(filename)
+    for extension in AUDIO_EXTENSIONS:
+        if os.path.exists(base + extension):
+            return base + extension
+    return None
+
+
+def _read_with_ffmpeg(filename: str):
+    process = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", filename, "-f", "f32le", "-ac", "1", "-"],
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(process.stdout, dtype=np.float32)
+
+
+def read_audio(filename: str):
+    if filename.endswith(".wav"):
+        from scipy.io.wavfile import read as read_wav
+
+        _, audio_array = read_wav(filename, mmap=True)
+        return audio_array
+    try:
+        import soundfile
+
+        audio_array, _ = soundfile.read(filename, dtype="float32")
+        return audio_array
+    except ImportError:
+        return _read_with_ffmpeg(filename)
+
+
+def _read_sidecar_hash(filename: str):
+    try:
+        with open(os.path.splitext(filename)[0] + ".json") as f:
+            audio_hash = json.load(f).get("hash")
+    except (OSError, ValueError, AttributeError):
+        return None
+    # the sha256 of the samples written by decorator_save_metadata
+    if isinstance(audio_hash, str) and re.fullmatch("[0-9a-f]{64}", audio_hash):
+        return audio_hash
+    return None
+
+
+class ThumbnailCache:
+    """
+    Waveform images of any size, keyed by the hash of the audio, so that
+    copies of a generation in favorites and collections share them.
+
+    The least recently used images are deleted once the cache grows over
+    max_bytes.
+    """
+
+    def __init__(self, directory=THUMBNAIL_CACHE_DIR, max_bytes=256 * 1024**2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        # (path, mtime_ns, size) -> hash, for audio without a sidecar
+        self._hashes: "OrderedDict[tuple, str]" = OrderedDict()
+
+    def _get_path(self, audio_hash, width, height):
+        return os.path.join(
+            self.directory, audio_hash[:2], f"{audio_hash}-{width}x{height}.png"
+        )
+
+    def _get_hash(self, filename: str):
+        """
+        The hash of the audio, from the metadata sidecar if there is one.
+
+        Returns:
+            tuple: (hash, audio array if it had to be read, otherwise None)
+        """
+        audio_hash = _read_sidecar_hash(filename)
+        if audio_hash:
+            return audio_hash, None
+        stat = os.stat(filename)
+        key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key in self._hashes:
+                self._hashes.move_to_end(key)
+                return self._hashes[key], None
+        audio_array = read_audio(filename)
+        audio_hash = audio_array_to_sha256(np.ascontiguousarray(audio_array))
+        with self._lock:
+            self._hashes[key] = audio_hash
+            while len(self._hashes) > _MAX_HASHES:
+                self._hashes.popitem(last=False)
+        return audio_hash, audio_array
+
+    def get(self, filename: str, size="gallery"):
+        """
+        The path of the waveform image of an audio file, rendered on first use.
+
+        Args:
+            filename (str): A wav, flac or ogg file, or the wav path of a
+                bundle saved in another format.
+            size (str): One of THUMBNAIL_SIZES.
+
+        Returns:
+            str: The PNG path, or None if there is no audio to draw.
+        """
+        width, height = THUMBNAIL_SIZES[size]
+        filename = find_audio_file(filename)
+        if filename is None:
+            return None
+        audio_hash, audio_array = self._get_hash(filename)
+        path = self._get_path(audio_hash, width, height)
+        try:
+            # the mtime is the last use
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        if audio_array is None:
+            audio_array = read_audio(filename)
+        png = encode_png(render_waveform(audio_array, width, height))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(png)
+        os.replace(temp_path, path)
+        self._add_bytes(len(png))
+        return path
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".png"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def _add_bytes(self, size):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._trim()
+
+    def _trim(self):
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes * _TRIM_RATIO:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
+
+
+_thumbnail_cache = None
+_thumbnail_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    global _thumbnail_cache
+    with _thumbnail_cache_lock:
+        if _thumbnail_cache is None:
+            max_size_mb = get_thumbnail_config()["max_size_mb"]
+            _thumbnail_cache = ThumbnailCache(max_bytes=max_size_mb * 1024**2)
+        return _thumbnail_cache
+
+
+def get_waveform_thumbnail(filename: str, size="gallery"):
+    """The waveform image of an audio file, or None, without failing the caller."""
+    try:
+        return get_thumbnail_cache().get(filename, size)
+    except Exception as e:
+        print(f"Failed to draw the waveform of {filename}: {e}")
+        return None
@@ -0,0 +1,121 @@
+import bisect
+import threading
+
+# upper bounds of the buckets in seconds, the last bucket is unbounded
+BUCKETS = [
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+]
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper bound of the bucket that holds the q-quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip([*BUCKETS, float("inf")], self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip([*BUCKETS, "+Inf"], self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+# name -> Histogram
+_histograms = {}
+_lock = threading.Lock()
+
+
+def record_timing(name, seconds):
+    with _lock:
+        if name not in _histograms:
+            _histograms[name] = Histogram()
+        _histograms[name].observe(seconds)
+
+
+def get_timing_histograms():
+    """
+    Returns:
+        dict: name -> count, sum, mean, p50, p95, max and cumulative buckets.
+    """
+    with _lock:
+        return {name: h.to_dict() for name, h in _histograms.items()}
+
+
+def _format_seconds(seconds):
+    return "" if seconds is None else f"{seconds:.3f}"
+
+
+def render_timings_markdown():
+    histograms = get_timing_histograms()
+    if not histograms:
+        return "No timings recorded yet."
+    lines = [
+        "| Name | Calls | Total (s) | Mean (s) | p50 (s) | p95 (s) | Max (s) |",
+        "|------|-------|-----------|----------|---------|---------|---------|",
+    ]
+    for name, h in sorted(histograms.items(), key=lambda x: -x[1]["sum"]):
+        lines.append(
+            f"| {name} | {h['count']} | {h['sum']:.3f} "
+            f"| {_format_seconds(h['mean'])} | {_format_seconds(h['p50'])} "
+            f"| {_format_seconds(h['p95'])} | {_format_seconds(h['max'])} |"
+        )
+    return "\n".join(lines)
+
+
+def render_timings_prometheus(metric="tts_webui_decorator_self_seconds"):
+    lines = [
+        f"# HELP {metric} Time spent in each decorator, excluding the functions it wraps.",
+        f"# TYPE {metric} histogram",
+    ]
+    for name, h in get_timing_histograms().items():
+        name = name.replace("\\", "\\\\").replace('"', '\\"')
+        for bound, count in h["buckets"].items():
+            lines.append(f'{metric}_bucket{{name="{name}",le="{bound}"}} {count}')
+        lines.append(f'{metric}_sum{{name="{name}"}} {h["sum"]}')
+        lines.append(f'{metric}_count{{name="{name}"}} {h["count"]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,158 @@
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+# the FLAC metadata block with the tags
+_FLAC_VORBIS_COMMENT = 4
+_FLAC_LAST_BLOCK = 0x80
+
+# the first bytes of the comment header packet of each Ogg codec
+_OGG_COMMENT_PACKETS = [b"\x03vorbis", b"OpusTags"]
+# the comment header is the second packet, these are plenty for a large one
+_OGG_MAX_PAGES = 64
+
+
+def _parse_comments(data: bytes):
+    """Parse a Vorbis comment block, into upper case keys as they ignore case."""
+    (vendor_length,) = struct.unpack_from("<I", data, 0)
+    offset = 4 + vendor_length
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    tags = {}
+    for _ in range(count):
+        (length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        entry = data[offset : offset + length].decode("utf-8", errors="replace")
+        offset += length
+        key, _, value = entry.partition("=")
+        tags.setdefault(key.upper(), value)
+    return tags
+
+
+def _skip_id3(f):
+    header = f.read(10)
+    if header[:3] == b"ID3":
+        size = 0
+        for byte in header[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        f.seek(10 + size)
+    else:
+        f.seek(0)
+
+
+def _read_flac_comments(f):
+    _skip_id3(f)
+    if f.read(4) != b"fLaC":
+        raise ValueError("not a FLAC file")
+    while True:
+        header = f.read(4)
+        if len(header) < 4:
+            return {}
+        block_type = header[0] & ~_FLAC_LAST_BLOCK
+        (length,) = struct.unpack(">I", b"\x00" + header[1:])
+        if block_type == _FLAC_VORBIS_COMMENT:
+            return _parse_comments(f.read(length))
+        if header[0] & _FLAC_LAST_BLOCK:
+            return {}
+        # the stream info, seek table, pictures, padding
+        f.seek(length, os.SEEK_CUR)
+
+
+def _read_ogg_packets(f):
+    """The packets of the first logical stream, from the start of the file."""
+    packet = b""
+    serial = None
+    for _ in range(_OGG_MAX_PAGES):
+        header = f.read(27)
+        if len(header) < 27:
+            return
+        if header[:4] != b"OggS":
+            raise ValueError("not an Ogg page")
+        page_serial, segment_count = struct.unpack_from("<I", header, 14)[0], header[26]
+        lacing = f.read(segment_count)
+        body = f.read(sum(lacing))
+        if serial is None:
+            serial = page_serial
+        elif page_serial != serial:
+            continue
+        offset = 0
+        for size in lacing:
+            packet += body[offset : offset + size]
+            offset += size
+            # a segment shorter than 255 bytes ends the packet
+            if size < 255:
+                yield packet
+                packet = b""
+
+
+def _read_ogg_comments(f):
+    for index, packet in enumerate(_read_ogg_packets(f)):
+        for prefix in _OGG_COMMENT_PACKETS:
+            if packet.startswith(prefix):
+                return _parse_comments(packet[len(prefix) :])
+        if index >= 2:
+            break
+    return {}
+
+
+def read_vorbis_comments(filename: str):
+    """
+    The Vorbis comments of a FLAC or Ogg (Vorbis, Opus) file, read straight
+    from the metadata, without reading the audio or starting ffprobe.
+
+    Returns:
+        dict: Tag name in upper case -> value.
+
+    Raises:
+        ValueError: If the file is not FLAC or Ogg.
+    """
+    with open(filename, "rb") as f:
+        magic = f.read(4)
+        f.seek(0)
+        try:
+            if magic == b"OggS":
+                return _read_ogg_comments(f)
+            return _read_flac_comments(f)
+        except struct.error as e:
+            raise ValueError(f"truncated tags: {e}") from e
+
+
+def read_comment_tag(filename: str):
+    """
+    The comment tag, where generations keep their metadata as JSON, or None.
+
+    ffmpeg writes it as DESCRIPTION, libsndfile as COMMENT.
+    """
+    tags = read_vorbis_comments(filename)
+    return tags.get("COMMENT", tags.get("DESCRIPTION"))
+
+
+def _read_or_none(filename: str):
+    try:
+        return read_vorbis_comments(filename)
+    except (OSError, ValueError) as e:
+        print(f"Failed to read the tags of {filename}: {e}")
+        return None
+
+
+def read_vorbis_comments_batch(filenames, max_workers=8):
+    """
+    Read the Vorbis comments of many files on a thread pool.
+
+    Returns:
+        dict: filename -> tags, or None for the files that could not be read.
+    """
+    filenames = list(filenames)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(zip(filenames, pool.map(_read_or_none, filenames)))
+
+
+def read_directory_comments(directory: str, max_workers=8):
+    """Read the Vorbis comments of the ogg and flac files in a directory tree."""
+    filenames = [
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.endswith((".ogg", ".flac"))
+    ]
+    return read_vorbis_comments_batch(filenames, max_workers=max_workers)
@@ -0,0 +1,143 @@
+import struct
+import zlib
+
+import numpy as np
+
+WIDTH = 1000
+HEIGHT = 300
+
+BACKGROUND = (0, 0, 0, 255)
+COLOR = (255, 165, 0, 255)
+
+# the axes of a 10x3 inch matplotlib figure: left, right, bottom, top
+_AXES = (0.125, 0.9, 0.11, 0.88)
+# matplotlib adds 5% of the data range on each side
+_MARGIN = 0.05
+# a 1.5pt line at 100 dpi
+_LINE_WIDTH = 2
+
+
+def _get_envelope(samples: np.ndarray, edges: np.ndarray):
+    """
+    The lowest and highest point of the line through the samples within
+    each pair of consecutive edges, which are sample positions.
+    """
+    # linear interpolation, without np.interp's copies of the whole track
+    before = np.floor(edges).astype(np.int64)
+    after = np.minimum(before + 1, len(samples) - 1)
+    fraction = edges - before
+    edge_values = samples[before] * (1 - fraction) + samples[after] * fraction
+    low = np.minimum(edge_values[:-1], edge_values[1:])
+    high = np.maximum(edge_values[:-1], edge_values[1:])
+
+    starts = np.ceil(edges[:-1]).astype(np.int64)
+    ends = np.ceil(edges[1:]).astype(np.int64)
+    has_samples = ends > starts
+    if has_samples.any():
+        indices = starts[has_samples]
+        # reduceat runs from each index to the next, and the last to the end
+        column_samples = samples[: ends[has_samples][-1]]
+        low[has_samples] = np.minimum(
+            low[has_samples], np.minimum.reduceat(column_samples, indices)
+        )
+        high[has_samples] = np.maximum(
+            high[has_samples], np.maximum.reduceat(column_samples, indices)
+        )
+    return low, high
+
+
+def render_waveform(audio_array: np.ndarray, width=WIDTH, height=HEIGHT):
+    """
+    Draw the waveform like the matplotlib plot it replaces, as the min and
+    max of the samples under each pixel column.
+
+    Returns:
+        np.ndarray: (height, width, 4) RGBA image.
+    """
+    image = np.empty((height, width, 4), dtype=np.uint8)
+    image[:] = BACKGROUND
+
+    samples = np.asarray(audio_array)
+    if not np.issubdtype(samples.dtype, np.floating):
+        samples = samples.astype(np.float32)
+    if samples.ndim > 1:
+        # one line per channel, all of them the same color
+        lows, highs = samples.min(axis=1), samples.max(axis=1)
+    else:
+        lows = highs = samples
+    if not (np.isfinite(lows).all() and np.isfinite(highs).all()):
+        lows, highs = np.nan_to_num(lows), np.nan_to_num(highs)
+    n = len(lows)
+    if n < 2:
+        # a line through a single point is not drawn
+        return image
+
+    left, right, bottom, top = _AXES
+    x0, x1 = left * width, right * width
+    y0, y1 = (1 - top) * height, (1 - bottom) * height
+
+    x_min, x_max = -_MARGIN * (n - 1), (1 + _MARGIN) * (n - 1)
+    y_low, y_high = float(lows.min()), float(highs.max())
+    y_span = y_high - y_low or max(abs(y_high), 1.0)
+    y_min, y_max = y_low - _MARGIN * y_span, y_high + _MARGIN * y_span
+
+    def to_position(column):
+        position = x_min + (column - x0) / (x1 - x0) * (x_max - x_min)
+        return np.clip(position, 0, n - 1)
+
+    # the sample positions at the edges of every pixel column with the line
+    columns = np.arange(int(x0), int(np.ceil(x1)))
+    starts, ends = to_position(columns), to_position(columns + 1)
+    inside = ends > starts
+    columns = columns[inside]
+    edges = np.append(starts[inside], ends[inside][-1])
+
+    low, _ = _get_envelope(lows, edges)
+    _, high = _get_envelope(highs, edges)
+
+    def to_row(value):
+        return y0 + (y_max - value) / (y_max - y_min) * (y1 - y0)
+
+    half = _LINE_WIDTH / 2
+    top_rows = np.clip(np.floor(to_row(high) - half), 0, height - 1).astype(int)
+    bottom_rows = np.clip(np.ceil(to_row(low) + half), 1, height).astype(int)
+
+    pixel_rows = np.arange(height)[:, None]
+    mask = (pixel_rows >= top_rows) & (pixel_rows < bottom_rows)
+    # the line is as wide as it is high
+    mask[:, 1:] |= mask[:, :-1]
+    rows, column_indices = np.nonzero(mask)
+    image[rows, columns[column_indices]] = COLOR
+    return image
+
+
+def encode_png(image: np.ndarray):
+    """Encode an (height, width, 4) RGBA image as PNG."""
+    height, width, _ = image.shape
+    raw = np.empty((height, 1 + width * 4), dtype=np.uint8)
+    raw[:, 0] = 0  # no filter
+    raw[:, 1:] = image.reshape(height, width * 4)
+
+    def chunk(kind, data):
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)),
+            chunk(b"IEND", b""),
+        ]
+    )
+
+
+def save_waveform_png(audio_array: np.ndarray, filename_png: str):
+    image = render_waveform(audio_array)
+    with open(filename_png, "wb") as f:
+        f.write(encode_png(image))
+    return image